@@ -17,6 +17,7 @@ from app.models import (
     User,
     ParkingLot,
     Parcel,
+    FinalizedSolanaTransaction,
 )  # noqa: F401
 
 # this is the Alembic Config object, which provides
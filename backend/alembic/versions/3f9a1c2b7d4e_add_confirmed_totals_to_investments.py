@@ -0,0 +1,56 @@
+"""add confirmed totals to investments
+
+Revision ID: 3f9a1c2b7d4e
+Revises: 18c2dad13d80
+Create Date: 2026-10-17 10:12:41.508213
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c2b7d4e"
+down_revision: Union[str, Sequence[str], None] = "18c2dad13d80"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "investments",
+        sa.Column(
+            "confirmed_total",
+            sa.Numeric(precision=19, scale=2),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "investments",
+        sa.Column("confirmed_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    # Backfill from existing confirmed transactions
+    op.execute(
+        """
+        UPDATE investments
+        SET confirmed_total = totals.total, confirmed_count = totals.count
+        FROM (
+            SELECT investment_id, SUM(amount) AS total, COUNT(*) AS count
+            FROM transactions
+            WHERE status = 'CONFIRMED'
+            GROUP BY investment_id
+        ) AS totals
+        WHERE investments.id = totals.investment_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("investments", "confirmed_count")
+    op.drop_column("investments", "confirmed_total")
@@ -0,0 +1,83 @@
+"""add funding rollup to projects
+
+Revision ID: 8c41e0d5a2f7
+Revises: 3f9a1c2b7d4e
+Create Date: 2026-10-17 11:38:05.774120
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41e0d5a2f7"
+down_revision: Union[str, Sequence[str], None] = "3f9a1c2b7d4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "projects",
+        sa.Column(
+            "funded_total",
+            sa.Numeric(precision=19, scale=2),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "projects",
+        sa.Column(
+            "pending_total",
+            sa.Numeric(precision=19, scale=2),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "projects",
+        sa.Column("investor_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "projects",
+        sa.Column("last_inflow_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Backfill from existing transactions (investments.project_id is a string)
+    op.execute(
+        """
+        UPDATE projects
+        SET funded_total = rollup.funded_total,
+            pending_total = rollup.pending_total,
+            investor_count = rollup.investor_count,
+            last_inflow_at = rollup.last_inflow_at
+        FROM (
+            SELECT
+                investments.project_id,
+                COALESCE(SUM(transactions.amount)
+                    FILTER (WHERE transactions.status = 'CONFIRMED'), 0) AS funded_total,
+                COALESCE(SUM(transactions.amount)
+                    FILTER (WHERE transactions.status = 'PENDING'), 0) AS pending_total,
+                COUNT(DISTINCT investments.id)
+                    FILTER (WHERE transactions.status = 'CONFIRMED') AS investor_count,
+                MAX(transactions.transaction_verified_at)
+                    FILTER (WHERE transactions.status = 'CONFIRMED') AS last_inflow_at
+            FROM transactions
+            JOIN investments ON investments.id = transactions.investment_id
+            GROUP BY investments.project_id
+        ) AS rollup
+        WHERE rollup.project_id = CAST(projects.id AS VARCHAR)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("projects", "last_inflow_at")
+    op.drop_column("projects", "investor_count")
+    op.drop_column("projects", "pending_total")
+    op.drop_column("projects", "funded_total")
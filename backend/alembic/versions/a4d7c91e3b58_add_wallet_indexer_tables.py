@@ -0,0 +1,90 @@
+"""add wallet indexer tables
+
+Revision ID: a4d7c91e3b58
+Revises: e5b87f3c1d92
+Create Date: 2026-10-17 18:04:12.530418
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d7c91e3b58"
+down_revision: Union[str, Sequence[str], None] = "e5b87f3c1d92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "solana_wallet_cursors",
+        sa.Column("wallet", sa.String(length=255), nullable=False),
+        sa.Column("last_signature", sa.String(length=128), nullable=True),
+        sa.Column("last_slot", sa.BigInteger(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("wallet"),
+    )
+    op.create_table(
+        "solana_deposits",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("signature", sa.String(length=128), nullable=False),
+        sa.Column("wallet", sa.String(length=255), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=True),
+        sa.Column("sender", sa.String(length=255), nullable=True),
+        sa.Column("amount_lamports", sa.Numeric(precision=30, scale=0), nullable=False),
+        sa.Column("slot", sa.BigInteger(), nullable=False),
+        sa.Column("block_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("transaction_id", sa.Uuid(), nullable=True),
+        sa.Column("matched_by", sa.String(length=20), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transactions.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("signature", "wallet", name="uq_solana_deposits_signature_wallet"),
+    )
+    op.create_index(op.f("ix_solana_deposits_wallet"), "solana_deposits", ["wallet"], unique=False)
+    op.create_index(
+        op.f("ix_solana_deposits_project_id"), "solana_deposits", ["project_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_solana_deposits_transaction_id"),
+        "solana_deposits",
+        ["transaction_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_solana_deposits_transaction_id"), table_name="solana_deposits")
+    op.drop_index(op.f("ix_solana_deposits_project_id"), table_name="solana_deposits")
+    op.drop_index(op.f("ix_solana_deposits_wallet"), table_name="solana_deposits")
+    op.drop_table("solana_deposits")
+    op.drop_table("solana_wallet_cursors")
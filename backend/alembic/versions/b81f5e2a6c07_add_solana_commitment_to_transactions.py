@@ -0,0 +1,48 @@
+"""add solana commitment to transactions
+
+Revision ID: b81f5e2a6c07
+Revises: a4d7c91e3b58
+Create Date: 2026-10-17 19:41:05.117264
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b81f5e2a6c07"
+down_revision: Union[str, Sequence[str], None] = "a4d7c91e3b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "transactions",
+        sa.Column("solana_commitment", sa.String(length=20), nullable=True),
+    )
+    # Confirmations so far were only ever accepted at finalized commitment
+    op.execute(
+        "UPDATE transactions SET solana_commitment = 'finalized' WHERE status = 'CONFIRMED'"
+    )
+    op.create_index(
+        "ix_transactions_provisional",
+        "transactions",
+        ["updated_at"],
+        unique=False,
+        postgresql_where=sa.text("solana_commitment = 'confirmed'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_transactions_provisional",
+        table_name="transactions",
+        postgresql_where=sa.text("solana_commitment = 'confirmed'"),
+    )
+    op.drop_column("transactions", "solana_commitment")
@@ -0,0 +1,47 @@
+"""add keyset pagination indexes
+
+Revision ID: c7d2e9b14a06
+Revises: 8c41e0d5a2f7
+Create Date: 2026-10-17 13:02:17.219846
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2e9b14a06"
+down_revision: Union[str, Sequence[str], None] = "8c41e0d5a2f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_investments_user_id_created_at_id",
+        "investments",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transactions_investment_id_created_at_id",
+        "transactions",
+        ["investment_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transactions_status_created_at_id",
+        "transactions",
+        ["status", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_status_created_at_id", table_name="transactions")
+    op.drop_index("ix_transactions_investment_id_created_at_id", table_name="transactions")
+    op.drop_index("ix_investments_user_id_created_at_id", table_name="investments")
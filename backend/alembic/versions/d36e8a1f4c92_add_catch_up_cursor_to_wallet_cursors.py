@@ -0,0 +1,42 @@
+"""add catch-up cursor to wallet cursors
+
+Revision ID: d36e8a1f4c92
+Revises: b81f5e2a6c07
+Create Date: 2026-10-17 21:12:47.804316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d36e8a1f4c92"
+down_revision: Union[str, Sequence[str], None] = "b81f5e2a6c07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "solana_wallet_cursors",
+        sa.Column("before_signature", sa.String(length=128), nullable=True),
+    )
+    op.add_column(
+        "solana_wallet_cursors",
+        sa.Column("head_signature", sa.String(length=128), nullable=True),
+    )
+    op.add_column(
+        "solana_wallet_cursors",
+        sa.Column("head_slot", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("solana_wallet_cursors", "head_slot")
+    op.drop_column("solana_wallet_cursors", "head_signature")
+    op.drop_column("solana_wallet_cursors", "before_signature")
@@ -0,0 +1,48 @@
+"""add solana finalized transactions table
+
+Revision ID: e5b87f3c1d92
+Revises: c7d2e9b14a06
+Create Date: 2026-10-17 15:26:48.903315
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b87f3c1d92"
+down_revision: Union[str, Sequence[str], None] = "c7d2e9b14a06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "solana_finalized_transactions",
+        sa.Column("signature", sa.String(length=128), nullable=False),
+        sa.Column("amount_lamports", sa.Numeric(precision=30, scale=0), nullable=False),
+        sa.Column("recipient", sa.String(length=255), nullable=True),
+        sa.Column("error", sa.String(length=500), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("signature"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("solana_finalized_transactions")
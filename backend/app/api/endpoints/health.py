@@ -1,5 +1,18 @@
+from typing import Any
+
 from fastapi import APIRouter
 
+from app.auth.cache import get_claims_cache
+from app.config import get_settings
+from app.database import get_pool_metrics
+from app.query_metrics import route_histograms
+from app.services.confirmation_queue import get_confirmation_queue
+from app.services.signature_subscriber import get_signature_subscriber
+from app.services.solana import get_rpc_pool
+from app.services.solana_cache import get_finalized_transaction_cache
+from app.services.transaction_events import get_transaction_events
+from app.services.user_cache import get_identity_cache
+
 router = APIRouter()
 
 
@@ -7,3 +20,47 @@ router = APIRouter()
 def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@router.get("/health/db-pool")
+def db_pool_metrics() -> dict[str, Any]:
+    """Connection pool usage: checked-out/idle connections, overflow, checkout waits and timeouts."""
+    return get_pool_metrics()
+
+
+@router.get("/health/db-queries")
+def db_query_metrics() -> dict[str, Any]:
+    """Per-route SQL statement counts and DB time (histogram of statements per request)."""
+    return route_histograms.snapshot()
+
+
+@router.get("/health/confirmations")
+def confirmation_metrics() -> dict[str, Any]:
+    """
+    Asynchronous confirm backlog: queued verifications, workers, open status streams and
+    the signature subscriber's connection state.
+    """
+    return {
+        **get_confirmation_queue().stats(),
+        "status_streams": get_transaction_events().listener_count(),
+        "subscriber": get_signature_subscriber().stats(),
+    }
+
+
+@router.get("/health/solana-rpc")
+def solana_rpc_metrics() -> dict[str, Any]:
+    """Solana RPC endpoints in routing order: health, EWMA latency, failures, hedging."""
+    return get_rpc_pool().stats()
+
+
+@router.get("/health/caches")
+def cache_metrics() -> dict[str, Any]:
+    """
+    In-process cache effectiveness: size, hits, misses and hit ratio of the verified token
+    cache, the identity cache and the finalized Solana transaction cache.
+    """
+    return {
+        "claims": get_claims_cache(get_settings()).stats(),
+        "identity": get_identity_cache().stats(),
+        "finalized_transactions": get_finalized_transaction_cache().stats(),
+    }
@@ -1,14 +1,15 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import get_current_user
-from app.database import get_db
-from app.models.user import User as UserModel
+from app.database import get_db, get_read_db
+from app.pagination import CURSOR_DESCRIPTION, set_next_cursor
 from app.schemas.investment import Investment, InvestmentCreate, InvestmentUpdate
 from app.services.investment import InvestmentService
+from app.services.user_cache import UserSnapshot
 
 router = APIRouter()
 
@@ -32,13 +33,12 @@ def parse_investment_id(investment_id: str) -> UUID:
 
 
 def _investment_to_response(investment) -> Investment:
-    """Convert investment model to response schema with calculated total_amount."""
-    total_amount = InvestmentService.calculate_total_amount(investment)
+    """Convert investment model to response schema with its confirmed total_amount."""
     investment_dict = {
         "id": f"user_investment_{investment.id}",
         "user_id": investment.user_id,
         "project_id": investment.project_id,
-        "total_amount": total_amount,
+        "total_amount": investment.confirmed_total,
         "created_at": investment.created_at,
         "updated_at": investment.updated_at,
     }
@@ -46,26 +46,26 @@ def _investment_to_response(investment) -> Investment:
 
 
 @router.post("/", response_model=Investment, status_code=status.HTTP_201_CREATED)
-def create_investment(
+async def create_investment(
     investment_create: InvestmentCreate,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> Investment:
     """Create a new investment (or get existing one for user-project pair)."""
     investment_create.user_id = current_user.id
-    db_investment = InvestmentService.create_investment(db, investment_create)
+    db_investment = await InvestmentService.create_investment(db, investment_create)
     return _investment_to_response(db_investment)
 
 
 @router.get("/{investment_id}", response_model=Investment)
-def get_investment(
+async def get_investment(
     investment_id: str,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Investment:
     """Get an investment by ID (Privy JWT required). You can only view your own investments."""
     uuid_id = parse_investment_id(investment_id)
-    db_investment = InvestmentService.get_investment(db, uuid_id)
+    db_investment = await InvestmentService.get_investment(db, uuid_id)
     if not db_investment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -80,44 +80,48 @@ def get_investment(
 
 
 @router.get("/", response_model=List[Investment])
-def list_investments(
+async def list_investments(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
     project_id: str | None = Query(None, description="Filter by project ID"),
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[Investment]:
     """Get the authenticated user's investments (Privy JWT required)."""
-    db_investments = InvestmentService.get_investments(
+    db_investments, next_cursor = await InvestmentService.get_investments(
         db,
         skip=skip,
         limit=limit,
         user_id=current_user.id,
         project_id=project_id,
+        cursor=cursor,
     )
+    set_next_cursor(response, next_cursor)
     return [_investment_to_response(inv) for inv in db_investments]
 
 
 @router.get("/user/me", response_model=List[Investment])
-def get_my_investments(
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def get_my_investments(
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[Investment]:
     """Get all investments for a specific user."""
-    db_investments = InvestmentService.get_investments_by_user_id(db, current_user.id)
+    db_investments = await InvestmentService.get_investments_by_user_id(db, current_user.id)
     return [_investment_to_response(inv) for inv in db_investments]
 
 
 @router.put("/{investment_id}", response_model=Investment)
-def update_investment(
+async def update_investment(
     investment_id: str,
     investment_update: InvestmentUpdate,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> Investment:
     """Update an investment (Privy JWT required). You can only update your own."""
     uuid_id = parse_investment_id(investment_id)
-    db_investment = InvestmentService.get_investment(db, uuid_id)
+    db_investment = await InvestmentService.get_investment(db, uuid_id)
     if not db_investment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -128,7 +132,7 @@ def update_investment(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not allowed to update this investment",
         )
-    db_investment = InvestmentService.update_investment(db, uuid_id, investment_update)
+    db_investment = await InvestmentService.update_investment(db, uuid_id, investment_update)
     if not db_investment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -138,14 +142,14 @@ def update_investment(
 
 
 @router.delete("/{investment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_investment(
+async def delete_investment(
     investment_id: str,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> None:
     """Delete an investment (Privy JWT required). You can only delete your own."""
     uuid_id = parse_investment_id(investment_id)
-    db_investment = InvestmentService.get_investment(db, uuid_id)
+    db_investment = await InvestmentService.get_investment(db, uuid_id)
     if not db_investment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -156,7 +160,7 @@ def delete_investment(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not allowed to delete this investment",
         )
-    success = InvestmentService.delete_investment(db, uuid_id)
+    success = await InvestmentService.delete_investment(db, uuid_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,11 +1,14 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.parking_lot import ParkingLot
+from app.pagination import CURSOR_DESCRIPTION, paginate, set_next_cursor, split_page
 from app.schemas.parking_lot import (
     ParkingLotCreate,
     ParkingLotListResponse,
@@ -25,39 +28,44 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[ParkingLotListResponse])
-def list_parking_lots(
+async def list_parking_lots(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
     underutilized_only: bool = Query(
         False, description="Only return underutilized parking lots (avg < 40%)"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[ParkingLotListResponse]:
     """
     List all parking lots from the database.
 
-    Supports pagination and filtering by utilization.
+    Supports cursor pagination (or skip) and filtering by utilization.
     """
-    query = db.query(ParkingLot).order_by(ParkingLot.id)
+    keys = (ParkingLot.id,)
+    query = select(ParkingLot)
 
     if underutilized_only:
-        query = query.filter(ParkingLot.avg_utilization < 40)
+        query = query.where(ParkingLot.avg_utilization < 40)
 
-    parking_lots = query.offset(skip).limit(limit).all()
+    rows = (await db.scalars(paginate(query.offset(skip), keys, cursor, limit))).all()
+    parking_lots, next_cursor = split_page(rows, keys, limit)
+    set_next_cursor(response, next_cursor)
     return [ParkingLotListResponse.model_validate(pl) for pl in parking_lots]
 
 
 @router.get("/{parking_lot_id}", response_model=ParkingLotResponse)
-def get_parking_lot(
+async def get_parking_lot(
     parking_lot_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> ParkingLotResponse:
     """
     Get a single parking lot by ID.
 
     Returns detailed information including parcel data if available.
     """
-    parking_lot = db.query(ParkingLot).filter(ParkingLot.id == parking_lot_id).first()
+    parking_lot = await db.get(ParkingLot, parking_lot_id)
 
     if not parking_lot:
         raise HTTPException(status_code=404, detail="Parking lot not found")
@@ -66,9 +74,9 @@ def get_parking_lot(
 
 
 @router.post("/", response_model=ParkingLotResponse, status_code=201)
-def create_parking_lot(
+async def create_parking_lot(
     parking_lot_data: ParkingLotCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> ParkingLotResponse:
     """
     Create a new parking lot manually.
@@ -76,7 +84,9 @@ def create_parking_lot(
     Requires place_id, name, address, and coordinates.
     """
     # Check if parking lot with this place_id already exists
-    existing = db.query(ParkingLot).filter(ParkingLot.place_id == parking_lot_data.place_id).first()
+    existing = await db.scalar(
+        select(ParkingLot).where(ParkingLot.place_id == parking_lot_data.place_id).limit(1)
+    )
 
     if existing:
         raise HTTPException(
@@ -106,24 +116,23 @@ def create_parking_lot(
     )
 
     db.add(parking_lot)
-    db.commit()
-    db.refresh(parking_lot)
+    await db.commit()
 
     return ParkingLotResponse.model_validate(parking_lot)
 
 
 @router.patch("/{parking_lot_id}", response_model=ParkingLotResponse)
-def update_parking_lot(
+async def update_parking_lot(
     parking_lot_id: int,
     update_data: ParkingLotUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> ParkingLotResponse:
     """
     Update parking lot information.
 
     Allows updating availability, contact notes, and estimated capacity.
     """
-    parking_lot = db.query(ParkingLot).filter(ParkingLot.id == parking_lot_id).first()
+    parking_lot = await db.get(ParkingLot, parking_lot_id)
 
     if not parking_lot:
         raise HTTPException(status_code=404, detail="Parking lot not found")
@@ -133,27 +142,26 @@ def update_parking_lot(
     for field, value in update_dict.items():
         setattr(parking_lot, field, value)
 
-    db.commit()
-    db.refresh(parking_lot)
+    await db.commit()
 
     return ParkingLotResponse.model_validate(parking_lot)
 
 
 @router.delete("/{parking_lot_id}", status_code=204)
-def delete_parking_lot(
+async def delete_parking_lot(
     parking_lot_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> None:
     """
     Delete a parking lot from the database.
     """
-    parking_lot = db.query(ParkingLot).filter(ParkingLot.id == parking_lot_id).first()
+    parking_lot = await db.get(ParkingLot, parking_lot_id)
 
     if not parking_lot:
         raise HTTPException(status_code=404, detail="Parking lot not found")
 
-    db.delete(parking_lot)
-    db.commit()
+    await db.delete(parking_lot)
+    await db.commit()
 
 
 # ============================================================================
@@ -162,12 +170,12 @@ def delete_parking_lot(
 
 
 @router.post("/search", response_model=ParkingLotSearchResponse)
-def search_and_save_parking_lots(
+async def search_and_save_parking_lots(
     search_request: ParkingLotSearchRequest,
     save_to_db: bool = Query(
         True, description="Save discovered parking lots to the database"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> ParkingLotSearchResponse:
     """
     Search for parking lots using Google Maps API and optionally save to database.
@@ -186,8 +194,9 @@ def search_and_save_parking_lots(
     Returns:
         List of parking lots with utilization data
     """
-    # Fetch parking lots from Google Maps
-    places = google_maps.fetch_places_nearby(
+    # Fetch parking lots from Google Maps (blocking HTTP, keep it off the event loop)
+    places = await run_in_threadpool(
+        google_maps.fetch_places_nearby,
         search_request.latitude,
         search_request.longitude,
         search_request.radius,
@@ -213,7 +222,9 @@ def search_and_save_parking_lots(
         business_status = place.get("business_status")
 
         # Fetch popular times using populartimes library
-        popular_times_data, avg_util = google_maps.fetch_popular_times(place_id)
+        popular_times_data, avg_util = await run_in_threadpool(
+            google_maps.fetch_popular_times, place_id
+        )
 
         # Calculate metrics
         underutil_hours = google_maps.count_underutilized_hours(popular_times_data)
@@ -224,7 +235,9 @@ def search_and_save_parking_lots(
         # Check if parking lot already exists in database
         existing_lot = None
         if save_to_db:
-            existing_lot = db.query(ParkingLot).filter(ParkingLot.place_id == place_id).first()
+            existing_lot = await db.scalar(
+                select(ParkingLot).where(ParkingLot.place_id == place_id).limit(1)
+            )
 
             if existing_lot:
                 # Update existing parking lot with fresh data
@@ -240,8 +253,7 @@ def search_and_save_parking_lots(
                 existing_lot.underutilized_hours = underutil_hours
                 existing_lot.last_synced_at = datetime.utcnow()
 
-                db.commit()
-                db.refresh(existing_lot)
+                await db.commit()
 
                 parking_lots.append(ParkingLotResponse.model_validate(existing_lot))
             else:
@@ -262,8 +274,7 @@ def search_and_save_parking_lots(
                 )
 
                 db.add(new_lot)
-                db.commit()
-                db.refresh(new_lot)
+                await db.commit()
 
                 parking_lots.append(ParkingLotResponse.model_validate(new_lot))
         else:
@@ -1,33 +1,57 @@
-"""Projects API: get project by parking lot, request project (create pending)."""
+"""Projects API: list/get projects with funding, get by parking lot, request project."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List
 
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db
 from app.models.parking_lot import ParkingLot
 from app.models.project import Project as ProjectModel
+from app.pagination import CURSOR_DESCRIPTION, set_next_cursor
 from app.schemas.project import Project as ProjectSchema
 from app.schemas.project import ProjectRequestCreate
+from app.services.project import ProjectService
 
 router = APIRouter()
 
 PENDING_STATUS = "pending"
 
 
+@router.get("/", response_model=List[ProjectSchema])
+async def list_projects(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+) -> List[ProjectSchema]:
+    """
+    List projects with their funding rollup (raised, pending, investors, progress).
+
+    Reads the incrementally maintained rollup columns, so no transaction aggregation
+    happens per request.
+    """
+    projects, next_cursor = await ProjectService.get_projects(
+        db, skip=skip, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
+    return [ProjectSchema.model_validate(project) for project in projects]
+
+
 @router.get("/by-parking-lot/{parking_lot_id}", response_model=ProjectSchema)
-def get_project_by_parking_lot(
+async def get_project_by_parking_lot(
     parking_lot_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> ProjectSchema:
     """
     Get the project for a parking lot, if one exists.
 
     Returns 404 if no project exists for this parking lot.
     """
-    project = (
-        db.query(ProjectModel)
-        .filter(ProjectModel.parking_lot_id == parking_lot_id)
-        .first()
+    project = await db.scalar(
+        select(ProjectModel).where(ProjectModel.parking_lot_id == parking_lot_id).limit(1)
     )
     if not project:
         raise HTTPException(
@@ -37,10 +61,25 @@ def get_project_by_parking_lot(
     return ProjectSchema.model_validate(project)
 
 
+@router.get("/{project_id}", response_model=ProjectSchema)
+async def get_project(
+    project_id: int,
+    db: AsyncSession = Depends(get_read_db),
+) -> ProjectSchema:
+    """Get a project with its funding rollup."""
+    project = await ProjectService.get_project(db, project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return ProjectSchema.model_validate(project)
+
+
 @router.post("/request", response_model=ProjectSchema, status_code=status.HTTP_201_CREATED)
-def request_project(
+async def request_project(
     body: ProjectRequestCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> ProjectSchema:
     """
     Request a project for a parking lot.
@@ -48,10 +87,8 @@ def request_project(
     Creates a project with status=pending awaiting approval.
     Returns 400 if a project already exists for this parking lot.
     """
-    existing = (
-        db.query(ProjectModel)
-        .filter(ProjectModel.parking_lot_id == body.parking_lot_id)
-        .first()
+    existing = await db.scalar(
+        select(ProjectModel).where(ProjectModel.parking_lot_id == body.parking_lot_id).limit(1)
     )
     if existing:
         raise HTTPException(
@@ -59,11 +96,7 @@ def request_project(
             detail="A project already exists for this parking lot",
         )
 
-    parking_lot = (
-        db.query(ParkingLot)
-        .filter(ParkingLot.id == body.parking_lot_id)
-        .first()
-    )
+    parking_lot = await db.get(ParkingLot, body.parking_lot_id)
     if not parking_lot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -76,6 +109,5 @@ def request_project(
         status=PENDING_STATUS,
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
     return ProjectSchema.model_validate(project)
@@ -1,17 +1,39 @@
-from typing import List
+import asyncio
+import math
+from contextlib import suppress
+from typing import AsyncIterator, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import get_current_user
-from app.database import get_db
-from app.models.user import User as UserModel
-from app.schemas.transaction import Transaction, TransactionConfirm, TransactionCreate
-from app.services.transaction import TransactionService
+from app.config import get_settings
+from app.database import SessionLocal, get_db, get_read_db
+from app.models.transaction import Transaction as TransactionModel
+from app.models.transaction import TransactionStatus
+from app.pagination import CURSOR_DESCRIPTION, set_next_cursor
+from app.schemas.transaction import (
+    Transaction,
+    TransactionBatchConfirm,
+    TransactionConfirm,
+    TransactionConfirmResult,
+    TransactionCreate,
+    TransactionStatusUpdate,
+)
+from app.services.confirmation_queue import get_confirmation_queue
+from app.services.signature_subscriber import get_signature_subscriber
+from app.services.transaction import ConfirmContext, TransactionService
+from app.services.transaction_events import get_transaction_events
+from app.services.user_cache import UserSnapshot
 
 router = APIRouter()
 
+# Comment frame sent on quiet status streams so proxies don't close them as idle
+SSE_KEEPALIVE_SECONDS = 15.0
+
 
 def parse_transaction_id(transaction_id: str) -> UUID:
     """Parse transaction ID with prefix to UUID."""
@@ -39,8 +61,8 @@ def parse_transaction_id(transaction_id: str) -> UUID:
 async def create_transaction(
     investment_id: str,
     transaction_create: TransactionCreate,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> Transaction:
     """Create a new pending transaction for an investment (Privy JWT required)."""
     # Parse investment_id (with prefix)
@@ -49,7 +71,7 @@ async def create_transaction(
 
     inv_uuid = parse_investment_id(investment_id)
 
-    db_investment = InvestmentService.get_investment(db, inv_uuid)
+    db_investment = await InvestmentService.get_investment(db, inv_uuid)
     if not db_investment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,113 +84,372 @@ async def create_transaction(
         )
 
     transaction_create.investment_id = inv_uuid
-    db_transaction = TransactionService.create_transaction(db, transaction_create)
+    db_transaction = await TransactionService.create_transaction(db, transaction_create)
     return Transaction.model_validate(db_transaction)
 
 
+def _prefers_async(prefer: str | None) -> bool:
+    """Whether a Prefer header (RFC 7240) asks for an asynchronous response."""
+    if not prefer:
+        return False
+    return any(
+        token.split(";")[0].strip().lower() == "respond-async" for token in prefer.split(",")
+    )
+
+
+def _awaits_verification(db_transaction: TransactionModel) -> bool:
+    """Pending with a signature recorded: left for background verification."""
+    return (
+        db_transaction.status == TransactionStatus.PENDING
+        and db_transaction.solana_transaction_signature is not None
+    )
+
+
+def _queue_verification(db_transaction: TransactionModel) -> None:
+    # Best effort: if the queue is full or stopped, the reconciler picks it up
+    get_confirmation_queue().enqueue(db_transaction.id)
+    get_signature_subscriber().watch(db_transaction.id, db_transaction.solana_transaction_signature)
+
+
 @router.post(
     "/{transaction_id}/confirm",
     response_model=Transaction,
     status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": Transaction,
+            "description": "Signature recorded, verification queued (Prefer: respond-async, "
+            "or the Solana RPC limiter was saturated)",
+        }
+    },
 )
 async def confirm_transaction(
     transaction_id: str,
     transaction_confirm: TransactionConfirm,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    prefer: str | None = Header(
+        None, description="Send `respond-async` to get 202 at once and verify in background"
+    ),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> Transaction:
-    """Confirm a transaction by verifying it on Solana blockchain (Privy JWT required)."""
-    from app.services.investment import InvestmentService
+    """
+    Confirm a transaction by verifying it on Solana blockchain (Privy JWT required).
 
+    With `Prefer: respond-async` the signature is recorded and verification is queued:
+    the response is 202 with the transaction still pending and a Location header pointing
+    at its status endpoint; follow it there or on the /events stream. A synchronous
+    confirm answers the same way when the Solana RPC limiter has no room to verify now.
+    """
     uuid_id = parse_transaction_id(transaction_id)
-    db_transaction = TransactionService.get_transaction(db, uuid_id)
+    context = await _get_owned_context(
+        db, uuid_id, current_user, "Not allowed to confirm this transaction", for_update=True
+    )
+
+    if _prefers_async(prefer):
+        db_transaction = await TransactionService.record_signature(db, context, transaction_confirm)
+    else:
+        db_transaction = await TransactionService.confirm_transaction(
+            db, context, transaction_confirm
+        )
     if not db_transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transaction not found",
         )
 
-    db_investment = InvestmentService.get_investment(db, db_transaction.investment_id)
-    if not db_investment or db_investment.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to confirm this transaction",
+    if _prefers_async(prefer):
+        response.headers["Preference-Applied"] = "respond-async"
+    if _awaits_verification(db_transaction):
+        _queue_verification(db_transaction)
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = str(
+            request.url_for("get_transaction_status", transaction_id=transaction_id)
         )
+    return Transaction.model_validate(db_transaction)
 
-    db_transaction = await TransactionService.confirm_transaction(
-        db, uuid_id, transaction_confirm
-    )
-    if not db_transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found",
+
+@router.post("/confirm", response_model=List[TransactionConfirmResult])
+async def confirm_transactions(
+    batch: TransactionBatchConfirm,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> List[TransactionConfirmResult]:
+    """
+    Confirm many transactions in one call (Privy JWT required).
+
+    Returns one result per entry, in order, with the status code and body the single
+    confirm endpoint would have answered with. The DB work is a fixed number of round
+    trips and verification uses batched RPC calls, whatever the batch size.
+    """
+    results: dict[int, TransactionConfirmResult] = {}
+    entries: dict[UUID, int] = {}
+    for index, item in enumerate(batch.transactions):
+        try:
+            uuid_id = parse_transaction_id(item.transaction_id)
+        except HTTPException as e:
+            results[index] = TransactionConfirmResult(
+                transaction_id=item.transaction_id, status_code=e.status_code, detail=e.detail
+            )
+            continue
+        if uuid_id in entries:
+            results[index] = TransactionConfirmResult(
+                transaction_id=item.transaction_id,
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Transaction appears more than once in the batch",
+            )
+            continue
+        entries[uuid_id] = index
+
+    contexts = await TransactionService.get_confirm_contexts(db, list(entries))
+    allowed = []
+    for uuid_id, index in entries.items():
+        context = contexts.get(uuid_id)
+        if context is None:
+            results[index] = TransactionConfirmResult(
+                transaction_id=batch.transactions[index].transaction_id,
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Transaction not found",
+            )
+        elif context.user_id != current_user.id:
+            results[index] = TransactionConfirmResult(
+                transaction_id=batch.transactions[index].transaction_id,
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not allowed to confirm this transaction",
+            )
+        else:
+            allowed.append(context)
+
+    confirms = {
+        context.transaction.id: batch.transactions[entries[context.transaction.id]]
+        for context in allowed
+    }
+    db_transactions = await TransactionService.confirm_transactions(db, allowed, confirms)
+    for context in allowed:
+        index = entries[context.transaction.id]
+        db_transaction = db_transactions.get(context.transaction.id)
+        if db_transaction is None:
+            results[index] = TransactionConfirmResult(
+                transaction_id=batch.transactions[index].transaction_id,
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Transaction not found",
+            )
+        else:
+            deferred = _awaits_verification(db_transaction)
+            if deferred:
+                _queue_verification(db_transaction)
+            results[index] = TransactionConfirmResult(
+                transaction_id=batch.transactions[index].transaction_id,
+                status_code=status.HTTP_202_ACCEPTED if deferred else status.HTTP_200_OK,
+                transaction=Transaction.model_validate(db_transaction),
+            )
+    return [results[index] for index in range(len(batch.transactions))]
+
+
+@router.get("/{transaction_id}/status", response_model=TransactionStatusUpdate)
+async def get_transaction_status(
+    transaction_id: str,
+    response: Response,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> TransactionStatusUpdate:
+    """
+    Get just the status of a transaction (Privy JWT required), for polling after an
+    asynchronous confirm. Pending and provisionally confirmed transactions carry a
+    Retry-After hint.
+    """
+    uuid_id = parse_transaction_id(transaction_id)
+    row = await _get_owned_status(db, uuid_id, current_user)
+    if _settling(row):
+        response.headers["Retry-After"] = str(
+            math.ceil(get_settings().transaction_events_poll_seconds)
         )
-    return Transaction.model_validate(db_transaction)
+    return TransactionStatusUpdate.model_validate(row)
 
 
-@router.get("/{transaction_id}", response_model=Transaction)
-def get_transaction(
+@router.get(
+    "/{transaction_id}/events",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+)
+async def stream_transaction_status(
     transaction_id: str,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> Transaction:
-    """Get a transaction by ID (Privy JWT required). You can only view your own transactions."""
-    from app.services.investment import InvestmentService
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Stream status changes of a transaction as server-sent events (Privy JWT required).
 
+    Sends a `status` event with the current state at once and again whenever it changes;
+    the stream ends once the transaction is failed or confirmed at finalized commitment
+    (a provisional confirmation is followed until it is final), or after
+    TRANSACTION_EVENTS_MAX_SECONDS (reconnect to keep following it).
+    """
     uuid_id = parse_transaction_id(transaction_id)
-    db_transaction = TransactionService.get_transaction(db, uuid_id)
-    if not db_transaction:
+    row = await _get_owned_status(db, uuid_id, current_user)
+    # The stream outlives this handler: don't keep the request's connection checked out
+    await db.close()
+    return StreamingResponse(
+        _status_events(uuid_id, row),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _get_owned_status(
+    db: AsyncSession, transaction_id: UUID, current_user: UserSnapshot
+) -> Row:
+    """Load a transaction's status row, enforcing that it belongs to the current user."""
+    row = await TransactionService.get_transaction_status(db, transaction_id)
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transaction not found",
         )
-
-    # Verify transaction belongs to current user
-    db_investment = InvestmentService.get_investment(db, db_transaction.investment_id)
-    if not db_investment or db_investment.user_id != current_user.id:
+    if row.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not allowed to view this transaction",
         )
+    return row
 
-    return Transaction.model_validate(db_transaction)
+
+async def _get_owned_context(
+    db: AsyncSession,
+    transaction_id: UUID,
+    current_user: UserSnapshot,
+    forbidden_detail: str,
+    for_update: bool = False,
+) -> ConfirmContext:
+    """
+    Load a transaction of the current user with its investment and project in one query
+    (ownership is part of the query); only a miss costs a second one, to tell 404 from 403.
+    """
+    context = await TransactionService.get_transaction_context(
+        db, transaction_id, user_id=current_user.id, for_update=for_update
+    )
+    if context is not None:
+        return context
+    if await TransactionService.get_transaction(db, transaction_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=forbidden_detail,
+    )
+
+
+def _settling(row: Row) -> bool:
+    """Whether a transaction's status can still change: pending or provisional."""
+    return row.status == TransactionStatus.PENDING or (
+        row.status == TransactionStatus.CONFIRMED and row.solana_commitment == "confirmed"
+    )
+
+
+def _status_event(update: TransactionStatusUpdate) -> str:
+    return f"event: status\ndata: {update.model_dump_json()}\n\n"
+
+
+async def _status_events(transaction_id: UUID, row: Row) -> AsyncIterator[str]:
+    """
+    Yield SSE frames for a transaction until it settles (a provisional confirmation is
+    followed until finalized or rolled back). Wakes early on changes made in
+    this process and re-reads the database every poll interval for changes made elsewhere
+    (other API instances, the reconciler); each read uses a short-lived session.
+    """
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.transaction_events_max_seconds
+    poll_seconds = settings.transaction_events_poll_seconds
+    last_sent = loop.time()
+    current = TransactionStatusUpdate.model_validate(row)
+
+    yield f"retry: {int(poll_seconds * 1000)}\n" + _status_event(current)
+    with get_transaction_events().listen(transaction_id) as changed:
+        while _settling(row) and loop.time() < deadline:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(changed.wait(), timeout=poll_seconds)
+            changed.clear()
+
+            async with SessionLocal() as db:
+                row = await TransactionService.get_transaction_status(db, transaction_id)
+            if row is None:
+                return  # deleted
+            update = TransactionStatusUpdate.model_validate(row)
+            if update != current:
+                current = update
+                last_sent = loop.time()
+                yield _status_event(current)
+            elif loop.time() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                last_sent = loop.time()
+                yield ": keepalive\n\n"
+
+
+@router.get("/{transaction_id}", response_model=Transaction)
+async def get_transaction(
+    transaction_id: str,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Transaction:
+    """Get a transaction by ID (Privy JWT required). You can only view your own transactions."""
+    uuid_id = parse_transaction_id(transaction_id)
+    context = await _get_owned_context(
+        db, uuid_id, current_user, "Not allowed to view this transaction"
+    )
+    return Transaction.model_validate(context.transaction)
 
 
 @router.get(
     "/investments/{investment_id}/transactions",
     response_model=List[Transaction],
 )
-def get_investment_transactions(
+async def get_investment_transactions(
     investment_id: str,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[Transaction]:
-    """Get all transactions for a specific investment (Privy JWT required)."""
+    """Get transactions for a specific investment, newest first (Privy JWT required)."""
     from app.api.endpoints.investments import parse_investment_id
     from app.services.investment import InvestmentService
 
     inv_uuid = parse_investment_id(investment_id)
 
-    db_investment = InvestmentService.get_investment(db, inv_uuid)
-    if not db_investment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Investment not found",
-        )
-    if db_investment.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to view transactions for this investment",
-        )
-
-    db_transactions = TransactionService.get_transactions_by_investment(db, inv_uuid)
+    # Ownership is part of the query; only an empty page needs the investment itself
+    db_transactions, next_cursor = await TransactionService.get_transactions_by_investment(
+        db, inv_uuid, limit=limit, cursor=cursor, user_id=current_user.id
+    )
+    if not db_transactions:
+        db_investment = await InvestmentService.get_investment(db, inv_uuid)
+        if not db_investment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Investment not found",
+            )
+        if db_investment.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not allowed to view transactions for this investment",
+            )
+    set_next_cursor(response, next_cursor)
     return [Transaction.model_validate(tx) for tx in db_transactions]
 
 
 @router.get("/pending", response_model=List[Transaction])
-def get_pending_transactions(
-    db: Session = Depends(get_db),
+async def get_pending_transactions(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[Transaction]:
-    """Get all pending transactions."""
-    db_transactions = TransactionService.get_pending_transactions(db)
+    """Get pending transactions, oldest first."""
+    db_transactions, next_cursor = await TransactionService.get_pending_transactions(
+        db, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
     return [Transaction.model_validate(tx) for tx in db_transactions]
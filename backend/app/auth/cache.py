@@ -0,0 +1,98 @@
+"""In-process cache of verified Privy claims keyed by access-token digest."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.config import Settings
+
+if TYPE_CHECKING:
+    from app.auth.privy import PrivyClaims
+
+
+class ClaimsCache:
+    """
+    Bounded LRU mapping SHA-256(token) to verified claims.
+
+    Entries expire at the earlier of the token's `exp` and `max_ttl_seconds` after
+    insertion, so a cached token is never accepted past its own expiry. Raw tokens are
+    never stored, only their digests.
+    """
+
+    def __init__(self, max_size: int = 10_000, max_ttl_seconds: float = 300.0) -> None:
+        self.max_size = max_size
+        self.max_ttl_seconds = max_ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[float, "PrivyClaims"]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(access_token: str) -> bytes:
+        return hashlib.sha256(access_token.encode()).digest()
+
+    def get(self, access_token: str) -> "PrivyClaims | None":
+        """Return cached claims for a token, or None on a miss or expired entry."""
+        key = self._digest(access_token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, access_token: str, claims: "PrivyClaims") -> None:
+        """Cache claims until the token expires (capped at max_ttl_seconds)."""
+        if self.max_size <= 0 or claims.expires_at is None:
+            return
+        expires_at = min(claims.expires_at, time.time() + self.max_ttl_seconds)
+        if expires_at <= time.time():
+            return
+        key = self._digest(access_token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss/eviction counters, hit ratio and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@lru_cache
+def _build_claims_cache(max_size: int, max_ttl_seconds: int) -> ClaimsCache:
+    return ClaimsCache(max_size=max_size, max_ttl_seconds=max_ttl_seconds)
+
+
+def get_claims_cache(settings: Settings) -> ClaimsCache:
+    """Return the process-wide claims cache."""
+    return _build_claims_cache(
+        settings.privy_claims_cache_size, settings.privy_claims_cache_ttl_seconds
+    )
@@ -1,16 +1,21 @@
 """Privy JWT verification and FastAPI dependency."""
 
 import logging
+from functools import lru_cache
 from typing import Annotated
 
+import anyio
+import jwt
 from fastapi import Depends, HTTPException, Request, status
 from privy import PrivyAPI
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.cache import get_claims_cache
+from app.auth.verifier import VerificationKeyUnavailableError, get_token_verifier
 from app.config import Settings, get_settings
 from app.database import get_db
-from app.models.user import User
 from app.services.user import UserService
+from app.services.user_cache import UserSnapshot, get_identity_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,45 +23,45 @@ logger = logging.getLogger(__name__)
 class PrivyClaims:
     """Verified Privy access token claims (Privy DID and session)."""
 
-    def __init__(self, user_id: str, session_id: str, app_id: str) -> None:
+    def __init__(
+        self,
+        user_id: str,
+        session_id: str,
+        app_id: str,
+        expires_at: float | None = None,
+    ) -> None:
         self.user_id = user_id  # Privy DID
         self.session_id = session_id
         self.app_id = app_id
+        self.expires_at = expires_at  # Token exp (Unix seconds), if known
+
+
+@lru_cache
+def _build_privy_client(app_id: str, app_secret: str) -> PrivyAPI:
+    return PrivyAPI(app_id=app_id, app_secret=app_secret)
 
 
 def _get_privy_client(settings: Settings) -> PrivyAPI | None:
-    """Return a PrivyAPI client if credentials are configured."""
+    """Return the shared PrivyAPI client if credentials are configured."""
     if not settings.privy_app_id or not settings.privy_app_secret:
         return None
-    return PrivyAPI(app_id=settings.privy_app_id, app_secret=settings.privy_app_secret)
+    return _build_privy_client(settings.privy_app_id, settings.privy_app_secret)
 
 
-async def get_privy_user(
-    request: Request,
-    settings: Annotated[Settings, Depends(get_settings)],
-) -> PrivyClaims:
-    """
-    FastAPI dependency: verify Authorization Bearer token with Privy and return claims.
-    Uses PrivyAPI.users.verify_access_token(access_token).
-    Raises 401 if missing/invalid token or Privy not configured.
-    """
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        logger.warning("Missing or malformed Authorization header")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid Authorization header",
-        )
-    access_token = auth_header.removeprefix("Bearer ").strip()
-    if not access_token:
-        logger.warning("Empty access token after parsing Authorization header")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid Authorization header",
-        )
+def _claim(v, *keys: str):
+    """Read the first present claim from an SDK response (dict or object)."""
+    for key in keys:
+        if isinstance(v, dict):
+            val = v.get(key)
+        else:
+            val = getattr(v, key, None)
+        if val is not None:
+            return val
+    return None
 
-    logger.info(f"Attempting to verify token for request to {request.url.path}")
 
+def _verify_with_sdk(access_token: str, settings: Settings) -> PrivyClaims:
+    """Fallback: verify the token through the Privy SDK."""
     client = _get_privy_client(settings)
     if client is None:
         raise HTTPException(
@@ -73,40 +78,132 @@ async def get_privy_user(
             detail=f"Invalid or expired token: {e}",
         ) from e
 
-    # Map SDK response to our claims (SDK may return dict or object)
-    def _claim(v, *keys: str):
-        for key in keys:
-            if isinstance(v, dict):
-                val = v.get(key)
-            else:
-                val = getattr(v, key, None)
-            if val is not None:
-                return val
-        return None
-
     user_id = _claim(verified, "user_id", "userId")
     session_id = _claim(verified, "session_id", "sessionId")
     app_id = _claim(verified, "app_id", "appId")
+    expiration = _claim(verified, "expiration", "exp")
     if not user_id:
         logger.error(f"Token verified but missing user_id. Verified object: {verified}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token claims",
         )
-    logger.info(f"Successfully verified token for Privy user: {user_id}")
     return PrivyClaims(
         user_id=str(user_id),
         session_id=str(session_id) if session_id else "",
         app_id=str(app_id) if app_id else "",
+        expires_at=float(expiration) if expiration else None,
     )
 
 
+def _verify_uncached(access_token: str, settings: Settings) -> PrivyClaims:
+    """
+    Check the ES256 signature, issuer, audience and expiry locally against the cached
+    verification key; fall back to the Privy SDK only if no key can be obtained.
+    """
+    verifier = get_token_verifier(settings)
+    if verifier is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Privy not configured (PRIVY_APP_ID / PRIVY_APP_SECRET)",
+        )
+
+    try:
+        payload = verifier.verify(access_token)
+    except VerificationKeyUnavailableError as e:
+        logger.warning(f"Privy verification key unavailable, falling back to SDK: {e}")
+        return _verify_with_sdk(access_token, settings)
+    except jwt.InvalidTokenError as e:
+        logger.error(f"Privy token verification failed: {type(e).__name__}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid or expired token: {e}",
+        ) from e
+
+    return PrivyClaims(
+        user_id=str(payload["sub"]),
+        session_id=str(payload.get("sid") or ""),
+        app_id=str(payload["aud"]),
+        expires_at=float(payload["exp"]),
+    )
+
+
+_verification_limiter: anyio.CapacityLimiter | None = None
+
+
+def _get_verification_limiter(settings: Settings) -> anyio.CapacityLimiter:
+    """Return the limiter bounding concurrent off-loop verifications."""
+    global _verification_limiter
+    if _verification_limiter is None:
+        _verification_limiter = anyio.CapacityLimiter(settings.privy_verification_workers)
+    return _verification_limiter
+
+
+async def verify_access_token(access_token: str, settings: Settings) -> PrivyClaims:
+    """
+    Verify a Privy access token and return its claims.
+
+    Repeat tokens are served from the claims cache until they expire. Cache misses are
+    verified in a bounded worker pool so signature checks, key fetches and SDK calls
+    never block the event loop.
+    Raises 401 for invalid tokens and 503 if Privy is not configured.
+    """
+    cache = get_claims_cache(settings)
+    claims = cache.get(access_token)
+    if claims is not None:
+        return claims
+    claims = await anyio.to_thread.run_sync(
+        _verify_uncached,
+        access_token,
+        settings,
+        limiter=_get_verification_limiter(settings),
+    )
+    cache.put(access_token, claims)
+    return claims
+
+
+async def get_privy_user(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> PrivyClaims:
+    """
+    FastAPI dependency: verify Authorization Bearer token with Privy and return claims.
+    Raises 401 if missing/invalid token or 503 if Privy not configured.
+    """
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        logger.warning("Missing or malformed Authorization header")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid Authorization header",
+        )
+    access_token = auth_header.removeprefix("Bearer ").strip()
+    if not access_token:
+        logger.warning("Empty access token after parsing Authorization header")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid Authorization header",
+        )
+
+    logger.debug(f"Attempting to verify token for request to {request.url.path}")
+    claims = await verify_access_token(access_token, settings)
+    logger.debug(f"Successfully verified token for Privy user: {claims.user_id}")
+    return claims
+
+
 async def get_current_user(
     claims: Annotated[PrivyClaims, Depends(get_privy_user)],
-    db: Annotated[Session, Depends(get_db)],
-) -> User:
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> UserSnapshot:
     """
-    FastAPI dependency: verify Privy token and return the linked DB user.
+    FastAPI dependency: verify Privy token and return a snapshot of the linked DB user.
     Creates a user with placeholder email on first request if none exists for this Privy DID.
+    Snapshots are served from the identity cache, so most requests skip the user lookup.
     """
-    return UserService.get_or_create_user_by_privy(db, claims.user_id)
+    cache = get_identity_cache()
+    snapshot = cache.get(claims.user_id)
+    if snapshot is None:
+        user = await UserService.get_or_create_user_by_privy(db, claims.user_id)
+        snapshot = UserSnapshot.from_model(user)
+        cache.put(snapshot)
+    return snapshot
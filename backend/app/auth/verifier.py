@@ -0,0 +1,160 @@
+"""Local verification of Privy access tokens (ES256 JWTs)."""
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any
+
+import httpx
+import jwt
+from jwt.algorithms import ECAlgorithm
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+PRIVY_ISSUER = "privy.io"
+PRIVY_ALGORITHM = "ES256"
+PRIVY_JWKS_URL = "https://auth.privy.io/api/v1/apps/{app_id}/jwks.json"
+
+
+class VerificationKeyUnavailableError(Exception):
+    """Raised when no verification key can be obtained for a token."""
+
+
+class PrivyTokenVerifier:
+    """
+    Verify Privy access tokens locally against a cached verification key.
+
+    The key is either configured statically (PRIVY_VERIFICATION_KEY, the PEM shown in the
+    Privy dashboard) or fetched from the app's JWKS endpoint and refreshed every
+    `refresh_seconds`. Signature, issuer, audience (app ID) and expiry are checked
+    without any network round trip once a key is cached.
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        verification_key: str | None = None,
+        jwks_url: str | None = None,
+        refresh_seconds: int = 3600,
+        leeway_seconds: int = 0,
+        min_refresh_seconds: float = 30.0,
+    ) -> None:
+        self.app_id = app_id
+        self.jwks_url = jwks_url or PRIVY_JWKS_URL.format(app_id=app_id)
+        self.refresh_seconds = refresh_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self.leeway_seconds = leeway_seconds
+        self._static_key = (
+            ECAlgorithm(ECAlgorithm.SHA256).prepare_key(verification_key.replace("\\n", "\n"))
+            if verification_key
+            else None
+        )
+        self._keys: dict[str | None, Any] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fetch_keys(self) -> dict[str | None, Any]:
+        """Download the app's JWKS and return its ES256 keys indexed by kid."""
+        response = httpx.get(self.jwks_url, timeout=10.0)
+        response.raise_for_status()
+        keys: dict[str | None, Any] = {}
+        for jwk in response.json().get("keys", []):
+            if jwk.get("alg", PRIVY_ALGORITHM) != PRIVY_ALGORITHM:
+                continue
+            keys[jwk.get("kid")] = ECAlgorithm.from_jwk(jwk)
+        if not keys:
+            raise VerificationKeyUnavailableError("JWKS response contained no ES256 keys")
+        return keys
+
+    def _refresh(self, force: bool = False) -> None:
+        """
+        Refresh the cached keys if they are stale. A forced refresh skips the staleness
+        check but still not within `min_refresh_seconds` of the last fetch, so tokens with
+        made-up kids cannot trigger a JWKS download per request.
+        """
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if age < (self.min_refresh_seconds if force else self.refresh_seconds):
+                return
+            try:
+                self._keys = self._fetch_keys()
+            except (httpx.HTTPError, ValueError, VerificationKeyUnavailableError) as e:
+                logger.warning(f"Failed to refresh Privy verification key: {e}")
+                if not self._keys:
+                    raise VerificationKeyUnavailableError(str(e)) from e
+                # Keep serving the previous keys; retry after the next interval
+            self._fetched_at = time.monotonic()
+
+    def get_key(self, kid: str | None) -> Any:
+        """Return the verification key for a token header `kid`."""
+        if self._static_key is not None:
+            return self._static_key
+
+        self._refresh()
+        key = self._keys.get(kid)
+        if key is None and kid is not None:
+            # Unknown kid usually means Privy rotated keys; refetch (rate limited)
+            self._refresh(force=True)
+            key = self._keys.get(kid)
+        if key is None and len(self._keys) == 1:
+            key = next(iter(self._keys.values()))
+        if key is None:
+            raise VerificationKeyUnavailableError(f"No verification key for kid {kid!r}")
+        return key
+
+    def verify(self, access_token: str) -> dict[str, Any]:
+        """
+        Verify an access token and return its claims.
+
+        Raises:
+            jwt.InvalidTokenError: If the token is malformed, forged, expired or
+                issued for another app.
+            VerificationKeyUnavailableError: If no key could be obtained to check it.
+        """
+        header = jwt.get_unverified_header(access_token)
+        key = self.get_key(header.get("kid"))
+        return jwt.decode(
+            access_token,
+            key=key,
+            algorithms=[PRIVY_ALGORITHM],
+            issuer=PRIVY_ISSUER,
+            audience=self.app_id,
+            leeway=self.leeway_seconds,
+            options={"require": ["exp", "iss", "aud", "sub"]},
+        )
+
+
+@lru_cache
+def _build_verifier(
+    app_id: str,
+    verification_key: str | None,
+    jwks_url: str | None,
+    refresh_seconds: int,
+    leeway_seconds: int,
+    min_refresh_seconds: float,
+) -> PrivyTokenVerifier:
+    return PrivyTokenVerifier(
+        app_id=app_id,
+        verification_key=verification_key,
+        jwks_url=jwks_url,
+        refresh_seconds=refresh_seconds,
+        leeway_seconds=leeway_seconds,
+        min_refresh_seconds=min_refresh_seconds,
+    )
+
+
+def get_token_verifier(settings: Settings) -> PrivyTokenVerifier | None:
+    """Return the process-wide verifier, or None if Privy is not configured."""
+    if not settings.privy_app_id:
+        return None
+    return _build_verifier(
+        settings.privy_app_id,
+        settings.privy_verification_key,
+        settings.privy_jwks_url,
+        settings.privy_verification_key_refresh_seconds,
+        settings.privy_token_leeway_seconds,
+        settings.privy_verification_key_min_refresh_seconds,
+    )
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import List, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -17,6 +17,28 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = Field(..., description="PostgreSQL database URL")
+    database_pool_size: int = Field(default=5, description="Persistent connections per process")
+    database_max_overflow: int = Field(
+        default=10, description="Extra connections allowed above the pool size"
+    )
+    database_pool_recycle: int = Field(
+        default=1800, description="Seconds before a pooled connection is replaced (-1 disables)"
+    )
+    database_pool_timeout: float = Field(
+        default=30.0, description="Seconds to wait for a free connection before failing"
+    )
+    database_pool_pre_ping: bool = Field(
+        default=True,
+        description="Ping connections on checkout; disable to rely on pool_recycle alone",
+    )
+    database_replica_url: str | None = Field(
+        default=None,
+        description="Comma-separated read replica URLs used by GET handlers (optional)",
+    )
+    database_replica_sticky_seconds: float = Field(
+        default=5.0,
+        description="Seconds a client's reads stay on the primary after it commits a write",
+    )
 
     # CORS
     allowed_origins: str = Field(
@@ -26,6 +48,10 @@ class Settings(BaseSettings):
 
     # App
     debug: bool = Field(default=False, description="Debug mode")
+    sql_repeat_warning_threshold: int = Field(
+        default=5,
+        description="Warn when one SQL statement shape runs more than this many times per request",
+    )
 
     # Google Maps (optional; required only for Maps/Places-dependent endpoints)
     google_maps_api_key: str | None = Field(default=None, description="Google Maps API key")
@@ -41,6 +67,40 @@ class Settings(BaseSettings):
     privy_app_secret: str | None = Field(
         default=None, description="Privy app secret from dashboard"
     )
+    privy_verification_key: str | None = Field(
+        default=None,
+        description="Privy verification key (PEM) from dashboard; fetched from JWKS if unset",
+    )
+    privy_jwks_url: str | None = Field(
+        default=None, description="Override for the Privy JWKS URL (defaults to the app's)"
+    )
+    privy_verification_key_refresh_seconds: int = Field(
+        default=3600, description="How often to refetch the Privy verification key"
+    )
+    privy_verification_key_min_refresh_seconds: float = Field(
+        default=30.0,
+        description="Minimum seconds between key refetches triggered by an unknown kid",
+    )
+    privy_token_leeway_seconds: int = Field(
+        default=0, description="Clock skew tolerance when checking token expiry"
+    )
+    privy_claims_cache_size: int = Field(
+        default=10_000, description="Max verified tokens kept in memory (0 disables)"
+    )
+    privy_claims_cache_ttl_seconds: int = Field(
+        default=300, description="Max seconds a verified token is cached (never past exp)"
+    )
+    privy_verification_workers: int = Field(
+        default=8, description="Max token verifications running concurrently off the event loop"
+    )
+
+    # Identity cache (Privy DID -> user snapshot)
+    identity_cache_size: int = Field(
+        default=10_000, description="Max user snapshots kept in memory (0 disables)"
+    )
+    identity_cache_ttl_seconds: int = Field(
+        default=60, description="Seconds a cached user snapshot stays valid"
+    )
 
     # Solana
     solana_rpc_url: str = Field(
@@ -53,7 +113,160 @@ class Settings(BaseSettings):
     )
     transaction_verification_timeout: int = Field(
         default=300,
-        description="Transaction verification timeout in seconds",
+        description="Transaction verification timeout in seconds: the deadline of one "
+        "verification, RPC retries, hedges and limiter queueing included",
+    )
+    solana_confirm_commitment: Literal["confirmed", "finalized"] = Field(
+        default="confirmed",
+        description="Commitment at which confirm accepts a transaction; below finalized it "
+        "is provisional until the reconciler promotes or rolls it back",
+    )
+    solana_rpc_request_timeout: float = Field(
+        default=30.0, description="Seconds one RPC request may take to answer"
+    )
+    solana_rpc_connect_timeout: float = Field(
+        default=10.0, description="Seconds allowed to open a connection to the RPC node"
+    )
+    solana_rpc_max_connections: int = Field(
+        default=100, description="Max concurrent connections to the RPC node"
+    )
+    solana_rpc_max_keepalive_connections: int = Field(
+        default=20, description="Max idle keep-alive connections kept to the RPC node"
+    )
+    solana_rpc_keepalive_expiry: float = Field(
+        default=30.0, description="Seconds an idle RPC connection is kept open"
+    )
+    solana_rpc_http2: bool = Field(
+        default=False, description="Use HTTP/2 to the RPC node (multiplexes one connection)"
+    )
+    solana_rpc_fallback_urls: str | None = Field(
+        default=None,
+        description="Comma-separated extra RPC endpoints; requests go to the fastest healthy one",
+    )
+    solana_rpc_ewma_alpha: float = Field(
+        default=0.2, description="Weight of the newest sample in each endpoint's latency average"
+    )
+    solana_rpc_failure_threshold: int = Field(
+        default=3, description="Consecutive errors before an endpoint is taken out of rotation"
+    )
+    solana_rpc_cooldown_seconds: float = Field(
+        default=30.0,
+        description="How long an endpoint that keeps failing sits out of rotation",
+    )
+    solana_rpc_hedge_enabled: bool = Field(
+        default=False, description="Race slow reads against a second RPC endpoint"
+    )
+    solana_rpc_hedge_percentile: float = Field(
+        default=0.95, description="Hedge once a read is slower than this latency percentile"
+    )
+    solana_rpc_hedge_min_delay_ms: float = Field(
+        default=50.0, description="Never hedge a read sooner than this"
+    )
+    solana_rpc_rate_limit: float = Field(
+        default=0.0, description="Max RPC calls per second sent to the node (0 = unlimited)"
+    )
+    solana_rpc_rate_burst: int = Field(
+        default=10, description="RPC calls that may go out at once before the rate applies"
+    )
+    solana_rpc_concurrency_initial: int = Field(
+        default=16, description="Starting limit on concurrent RPC requests (adapts to 429s)"
+    )
+    solana_rpc_concurrency_min: int = Field(
+        default=1, description="Floor of the adaptive RPC concurrency limit"
+    )
+    solana_rpc_concurrency_max: int = Field(
+        default=64, description="Ceiling of the adaptive RPC concurrency limit"
+    )
+    solana_rpc_queue_timeout_seconds: float = Field(
+        default=10.0, description="How long an RPC request may wait for the limiter"
+    )
+    solana_finalized_cache_size: int = Field(
+        default=10_000, description="Max finalized transactions kept in memory (0 disables)"
+    )
+    solana_finalized_cache_persist: bool = Field(
+        default=False, description="Also store finalized transactions in the database"
+    )
+    solana_ws_url: str | None = Field(
+        default=None,
+        description="Solana websocket endpoint (default: SOLANA_RPC_URL with ws:// or wss://)",
+    )
+
+    # Signature subscriber (one websocket to the RPC node; run it in one process only)
+    signature_subscriber_enabled: bool = Field(
+        default=False, description="Confirm pending transactions from signatureSubscribe pushes"
+    )
+    signature_subscriber_refresh_seconds: float = Field(
+        default=5.0, description="How often pending signatures are reloaded from the database"
+    )
+    signature_subscriber_max_signatures: int = Field(
+        default=5000, description="Max signatures subscribed at once (newest pending first)"
+    )
+    signature_subscriber_reconnect_max_seconds: float = Field(
+        default=60.0, description="Upper bound on the delay between reconnect attempts"
+    )
+    signature_subscriber_notified_ttl_seconds: float = Field(
+        default=60.0,
+        description="Seconds a notified signature is not resubscribed while it is verified",
+    )
+
+    # Pending transaction reconciler (background worker; run it in one process only)
+    reconciler_enabled: bool = Field(
+        default=False, description="Run the transaction reconciler inside the API process"
+    )
+    reconciler_interval_seconds: float = Field(
+        default=15.0, description="Pause between reconciliation passes"
+    )
+    reconciler_batch_size: int = Field(
+        default=1024, description="Max transactions examined per reconciliation pass"
+    )
+    reconciler_concurrency: int = Field(
+        default=8, description="Max getTransaction verifications in flight at once"
+    )
+    reconciler_backoff_base_seconds: float = Field(
+        default=10.0, description="Recheck delay after the first attempt (doubles per attempt)"
+    )
+    reconciler_backoff_max_seconds: float = Field(
+        default=3600.0, description="Upper bound on the per-transaction recheck delay"
+    )
+    reconciler_max_attempts: int = Field(
+        default=20,
+        description="Stop rechecking a pending or failed transaction after this many attempts",
+    )
+    reconciler_failed_lookback_seconds: int = Field(
+        default=86_400, description="How far back failed transactions are rechecked"
+    )
+    reconciler_rollback_seconds: float = Field(
+        default=120.0,
+        description="Roll back a provisional confirmation whose signature the cluster has "
+        "not known for this long (dropped fork)",
+    )
+
+    # Project PDA wallet indexer (background worker; run it in one process only)
+    wallet_indexer_enabled: bool = Field(
+        default=False, description="Tail project PDA wallets inside the API process"
+    )
+    wallet_indexer_interval_seconds: float = Field(
+        default=10.0, description="Pause between wallet indexing passes"
+    )
+    wallet_indexer_max_signatures: int = Field(
+        default=500, description="Max new signatures indexed per wallet per pass"
+    )
+    wallet_indexer_concurrency: int = Field(
+        default=4, description="Wallets indexed at once"
+    )
+
+    # Asynchronous confirm (POST /transactions/{id}/confirm with Prefer: respond-async)
+    confirmation_workers: int = Field(
+        default=4, description="Background workers verifying asynchronously confirmed transactions"
+    )
+    confirmation_queue_size: int = Field(
+        default=1000, description="Max queued verifications (overflow is left to the reconciler)"
+    )
+    transaction_events_poll_seconds: float = Field(
+        default=2.0, description="How often status streams recheck the database"
+    )
+    transaction_events_max_seconds: float = Field(
+        default=300.0, description="Close status streams after this long (clients reconnect)"
     )
 
     @property
@@ -61,6 +274,21 @@ class Settings(BaseSettings):
         """Parse allowed origins into a list."""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
 
+    @property
+    def rpc_urls_list(self) -> List[str]:
+        """Solana RPC endpoints: the primary URL first, then the fallback URLs."""
+        urls = [self.solana_rpc_url]
+        if self.solana_rpc_fallback_urls:
+            urls += [url.strip() for url in self.solana_rpc_fallback_urls.split(",")]
+        return list(dict.fromkeys(url for url in urls if url))
+
+    @property
+    def replica_urls_list(self) -> List[str]:
+        """Parse read replica URLs into a list."""
+        if not self.database_replica_url:
+            return []
+        return [url.strip() for url in self.database_replica_url.split(",") if url.strip()]
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,29 +1,251 @@
-from typing import Generator
+import hashlib
+import itertools
+import threading
+import time
+from typing import Any, AsyncGenerator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Request
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
+from app.query_metrics import instrument_engine
 
 settings = get_settings()
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    echo=settings.debug,
+
+def _async_database_url(database_url: str) -> str:
+    """Point a postgresql:// URL at the asyncpg driver (migrations keep psycopg2)."""
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2", "postgres"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+class PoolMetrics:
+    """Counters for connection checkouts: how many, how long they waited, how many timed out."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_wait_avg_ms": (
+                    self.wait_seconds_total / self.checkouts * 1000 if self.checkouts else 0.0
+                ),
+                "checkout_wait_max_ms": self.wait_seconds_max * 1000,
+                "checkout_timeouts": self.checkout_timeouts,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time and checkout timeouts."""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+def _create_engine(database_url: str) -> AsyncEngine:
+    async_engine = create_async_engine(
+        _async_database_url(database_url),
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_recycle=settings.database_pool_recycle,
+        pool_timeout=settings.database_pool_timeout,
+        echo=settings.debug,
+    )
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+
+class PrimarySession(Session):
+    """
+    Session bound to the primary; commits that wrote something mark the client for
+    read-your-writes.
+    """
+
+
+class ReadOnlySession(Session):
+    """
+    Session used for replicas: refuses to flush pending changes and to execute INSERT,
+    UPDATE or DELETE statements. Raw SQL through text() or session.connection() is not
+    checked.
+    """
+
+    def flush(self, objects: Any = None) -> None:
+        if self.new or self.dirty or self.deleted:
+            raise exc.InvalidRequestError("Replica sessions are read-only")
+        super().flush(objects)
+
+
+def _is_dml(orm_execute_state: ORMExecuteState) -> bool:
+    return orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+
+
+@event.listens_for(ReadOnlySession, "do_orm_execute")
+def _refuse_dml_on_replica(orm_execute_state: ORMExecuteState) -> None:
+    if _is_dml(orm_execute_state):
+        raise exc.InvalidRequestError("Replica sessions are read-only")
+
+
+class ReadYourWritesTracker:
+    """
+    Remembers clients that recently committed a write so their reads stay on the primary
+    until replicas have had time to catch up.
+    """
+
+    def __init__(self, sticky_seconds: float) -> None:
+        self.sticky_seconds = sticky_seconds
+        self._deadlines: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, client_key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._deadlines[client_key] = now + self.sticky_seconds
+            if len(self._deadlines) > 10_000:
+                self._deadlines = {k: d for k, d in self._deadlines.items() if d > now}
+
+    def is_sticky(self, client_key: str) -> bool:
+        with self._lock:
+            deadline = self._deadlines.get(client_key)
+        return deadline is not None and deadline > time.monotonic()
+
+
+def _client_key(request: Request) -> str:
+    """Identify the caller for read-your-writes: bearer token digest, else client address."""
+    auth_header = request.headers.get("Authorization")
+    if auth_header:
+        return hashlib.sha256(auth_header.encode()).hexdigest()
+    return request.client.host if request.client else ""
+
+
+# Create SQLAlchemy async engines (primary plus optional read replicas)
+engine = _create_engine(settings.database_url)
+replica_engines = [_create_engine(url) for url in settings.replica_urls_list]
+
+# Create session factories. Objects stay usable after commit so responses can be built
+# without lazy reloads, which are not allowed under asyncio.
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=PrimarySession,
 )
+ReplicaSessionLocals = [
+    async_sessionmaker(
+        bind=replica_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=ReadOnlySession,
+    )
+    for replica_engine in replica_engines
+]
+_replica_cycle = itertools.cycle(ReplicaSessionLocals)
+
+read_your_writes = ReadYourWritesTracker(settings.database_replica_sticky_seconds)
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _note_flushed_writes(session: Session, flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _note_executed_writes(orm_execute_state: ORMExecuteState) -> None:
+    if _is_dml(orm_execute_state):
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _forget_rolled_back_writes(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_client_after_commit(session: Session) -> None:
+    # Read-only commits (ending a read transaction) need no stickiness
+    if not session.info.pop("wrote", False):
+        return
+    client_key = session.info.get("client_key")
+    if client_key is not None and replica_engines:
+        read_your_writes.mark(client_key)
+
+
+def _engine_pool_metrics(db_engine: AsyncEngine) -> dict[str, Any]:
+    pool = db_engine.pool
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.database_max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow_in_use": max(pool.overflow(), 0),
+    }
+
+
+def get_pool_metrics() -> dict[str, Any]:
+    """Snapshot of connection pool usage for the metrics endpoint."""
+    return {
+        **_engine_pool_metrics(engine),
+        **pool_metrics.snapshot(),
+        "replicas": [_engine_pool_metrics(replica) for replica in replica_engines],
+    }
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a primary database session (use for anything that writes)."""
+    async with SessionLocal() as db:
+        db.info["client_key"] = _client_key(request)
+        yield db
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a read-only session for GET handlers.
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency to get database session."""
-    db = SessionLocal()
-    try:
+    Routes to a replica (round-robin) when DATABASE_REPLICA_URL is set, except for clients
+    that committed a write within the last DATABASE_REPLICA_STICKY_SECONDS, whose reads
+    stay on the primary so they see their own writes.
+    """
+    if not ReplicaSessionLocals or read_your_writes.is_sticky(_client_key(request)):
+        session_factory = SessionLocal
+    else:
+        session_factory = next(_replica_cycle)
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
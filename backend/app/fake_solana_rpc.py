@@ -0,0 +1,377 @@
+"""
+In-memory fake Solana JSON-RPC node for local development and load checks.
+
+Serves the subset of JSON-RPC the backend uses (getSignatureStatuses, getTransaction,
+getSignaturesForAddress) from a ledger of registered SOL transfers, and counts calls per
+method so batching can be observed. The same port accepts websocket connections for
+signatureSubscribe, which is notified as soon as a registered transfer reaches the
+requested commitment. Run it next to the API and point SOLANA_RPC_URL at it:
+
+    uvicorn app.fake_solana_rpc:app --port 8899
+    SOLANA_RPC_URL=http://localhost:8899 make run
+
+Register transfers over HTTP (POST /_fake/transfers with signature, recipient, lamports
+and optionally sender, err, confirmation_status) or in-process through `ledger`; posting
+a signature again with a later confirmation_status advances it.
+Faults can be injected to exercise failover and hedging: FAKE_RPC_LATENCY_MS adds a
+fixed delay (plus up to FAKE_RPC_JITTER_MS) to every RPC response, and FAKE_RPC_ERROR_RATE
+answers that fraction of RPC requests with FAKE_RPC_ERROR_STATUS (default 429).
+FAKE_RPC_RATE_LIMIT (calls per second, batches count per call) and FAKE_RPC_MAX_CONCURRENCY
+reject traffic over those limits with 429, like a throttling public node. They can
+also be changed at runtime with PUT /_fake/faults. Run several nodes on different ports
+and list them in SOLANA_RPC_FALLBACK_URLS to try the RPC pool.
+"""
+
+import asyncio
+import itertools
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel
+
+COMMITMENT_LEVELS = ("processed", "confirmed", "finalized")
+
+
+@dataclass
+class FakeTransfer:
+    """A SOL transfer the fake node knows about."""
+
+    signature: str
+    recipient: str
+    lamports: int
+    sender: str = "FakeSender1111111111111111111111111111111111"
+    err: Any = None
+    confirmation_status: str = "finalized"
+    slot: int = 1
+
+
+class FakeFaults(BaseModel):
+    """Latency and errors injected into RPC responses."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 429
+    rate_limit: float = 0.0  # calls per second, 0 = unlimited
+    max_concurrency: int = 0  # requests in flight, 0 = unlimited
+
+
+class FakeLedger:
+    """Transfers keyed by signature, plus per-method call counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.transfers: dict[str, FakeTransfer] = {}
+        self.history: list[str] = []  # signatures in ledger order, oldest first
+        self.calls: Counter[str] = Counter()
+        # signature -> (commitment, callback) of open signatureSubscribe subscriptions
+        self.watchers: defaultdict[str, list[tuple[str, Callable]]] = defaultdict(list)
+
+    def add_transfer(self, transfer: FakeTransfer) -> None:
+        with self._lock:
+            if transfer.signature not in self.transfers:
+                self.history.append(transfer.signature)
+            self.transfers[transfer.signature] = transfer
+            watchers = self.watchers.pop(transfer.signature, [])
+            waiting = [w for w in watchers if not self._reached(transfer, w[0])]
+            if waiting:
+                self.watchers[transfer.signature] = waiting
+        for commitment, callback in watchers:
+            if self._reached(transfer, commitment):
+                callback(transfer)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.transfers.clear()
+            self.history.clear()
+            self.calls.clear()
+            self.watchers.clear()
+
+    @staticmethod
+    def _reached(transfer: FakeTransfer, commitment: str) -> bool:
+        return COMMITMENT_LEVELS.index(transfer.confirmation_status) >= COMMITMENT_LEVELS.index(
+            commitment
+        )
+
+    def watch(self, signature: str, commitment: str, callback: Callable) -> None:
+        """Call `callback(transfer)` once `signature` reaches `commitment` (now, if it has)."""
+        with self._lock:
+            transfer = self.transfers.get(signature)
+            if transfer is None or not self._reached(transfer, commitment):
+                self.watchers[signature].append((commitment, callback))
+                return
+        callback(transfer)
+
+    def unwatch(self, signature: str, callback: Callable) -> None:
+        with self._lock:
+            self.watchers[signature] = [w for w in self.watchers[signature] if w[1] != callback]
+            if not self.watchers[signature]:
+                del self.watchers[signature]
+
+    def signature_status(self, signature: str) -> dict | None:
+        transfer = self.transfers.get(signature)
+        if transfer is None:
+            return None
+        return {
+            "slot": transfer.slot,
+            "confirmations": None if transfer.confirmation_status == "finalized" else 1,
+            "err": transfer.err,
+            "status": {"Err": transfer.err} if transfer.err else {"Ok": None},
+            "confirmationStatus": transfer.confirmation_status,
+        }
+
+    def transaction(self, signature: str, commitment: str = "finalized") -> dict | None:
+        transfer = self.transfers.get(signature)
+        if transfer is None or transfer.confirmation_status == "processed":
+            return None
+        if commitment == "finalized" and transfer.confirmation_status != "finalized":
+            return None
+        start_balance = transfer.lamports + 5_000_000_000
+        return {
+            "slot": transfer.slot,
+            "meta": {
+                "err": transfer.err,
+                "fee": 5000,
+                "preBalances": [start_balance, 0],
+                "postBalances": [start_balance - transfer.lamports - 5000, transfer.lamports],
+            },
+            "transaction": {
+                "signatures": [signature],
+                "message": {
+                    "accountKeys": [
+                        {"pubkey": transfer.sender, "signer": True, "writable": True},
+                        {"pubkey": transfer.recipient, "signer": False, "writable": True},
+                    ],
+                },
+            },
+        }
+
+    def signatures_for_address(self, address: str, options: dict) -> list[dict]:
+        """getSignaturesForAddress: newest first, between `until` and `before`."""
+        commitment = options.get("commitment", "finalized")
+        limit = min(options.get("limit", 1000), 1000)
+        entries: list[dict] = []
+        started = options.get("before") is None
+        for signature in reversed(self.history):
+            if signature == options.get("until"):
+                break
+            if not started:
+                started = signature == options["before"]
+                continue
+            transfer = self.transfers[signature]
+            if address not in (transfer.sender, transfer.recipient):
+                continue
+            if not self._reached(transfer, commitment):
+                continue
+            entries.append(
+                {
+                    "signature": signature,
+                    "slot": transfer.slot,
+                    "err": transfer.err,
+                    "memo": None,
+                    "blockTime": None,
+                    "confirmationStatus": transfer.confirmation_status,
+                }
+            )
+            if len(entries) == limit:
+                break
+        return entries
+
+    def handle(self, call: dict) -> dict:
+        method = call.get("method")
+        params = call.get("params") or []
+        with self._lock:
+            self.calls[method] += 1
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": call.get("id")}
+        if method == "getSignatureStatuses":
+            signatures = params[0] if params else []
+            if len(signatures) > 256:
+                response["error"] = {"code": -32602, "message": "Too many inputs provided"}
+            else:
+                response["result"] = {
+                    "context": {"slot": 1},
+                    "value": [self.signature_status(sig) for sig in signatures],
+                }
+        elif method == "getTransaction":
+            options = params[1] if len(params) > 1 else {}
+            response["result"] = (
+                self.transaction(params[0], options.get("commitment", "finalized"))
+                if params
+                else None
+            )
+        elif method == "getSignaturesForAddress":
+            with self._lock:
+                response["result"] = self.signatures_for_address(
+                    params[0], params[1] if len(params) > 1 else {}
+                )
+        else:
+            response["error"] = {"code": -32601, "message": "Method not found"}
+        return response
+
+
+class FakeTransferCreate(BaseModel):
+    """Body for registering a transfer with the fake node."""
+
+    signature: str
+    recipient: str
+    lamports: int
+    sender: str = "FakeSender1111111111111111111111111111111111"
+    err: Any = None
+    confirmation_status: str = "finalized"
+
+
+def create_app(
+    ledger: FakeLedger, latency_ms: float = 0.0, faults: FakeFaults | None = None
+) -> FastAPI:
+    """Build the fake RPC ASGI app around `ledger`."""
+    fake_app = FastAPI(title="Fake Solana RPC", docs_url=None, redoc_url=None)
+    fake_app.state.faults = faults or FakeFaults(latency_ms=latency_ms)
+    accepted: deque[float] = deque()  # monotonic times of calls in the last second
+    in_flight = 0
+
+    def throttled(faults: FakeFaults, cost: int) -> bool:
+        now = time.monotonic()
+        while accepted and accepted[0] <= now - 1:
+            accepted.popleft()
+        if faults.max_concurrency and in_flight >= faults.max_concurrency:
+            return True
+        if faults.rate_limit and len(accepted) + cost > faults.rate_limit:
+            return True
+        accepted.extend([now] * cost)
+        return False
+
+    @fake_app.post("/")
+    async def rpc(request: Request) -> Any:
+        nonlocal in_flight
+        payload = await request.json()
+        faults: FakeFaults = fake_app.state.faults
+        if throttled(faults, len(payload) if isinstance(payload, list) else 1):
+            with ledger._lock:
+                ledger.calls["_rate_limited"] += 1
+            return Response(status_code=429, headers={"Retry-After": "1"})
+        in_flight += 1
+        try:
+            return await respond(faults, payload)
+        finally:
+            in_flight -= 1
+
+    async def respond(faults: FakeFaults, payload: Any) -> Any:
+        delay_ms = faults.latency_ms + random.uniform(0, faults.jitter_ms)
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        if faults.error_rate and random.random() < faults.error_rate:
+            with ledger._lock:
+                ledger.calls["_injected_errors"] += 1
+            return Response(status_code=faults.error_status, headers={"Retry-After": "1"})
+        if isinstance(payload, list):
+            return [ledger.handle(call) for call in payload]
+        return ledger.handle(payload)
+
+    @fake_app.websocket("/")
+    async def pubsub(websocket: WebSocket) -> None:
+        await websocket.accept()
+        outbox: asyncio.Queue[dict] = asyncio.Queue()
+        subscription_ids = itertools.count(1)
+        subscriptions: dict[int, tuple[str, Callable]] = {}
+
+        def notifier(subscription_id: int) -> Callable[[FakeTransfer], None]:
+            def notify(transfer: FakeTransfer) -> None:
+                subscriptions.pop(subscription_id, None)
+                outbox.put_nowait(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "signatureNotification",
+                        "params": {
+                            "result": {
+                                "context": {"slot": transfer.slot},
+                                "value": {"err": transfer.err},
+                            },
+                            "subscription": subscription_id,
+                        },
+                    }
+                )
+
+            return notify
+
+        async def send() -> None:
+            while True:
+                await websocket.send_json(await outbox.get())
+
+        sender = asyncio.create_task(send())
+        try:
+            while True:
+                call = await websocket.receive_json()
+                method = call.get("method")
+                params = call.get("params") or []
+                with ledger._lock:
+                    ledger.calls[method] += 1
+                if method == "signatureSubscribe":
+                    subscription_id = next(subscription_ids)
+                    options = params[1] if len(params) > 1 else {}
+                    callback = notifier(subscription_id)
+                    subscriptions[subscription_id] = (params[0], callback)
+                    outbox.put_nowait(
+                        {"jsonrpc": "2.0", "result": subscription_id, "id": call.get("id")}
+                    )
+                    ledger.watch(params[0], options.get("commitment", "finalized"), callback)
+                elif method == "signatureUnsubscribe":
+                    subscription = subscriptions.pop(params[0], None)
+                    if subscription is not None:
+                        ledger.unwatch(*subscription)
+                    outbox.put_nowait(
+                        {"jsonrpc": "2.0", "result": subscription is not None, "id": call.get("id")}
+                    )
+                else:
+                    outbox.put_nowait(
+                        {
+                            "jsonrpc": "2.0",
+                            "error": {"code": -32601, "message": "Method not found"},
+                            "id": call.get("id"),
+                        }
+                    )
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            for signature, callback in subscriptions.values():
+                ledger.unwatch(signature, callback)
+
+    @fake_app.post("/_fake/transfers", status_code=201)
+    async def add_transfer(body: FakeTransferCreate) -> dict[str, str]:
+        ledger.add_transfer(FakeTransfer(**body.model_dump()))
+        return {"signature": body.signature}
+
+    @fake_app.put("/_fake/faults")
+    async def set_faults(body: FakeFaults) -> FakeFaults:
+        fake_app.state.faults = body
+        return body
+
+    @fake_app.get("/_fake/calls")
+    async def calls() -> dict[str, int]:
+        return dict(ledger.calls)
+
+    @fake_app.post("/_fake/reset", status_code=204)
+    async def reset() -> None:
+        ledger.reset()
+
+    return fake_app
+
+
+ledger = FakeLedger()
+app = create_app(
+    ledger,
+    faults=FakeFaults(
+        latency_ms=float(os.environ.get("FAKE_RPC_LATENCY_MS", "0")),
+        jitter_ms=float(os.environ.get("FAKE_RPC_JITTER_MS", "0")),
+        error_rate=float(os.environ.get("FAKE_RPC_ERROR_RATE", "0")),
+        error_status=int(os.environ.get("FAKE_RPC_ERROR_STATUS", "429")),
+        rate_limit=float(os.environ.get("FAKE_RPC_RATE_LIMIT", "0")),
+        max_concurrency=int(os.environ.get("FAKE_RPC_MAX_CONCURRENCY", "0")),
+    ),
+)
@@ -1,12 +1,57 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse
 
 from app.api.router import api_router
 from app.config import get_settings
+from app.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from app.query_metrics import QueryStatsMiddleware
+from app.services.confirmation_queue import get_confirmation_queue
+from app.services.reconciler import TransactionReconciler
+from app.services.signature_subscriber import get_signature_subscriber
+from app.services.solana import close_rpc_client, get_rpc_client
+from app.services.wallet_indexer import WalletIndexer
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open shared clients and start background workers; undo both on shutdown."""
+    get_rpc_client()
+    confirmation_queue = get_confirmation_queue()
+    confirmation_queue.start()
+    reconciler_task = None
+    if settings.reconciler_enabled:
+        reconciler_task = asyncio.create_task(TransactionReconciler().run_forever())
+    subscriber_task = None
+    if settings.signature_subscriber_enabled:
+        subscriber_task = asyncio.create_task(get_signature_subscriber().run_forever())
+    indexer_task = None
+    if settings.wallet_indexer_enabled:
+        indexer_task = asyncio.create_task(WalletIndexer().run_forever())
+    yield
+    if indexer_task is not None:
+        indexer_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await indexer_task
+    if subscriber_task is not None:
+        subscriber_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await subscriber_task
+    if reconciler_task is not None:
+        reconciler_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await reconciler_task
+    await confirmation_queue.stop()
+    await close_rpc_client()
+
+
 app = FastAPI(
     title="Agora API",
     description="FastAPI backend for Agora application",
@@ -14,6 +59,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -23,8 +69,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Location", "Preference-Applied", "Retry-After"]
+    + (["X-DB-Query-Count", "X-DB-Time-Ms"] if settings.debug else []),
 )
 
+# Count SQL statements per request (N+1 warnings, per-route histograms)
+app.add_middleware(QueryStatsMiddleware)
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError) -> JSONResponse:
+    """Reject malformed or tampered pagination cursors with 400."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 # Include API router
 app.include_router(api_router, prefix="/api")
 
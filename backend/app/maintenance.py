@@ -0,0 +1,139 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.maintenance check-investment-totals [--fix]
+    python -m app.maintenance check-project-funding [--fix]
+    python -m app.maintenance reconcile-transactions
+    python -m app.maintenance index-wallets
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.database import SessionLocal
+from app.services.investment import InvestmentService
+from app.services.project import ProjectService
+from app.services.reconciler import TransactionReconciler
+from app.services.solana import close_rpc_client
+from app.services.wallet_indexer import WalletIndexer
+
+
+async def check_investment_totals(fix: bool) -> int:
+    """
+    Compare denormalized investment confirmed totals against their transactions.
+
+    Returns the number of mismatched investments; with fix=True they are recomputed.
+    """
+    async with SessionLocal() as db:
+        mismatches = await InvestmentService.get_confirmed_total_mismatches(db)
+        for mismatch in mismatches:
+            print(
+                f"investment {mismatch['investment_id']}: "
+                f"stored {mismatch['stored_total']} ({mismatch['stored_count']} tx), "
+                f"actual {mismatch['actual_total']} ({mismatch['actual_count']} tx)"
+            )
+        if mismatches and fix:
+            await InvestmentService.recompute_confirmed_totals(
+                db, [mismatch["investment_id"] for mismatch in mismatches]
+            )
+            print(f"Recomputed {len(mismatches)} investment(s)")
+        elif not mismatches:
+            print("All investment confirmed totals match their transactions")
+    return len(mismatches)
+
+
+async def check_project_funding(fix: bool) -> int:
+    """
+    Compare project funding rollups against their transactions.
+
+    Returns the number of mismatched projects; with fix=True they are recomputed.
+    """
+    async with SessionLocal() as db:
+        mismatches = await ProjectService.get_funding_mismatches(db)
+        for mismatch in mismatches:
+            print(
+                f"project {mismatch['project_id']}: "
+                f"stored {mismatch['stored']}, actual {mismatch['actual']}"
+            )
+        if mismatches and fix:
+            await ProjectService.recompute_funding(
+                db, [mismatch["project_id"] for mismatch in mismatches]
+            )
+            print(f"Recomputed {len(mismatches)} project(s)")
+        elif not mismatches:
+            print("All project funding rollups match their transactions")
+    return len(mismatches)
+
+
+async def reconcile_transactions() -> int:
+    """Run one reconciliation pass over pending/recently failed transactions."""
+    try:
+        stats = await TransactionReconciler().run_once()
+    finally:
+        await close_rpc_client()
+    print(
+        f"Checked {stats.checked} of {stats.scanned} transactions: {stats.confirmed} "
+        f"confirmed, {stats.failed} failed, {stats.promoted} finalized, "
+        f"{stats.rolled_back} rolled back, {stats.deferred} deferred"
+    )
+    return 0
+
+
+async def index_wallets() -> int:
+    """Run one indexing pass over the project PDA wallets."""
+    try:
+        stats = await WalletIndexer().run_once()
+    finally:
+        await close_rpc_client()
+    print(
+        f"Indexed {stats.signatures} signatures of {stats.wallets} wallets: "
+        f"{stats.deposits} deposits, {stats.matched} matched ({stats.confirmed} confirmed, "
+        f"{stats.failed} failed), {stats.unmatched} unmatched"
+    )
+    if stats.behind:
+        print(f"{stats.behind} wallet(s) have more to index; run again")
+    return 1 if stats.errors else 0
+
+
+CHECKS = {
+    "check-investment-totals": (
+        check_investment_totals,
+        "Verify investments.confirmed_total against confirmed transactions",
+    ),
+    "check-project-funding": (
+        check_project_funding,
+        "Verify project funding rollups against transactions",
+    ),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in CHECKS.items():
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--fix", action="store_true", help="Recompute mismatches")
+    commands.add_parser(
+        "reconcile-transactions",
+        help="Settle pending/recently failed Solana transactions once",
+    )
+    commands.add_parser(
+        "index-wallets",
+        help="Index new deposits to project PDA wallets once",
+    )
+    args = parser.parse_args()
+
+    if args.command == "reconcile-transactions":
+        sys.exit(asyncio.run(reconcile_transactions()))
+    if args.command == "index-wallets":
+        sys.exit(asyncio.run(index_wallets()))
+
+    check, _ = CHECKS[args.command]
+    mismatched = asyncio.run(check(args.fix))
+    sys.exit(1 if mismatched and not args.fix else 0)
+
+
+if __name__ == "__main__":
+    main()
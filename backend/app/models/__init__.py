@@ -1,10 +1,13 @@
 from app.models.base import Base, TimestampMixin
+from app.models.deposit import SolanaDeposit
+from app.models.finalized_transaction import FinalizedSolanaTransaction
 from app.models.investment import Investment
 from app.models.project import Project
 from app.models.transaction import Transaction, TransactionStatus
 from app.models.parcel import Parcel
 from app.models.parking_lot import ParkingLot
 from app.models.user import User
+from app.models.wallet_cursor import SolanaWalletCursor
 
 __all__ = [
     "Base",
@@ -16,4 +19,7 @@ __all__ = [
     "TransactionStatus",
     "ParkingLot",
     "Parcel",
+    "FinalizedSolanaTransaction",
+    "SolanaDeposit",
+    "SolanaWalletCursor",
 ]
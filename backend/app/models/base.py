@@ -7,7 +7,9 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
 
-    pass
+    # Fetch server-generated columns (ids, created_at/updated_at) with INSERT/UPDATE
+    # ... RETURNING so written objects never need a refresh SELECT.
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class TimestampMixin:
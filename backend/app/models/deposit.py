@@ -0,0 +1,39 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class SolanaDeposit(Base, TimestampMixin):
+    """An inbound SOL transfer to a project PDA wallet, found by the wallet indexer."""
+
+    __tablename__ = "solana_deposits"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    signature: Mapped[str] = mapped_column(String(128), nullable=False)
+    wallet: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    project_id: Mapped[int | None] = mapped_column(
+        ForeignKey("projects.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    sender: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    amount_lamports: Mapped[Decimal] = mapped_column(Numeric(30, 0), nullable=False)
+    slot: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    block_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Transaction the deposit settled; NULL for deposits nobody has claimed (yet)
+    transaction_id: Mapped[UUID | None] = mapped_column(
+        ForeignKey("transactions.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    matched_by: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("signature", "wallet", name="uq_solana_deposits_signature_wallet"),
+    )
@@ -0,0 +1,17 @@
+from decimal import Decimal
+
+from sqlalchemy import Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class FinalizedSolanaTransaction(Base, TimestampMixin):
+    """Verification-relevant data of a finalized Solana transaction (immutable on chain)."""
+
+    __tablename__ = "solana_finalized_transactions"
+
+    signature: Mapped[str] = mapped_column(String(128), primary_key=True)
+    amount_lamports: Mapped[Decimal] = mapped_column(Numeric(30, 0), nullable=False)
+    recipient: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
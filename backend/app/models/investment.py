@@ -1,8 +1,9 @@
+from decimal import Decimal
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
 from app.models.user import User
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -32,6 +33,20 @@ class Investment(Base, TimestampMixin):
         index=True,
     )
 
+    # Denormalized sum/count of CONFIRMED transactions, maintained on status changes
+    confirmed_total: Mapped[Decimal] = mapped_column(
+        Numeric(19, 2),
+        default=Decimal(0),
+        server_default="0",
+        nullable=False,
+    )
+    confirmed_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="investments")
     transactions: Mapped[list["Transaction"]] = relationship(
@@ -41,4 +56,6 @@ class Investment(Base, TimestampMixin):
     # Unique constraint: one investment per user-project pair
     __table_args__ = (
         UniqueConstraint("user_id", "project_id", name="uq_user_project"),
+        # Keyset pagination of a user's investments by (created_at, id)
+        Index("ix_investments_user_id_created_at_id", "user_id", "created_at", "id"),
     )
@@ -1,6 +1,8 @@
+from datetime import datetime
+from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Float, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.parking_lot import ParkingLot
@@ -25,6 +27,30 @@ class Project(Base, TimestampMixin):
         index=True,
     )
 
+    # Funding rollup, maintained incrementally as investment transactions change status
+    funded_total: Mapped[Decimal] = mapped_column(
+        Numeric(19, 2),
+        default=Decimal(0),
+        server_default="0",
+        nullable=False,
+    )
+    pending_total: Mapped[Decimal] = mapped_column(
+        Numeric(19, 2),
+        default=Decimal(0),
+        server_default="0",
+        nullable=False,
+    )
+    investor_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    last_inflow_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
     # Foreign key to link projects with parking lots
     parking_lot_id: Mapped[Optional[int]] = mapped_column(
         Integer, ForeignKey("parking_lots.id"), nullable=True, index=True
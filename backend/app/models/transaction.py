@@ -1,24 +1,34 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum as PyEnum
-from typing import TYPE_CHECKING
+from typing import Sequence
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
+    Boolean,
     CheckConstraint,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
+    bindparam,
+    case,
+    event,
+    func,
+    inspect,
+    select,
+    text,
+    update,
 )
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
-
-if TYPE_CHECKING:
-    from app.models.investment import Investment
+from app.models.investment import Investment
+from app.models.project import Project
 
 
 class TransactionStatus(PyEnum):
@@ -78,6 +88,12 @@ class Transaction(Base, TimestampMixin):
         DateTime(timezone=True),
         nullable=True,
     )
+    # Commitment a confirmation was verified at: "confirmed" is provisional until the
+    # reconciler sees the transaction finalized (promote) or dropped (roll back)
+    solana_commitment: Mapped[str | None] = mapped_column(
+        String(20),
+        nullable=True,
+    )
     verification_attempts: Mapped[int] = mapped_column(
         Integer,
         default=0,
@@ -99,4 +115,257 @@ class Transaction(Base, TimestampMixin):
             "solana_amount IS NULL OR solana_amount > 0",
             name="check_positive_solana_amount",
         ),
+        # Keyset pagination by (created_at, id) within an investment / a status
+        Index(
+            "ix_transactions_investment_id_created_at_id",
+            "investment_id",
+            "created_at",
+            "id",
+        ),
+        Index("ix_transactions_status_created_at_id", "status", "created_at", "id"),
+        # Provisional confirmations awaiting finalization (few at any time)
+        Index(
+            "ix_transactions_provisional",
+            "updated_at",
+            postgresql_where=text("solana_commitment = 'confirmed'"),
+        ),
+    )
+
+
+def apply_status_change(
+    connection: Connection,
+    investment_id: UUID,
+    amount: Decimal,
+    old_status: TransactionStatus | None,
+    new_status: TransactionStatus | None,
+) -> None:
+    """
+    Shift the investment and project funding rollups for one transaction status change.
+
+    old_status=None means the transaction was just inserted, new_status=None that it was
+    deleted. ORM writes apply this automatically (see listeners below); code that changes
+    transaction status with bulk UPDATE statements must call it for every affected row in
+    the same DB transaction, e.g. from an AsyncSession:
+        await db.run_sync(lambda s: apply_status_change(s.connection(), ...))
+    """
+    if old_status == new_status:
+        return
+
+    confirmed_sign = int(new_status == TransactionStatus.CONFIRMED) - int(
+        old_status == TransactionStatus.CONFIRMED
+    )
+    pending_sign = int(new_status == TransactionStatus.PENDING) - int(
+        old_status == TransactionStatus.PENDING
+    )
+    if not confirmed_sign and not pending_sign:
+        return
+
+    investor_delta = 0
+    if confirmed_sign:
+        row = connection.execute(
+            update(Investment)
+            .where(Investment.id == investment_id)
+            .values(
+                confirmed_total=Investment.confirmed_total + confirmed_sign * amount,
+                confirmed_count=Investment.confirmed_count + confirmed_sign,
+            )
+            .returning(Investment.project_id, Investment.confirmed_count)
+        ).first()
+        if row is None:
+            return
+        project_id, confirmed_count = row
+        # An investor counts towards the project once their first transaction confirms
+        if confirmed_sign > 0 and confirmed_count == 1:
+            investor_delta = 1
+        elif confirmed_sign < 0 and confirmed_count == 0:
+            investor_delta = -1
+    else:
+        project_id = connection.scalar(
+            select(Investment.project_id).where(Investment.id == investment_id)
+        )
+
+    try:
+        project_pk = int(project_id)
+    except (ValueError, TypeError):
+        return
+
+    # Keep updated_at as is: funding movements are not edits to the project itself
+    values = {"updated_at": Project.updated_at}
+    if confirmed_sign:
+        values["funded_total"] = Project.funded_total + confirmed_sign * amount
+        values["investor_count"] = Project.investor_count + investor_delta
+    if confirmed_sign > 0:
+        values["last_inflow_at"] = func.now()
+    if pending_sign:
+        values["pending_total"] = Project.pending_total + pending_sign * amount
+    connection.execute(update(Project).where(Project.id == project_pk).values(**values))
+
+
+def apply_status_changes(
+    connection: Connection,
+    changes: Sequence[
+        tuple[UUID, Decimal, TransactionStatus | None, TransactionStatus | None]
+    ],
+) -> None:
+    """
+    Apply many (investment_id, amount, old_status, new_status) changes to the rollups,
+    equivalent to calling apply_status_change for each one but with a fixed number of
+    statements: one locking read of the investments, then one executemany UPDATE each for
+    investments and projects. For bulk UPDATEs that change many transactions at once.
+    """
+    # investment_id -> [confirmed amount delta, confirmed count delta, pending amount delta]
+    deltas: dict[UUID, list] = {}
+    for investment_id, amount, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        confirmed_sign = int(new_status == TransactionStatus.CONFIRMED) - int(
+            old_status == TransactionStatus.CONFIRMED
+        )
+        pending_sign = int(new_status == TransactionStatus.PENDING) - int(
+            old_status == TransactionStatus.PENDING
+        )
+        if not confirmed_sign and not pending_sign:
+            continue
+        delta = deltas.setdefault(investment_id, [Decimal(0), 0, Decimal(0)])
+        delta[0] += confirmed_sign * amount
+        delta[1] += confirmed_sign
+        delta[2] += pending_sign * amount
+    if not deltas:
+        return
+
+    investments = connection.execute(
+        select(Investment.id, Investment.project_id, Investment.confirmed_count)
+        .where(Investment.id.in_(deltas))
+        .order_by(Investment.id)
+        .with_for_update()
+    ).all()
+
+    investment_params = []
+    project_params: dict[int, dict] = {}
+    for investment_id, project_id, confirmed_count in investments:
+        confirmed_total, confirmed_delta, pending_total = deltas[investment_id]
+        if confirmed_delta:
+            investment_params.append(
+                {"b_id": investment_id, "b_total": confirmed_total, "b_count": confirmed_delta}
+            )
+        try:
+            project_pk = int(project_id)
+        except (ValueError, TypeError):
+            continue
+        params = project_params.setdefault(
+            project_pk,
+            {
+                "b_id": project_pk,
+                "b_funded": Decimal(0),
+                "b_pending": Decimal(0),
+                "b_investors": 0,
+                "b_inflow": False,
+            },
+        )
+        params["b_funded"] += confirmed_total
+        params["b_pending"] += pending_total
+        # An investor counts towards the project while any of their transactions is confirmed
+        params["b_investors"] += int(confirmed_count + confirmed_delta > 0) - int(
+            confirmed_count > 0
+        )
+        params["b_inflow"] = params["b_inflow"] or confirmed_delta > 0
+
+    if investment_params:
+        connection.execute(
+            update(Investment)
+            .where(Investment.id == bindparam("b_id"))
+            .values(
+                confirmed_total=Investment.confirmed_total + bindparam("b_total"),
+                confirmed_count=Investment.confirmed_count + bindparam("b_count"),
+            ),
+            investment_params,
+        )
+    if project_params:
+        # Keep updated_at as is: funding movements are not edits to the project itself
+        connection.execute(
+            update(Project)
+            .where(Project.id == bindparam("b_id"))
+            .values(
+                updated_at=Project.updated_at,
+                funded_total=Project.funded_total + bindparam("b_funded"),
+                pending_total=Project.pending_total + bindparam("b_pending"),
+                investor_count=Project.investor_count + bindparam("b_investors"),
+                last_inflow_at=case(
+                    (bindparam("b_inflow", type_=Boolean), func.now()),
+                    else_=Project.last_inflow_at,
+                ),
+            ),
+            list(project_params.values()),
+        )
+
+
+def apply_project_move(
+    connection: Connection, investment_id: UUID, old_project_id: str, new_project_id: str
+) -> None:
+    """
+    Move an investment's share of the project funding rollups from `old_project_id` to
+    `new_project_id`: its confirmed total and investor, and its pending transactions.
+    Call it in the DB transaction that changes Investment.project_id, after the change is
+    flushed (the flushed row stays locked, so status changes cannot slip in between).
+    """
+    if old_project_id == new_project_id:
+        return
+    confirmed_total, confirmed_count = connection.execute(
+        select(Investment.confirmed_total, Investment.confirmed_count).where(
+            Investment.id == investment_id
+        )
+    ).one()
+    pending_total = connection.scalar(
+        select(func.coalesce(func.sum(Transaction.amount), 0)).where(
+            Transaction.investment_id == investment_id,
+            Transaction.status == TransactionStatus.PENDING,
+        )
+    )
+    if not confirmed_total and not confirmed_count and not pending_total:
+        return
+
+    for project_id, sign in ((old_project_id, -1), (new_project_id, 1)):
+        try:
+            project_pk = int(project_id)
+        except (ValueError, TypeError):
+            continue
+        # Keep updated_at as is: funding movements are not edits to the project itself
+        connection.execute(
+            update(Project)
+            .where(Project.id == project_pk)
+            .values(
+                updated_at=Project.updated_at,
+                funded_total=Project.funded_total + sign * confirmed_total,
+                pending_total=Project.pending_total + sign * pending_total,
+                investor_count=Project.investor_count + sign * int(confirmed_count > 0),
+            )
+        )
+
+
+def _previous_status(target: Transaction) -> TransactionStatus | None:
+    history = inspect(target).attrs.status.history
+    return history.deleted[0] if history.deleted else None
+
+
+@event.listens_for(Transaction, "after_insert")
+def _rollup_insert(mapper, connection, target: Transaction) -> None:
+    apply_status_change(connection, target.investment_id, target.amount, None, target.status)
+
+
+@event.listens_for(Transaction, "after_update")
+def _rollup_status_change(mapper, connection, target: Transaction) -> None:
+    if not inspect(target).attrs.status.history.has_changes():
+        return
+    apply_status_change(
+        connection,
+        target.investment_id,
+        target.amount,
+        _previous_status(target),
+        target.status,
     )
+
+
+@event.listens_for(Transaction, "after_delete")
+def _rollup_delete(mapper, connection, target: Transaction) -> None:
+    status = _previous_status(target) or target.status
+    apply_status_change(connection, target.investment_id, target.amount, status, None)
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class SolanaWalletCursor(Base, TimestampMixin):
+    """How far the wallet indexer has read a wallet's signature history."""
+
+    __tablename__ = "solana_wallet_cursors"
+
+    wallet: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # Newest signature indexed; getSignaturesForAddress resumes after it (`until`)
+    last_signature: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    last_slot: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # While catching up on a backlog (newest first, a capped batch per pass): the oldest
+    # signature indexed so far, where the next pass resumes (`before`), and the newest,
+    # which becomes last_signature once the gap down to it is closed
+    before_signature: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    head_signature: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    head_slot: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
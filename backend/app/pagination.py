@@ -0,0 +1,95 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are addressed by the sort key of the last row served instead of an OFFSET, so
+every page is an index seek regardless of depth and concurrent inserts cannot shift rows
+between pages. The cursor is opaque to clients; list endpoints return it in the
+X-Next-Cursor response header while the JSON body stays a plain list.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence, TypeVar
+from uuid import UUID
+
+from fastapi import Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+CURSOR_DESCRIPTION = "Opaque cursor from the X-Next-Cursor header of the previous page"
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded for the endpoint's sort keys."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort key values as an opaque, URL-safe cursor."""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else
+        str(value) if isinstance(value, UUID) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _coerce(value: Any, key: InstrumentedAttribute) -> Any:
+    python_type = key.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> list[Any]:
+    """Decode a cursor back into typed values for `keys`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match sort keys")
+        return [_coerce(value, key) for value, key in zip(values, keys)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def paginate(
+    query: Select,
+    keys: Sequence[InstrumentedAttribute],
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+) -> Select:
+    """
+    Order `query` by the sort keys (which must end in a unique column), seek past
+    `cursor`, and fetch one extra row so split_page() can tell whether a next page exists.
+    """
+    if cursor:
+        after = decode_cursor(cursor, keys)
+        if len(keys) == 1:
+            row, bound = keys[0], after[0]
+        else:
+            row, bound = tuple_(*keys), tuple(after)
+        query = query.where(row < bound if descending else row > bound)
+    order = [key.desc() for key in keys] if descending else list(keys)
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(
+    items: Sequence[T], keys: Sequence[InstrumentedAttribute], limit: int
+) -> tuple[list[T], str | None]:
+    """Trim the extra row fetched by paginate() and build the next cursor, if any."""
+    if len(items) <= limit:
+        return list(items), None
+    page = list(items[:limit])
+    return page, encode_cursor([getattr(page[-1], key.key) for key in keys])
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    """Expose the next page's cursor on the response (absent on the last page)."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
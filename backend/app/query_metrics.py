@@ -0,0 +1,174 @@
+"""Per-request SQL statement counting, per-route histograms and N+1 detection."""
+
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the per-route histogram buckets (statements per request)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class QueryStats:
+    """Statements executed while this object is the active collector."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes that ran more than `threshold` times."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n > threshold]
+
+
+_current_stats: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+# Collectors opened with count_queries(); they see statements from every thread/task
+_global_collectors: list[QueryStats] = []
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start_times"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for collector in _global_collectors:
+        collector.record(statement, elapsed)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach statement counting listeners to a (sync) engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """
+    Collect every statement executed while the block is open, from any request.
+
+    Usable as a test fixture to bound queries per endpoint:
+        with count_queries() as stats:
+            client.get("/api/investments/")
+        assert stats.count <= 3
+    """
+    stats = QueryStats()
+    _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_collectors.remove(stats)
+
+
+class RouteQueryHistograms:
+    """Histogram of statement count and DB time per route."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[str, dict[str, Any]] = {}
+
+    def observe(self, route: str, stats: QueryStats) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(
+                route,
+                {
+                    "requests": 0,
+                    "queries_total": 0,
+                    "queries_max": 0,
+                    "db_seconds_total": 0.0,
+                    "buckets": [0] * (len(QUERY_COUNT_BUCKETS) + 1),
+                },
+            )
+            entry["requests"] += 1
+            entry["queries_total"] += stats.count
+            entry["queries_max"] = max(entry["queries_max"], stats.count)
+            entry["db_seconds_total"] += stats.total_seconds
+            entry["buckets"][bisect_left(QUERY_COUNT_BUCKETS, stats.count)] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"le_{bound}" for bound in QUERY_COUNT_BUCKETS] + ["inf"]
+        with self._lock:
+            return {
+                route: {
+                    "requests": entry["requests"],
+                    "queries_avg": entry["queries_total"] / entry["requests"],
+                    "queries_max": entry["queries_max"],
+                    "db_ms_avg": entry["db_seconds_total"] / entry["requests"] * 1000,
+                    "query_count_histogram": dict(zip(labels, entry["buckets"])),
+                }
+                for route, entry in self._routes.items()
+            }
+
+
+route_histograms = RouteQueryHistograms()
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that counts SQL statements and DB time per request.
+
+    Records per-route histograms, logs a warning when one statement shape repeats more
+    than SQL_REPEAT_WARNING_THRESHOLD times (a likely N+1), and in debug mode adds
+    X-DB-Query-Count / X-DB-Time-Ms response headers.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        settings = get_settings()
+        self.debug_headers = settings.debug
+        self.repeat_threshold = settings.sql_repeat_warning_threshold
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message: dict) -> None:
+            if message["type"] == "http.response.start" and self.debug_headers:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append(
+                    (b"x-db-time-ms", f"{stats.total_seconds * 1000:.2f}".encode())
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            # Label by endpoint name: bounded cardinality, unlike raw request paths
+            route_name = getattr(scope.get("route"), "name", None) or "unmatched"
+            route_histograms.observe(f"{scope.get('method', '')} {route_name}", stats)
+            for statement, times in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    f"Possible N+1 in {route_name}: statement ran {times} times "
+                    f"in one request: {statement}"
+                )
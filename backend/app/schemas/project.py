@@ -1,6 +1,7 @@
 from datetime import datetime
+from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 
 
 class ProjectBase(BaseModel):
@@ -52,10 +53,31 @@ class ProjectInDB(ProjectBase):
 
 
 class Project(ProjectBase):
-    """Schema for project in API responses."""
+    """Schema for project in API responses, including its funding rollup."""
 
     id: int
+    funded_total: Decimal = Field(
+        ...,
+        description="Sum of confirmed investment transactions",
+    )
+    pending_total: Decimal = Field(
+        ...,
+        description="Sum of investment transactions awaiting confirmation",
+    )
+    investor_count: int = Field(
+        ...,
+        description="Investors with at least one confirmed transaction",
+    )
+    last_inflow_at: datetime | None = None
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+    @computed_field
+    @property
+    def funding_progress(self) -> float | None:
+        """Fraction of investment_goal raised so far (None without a goal)."""
+        if not self.investment_goal:
+            return None
+        return float(self.funded_total) / self.investment_goal
@@ -14,6 +14,12 @@ class TransactionStatus(str, Enum):
     FAILED = "failed"
 
 
+COMMITMENT_DESCRIPTION = (
+    "Commitment a confirmation was verified at: `confirmed` is provisional (can still be "
+    "rolled back to failed), `finalized` is final"
+)
+
+
 class TransactionBase(BaseModel):
     """Base transaction schema with shared properties."""
 
@@ -26,7 +32,15 @@ class TransactionBase(BaseModel):
 class TransactionCreate(TransactionBase):
     """Schema for creating a new transaction."""
 
-    pass
+    solana_amount: Decimal | None = Field(
+        None,
+        gt=0,
+        description="Amount in SOL the user will send; with wallet_address, lets the wallet "
+        "indexer match the deposit to this transaction without a confirm call",
+    )
+    wallet_address: str | None = Field(
+        None, description="User's Solana wallet address the deposit will come from"
+    )
 
 
 class TransactionConfirm(BaseModel):
@@ -39,6 +53,24 @@ class TransactionConfirm(BaseModel):
     )
 
 
+# Max entries accepted by one batch confirm call
+MAX_BATCH_CONFIRM = 100
+
+
+class TransactionConfirmItem(TransactionConfirm):
+    """Schema for one transaction of a batch confirm."""
+
+    transaction_id: str = Field(..., description="Transaction ID with prefix")
+
+
+class TransactionBatchConfirm(BaseModel):
+    """Schema for confirming many transactions in one call."""
+
+    transactions: list[TransactionConfirmItem] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_CONFIRM
+    )
+
+
 class TransactionInDB(TransactionBase):
     """Schema for transaction as stored in database."""
 
@@ -48,6 +80,7 @@ class TransactionInDB(TransactionBase):
     user_wallet: str | None
     pda_address: str | None
     solana_amount: Decimal | None
+    solana_commitment: str | None
     transaction_verified_at: datetime | None
     verification_attempts: int
     failure_reason: str | None
@@ -66,6 +99,7 @@ class Transaction(TransactionBase):
     user_wallet: str | None = Field(None, description="User's Solana wallet address")
     pda_address: str | None = Field(None, description="Project's PDA wallet address")
     solana_amount: Decimal | None
+    solana_commitment: str | None = Field(None, description=COMMITMENT_DESCRIPTION)
     transaction_verified_at: datetime | None
     verification_attempts: int
     failure_reason: str | None
@@ -78,8 +112,55 @@ class Transaction(TransactionBase):
     @classmethod
     def add_prefix_to_id(cls, data: dict) -> dict:
         """Add prefix to UUID id when creating from ORM object."""
-        if isinstance(data, dict) and "id" in data:
+        if not isinstance(data, dict):
+            data = {
+                name: getattr(data, name)
+                for name in cls.model_fields
+                if hasattr(data, name)
+            }
+        if "id" in data:
             id_value = data["id"]
             if isinstance(id_value, UUID):
                 data["id"] = f"transaction_{id_value}"
         return data
+
+
+class TransactionStatusUpdate(BaseModel):
+    """Schema for the status of a transaction, as polled or streamed while it settles."""
+
+    id: str = Field(..., description="Transaction ID with prefix")
+    status: TransactionStatus
+    solana_commitment: str | None = Field(None, description=COMMITMENT_DESCRIPTION)
+    failure_reason: str | None
+    verification_attempts: int
+    transaction_verified_at: datetime | None
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+    @model_validator(mode="before")
+    @classmethod
+    def add_prefix_to_id(cls, data: dict) -> dict:
+        """Add prefix to UUID id when creating from ORM object or row."""
+        if not isinstance(data, dict):
+            data = {
+                name: getattr(data, name)
+                for name in cls.model_fields
+                if hasattr(data, name)
+            }
+        if "id" in data:
+            id_value = data["id"]
+            if isinstance(id_value, UUID):
+                data["id"] = f"transaction_{id_value}"
+        return data
+
+
+class TransactionConfirmResult(BaseModel):
+    """Schema for the outcome of one entry of a batch confirm."""
+
+    transaction_id: str = Field(..., description="Transaction ID as sent")
+    status_code: int = Field(
+        ..., description="HTTP status the single confirm endpoint would have returned"
+    )
+    detail: str | None = Field(None, description="Error detail when status_code is not 200")
+    transaction: Transaction | None = None
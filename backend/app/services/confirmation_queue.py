@@ -0,0 +1,103 @@
+"""
+Background verification of transactions confirmed asynchronously.
+
+POST /transactions/{id}/confirm with `Prefer: respond-async` stores the signature and
+returns 202 at once; the transaction ID is queued here and a few workers verify it with
+TransactionService.verify_recorded_transaction, so request latency and open connections
+no longer depend on RPC latency. The queue is in-memory and best effort: anything not
+verified (queue full, process restart, signature not finalized yet) stays pending with
+its signature and is settled by the reconciler.
+"""
+
+import asyncio
+import logging
+from functools import lru_cache
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.services.transaction import TransactionService
+
+logger = logging.getLogger(__name__)
+
+
+class ConfirmationQueue:
+    """Bounded queue of transaction IDs awaiting verification, drained by worker tasks."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_size: int = 1000,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+    ) -> None:
+        self.workers = workers
+        self.max_size = max_size
+        self.session_factory = session_factory
+        self._queue: asyncio.Queue[UUID] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.processed = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued transactions are left to the reconciler."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def enqueue(self, transaction_id: UUID) -> bool:
+        """Queue a transaction for verification; False if not running or full."""
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(transaction_id)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            transaction_id = await queue.get()
+            try:
+                async with self.session_factory() as db:
+                    await TransactionService.verify_recorded_transaction(db, transaction_id)
+            except Exception:
+                logger.exception(f"Background verification of {transaction_id} failed")
+            finally:
+                self.processed += 1
+                queue.task_done()
+
+    def stats(self) -> dict[str, int]:
+        """Return queue depth and counters."""
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "dropped": self.dropped,
+        }
+
+
+@lru_cache
+def get_confirmation_queue() -> ConfirmationQueue:
+    """Return the process-wide confirmation queue (started by the app lifespan)."""
+    settings = get_settings()
+    return ConfirmationQueue(
+        workers=settings.confirmation_workers,
+        max_size=settings.confirmation_queue_size,
+    )
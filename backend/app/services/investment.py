@@ -2,11 +2,12 @@ from decimal import Decimal
 from typing import List
 from uuid import UUID
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import Subquery, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.investment import Investment
-from app.models.transaction import TransactionStatus
+from app.models.transaction import Transaction, TransactionStatus, apply_project_move
+from app.pagination import paginate, split_page
 from app.schemas.investment import InvestmentCreate, InvestmentUpdate
 
 
@@ -14,102 +15,180 @@ class InvestmentService:
     """Service for investment CRUD operations."""
 
     @staticmethod
-    def get_investment(db: Session, investment_id: UUID) -> Investment | None:
+    async def get_investment(db: AsyncSession, investment_id: UUID) -> Investment | None:
         """Get an investment by ID."""
-        return db.query(Investment).filter(Investment.id == investment_id).first()
+        return await db.get(Investment, investment_id)
 
     @staticmethod
-    def get_or_create_investment(
-        db: Session, user_id: int, project_id: str
+    async def get_or_create_investment(
+        db: AsyncSession, user_id: int, project_id: str
     ) -> Investment:
         """Get existing investment or create a new one for user-project pair."""
-        investment = (
-            db.query(Investment)
-            .filter(Investment.user_id == user_id, Investment.project_id == project_id)
-            .first()
+        investment = await db.scalar(
+            select(Investment)
+            .where(Investment.user_id == user_id, Investment.project_id == project_id)
+            .limit(1)
         )
 
         if not investment:
             investment = Investment(user_id=user_id, project_id=project_id)
             db.add(investment)
-            db.commit()
-            db.refresh(investment)
+            await db.commit()
 
         return investment
 
     @staticmethod
-    def calculate_total_amount(investment: Investment) -> Decimal:
-        """Calculate total amount from confirmed transactions."""
-        return sum(
-            transaction.amount
-            for transaction in investment.transactions
-            if transaction.status == TransactionStatus.CONFIRMED
-        )
-
-    @staticmethod
-    def get_investments_by_user_id(db: Session, user_id: int) -> List[Investment]:
+    async def get_investments_by_user_id(db: AsyncSession, user_id: int) -> List[Investment]:
         """Get all investments for a specific user."""
-        return db.query(Investment).filter(Investment.user_id == user_id).all()
+        result = await db.scalars(select(Investment).where(Investment.user_id == user_id))
+        return list(result.all())
 
     @staticmethod
-    def get_investments_by_project_id(db: Session, project_id: str) -> List[Investment]:
+    async def get_investments_by_project_id(
+        db: AsyncSession, project_id: str
+    ) -> List[Investment]:
         """Get all investments for a specific project."""
-        return db.query(Investment).filter(Investment.project_id == project_id).all()
+        result = await db.scalars(
+            select(Investment).where(Investment.project_id == project_id)
+        )
+        return list(result.all())
 
     @staticmethod
-    def get_investments(
-        db: Session,
+    async def get_investments(
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         user_id: int | None = None,
         project_id: str | None = None,
-    ) -> List[Investment]:
-        """Get a list of investments with optional filtering and pagination."""
-        query = db.query(Investment)
+        cursor: str | None = None,
+    ) -> tuple[List[Investment], str | None]:
+        """
+        Get a page of investments, oldest first, with optional filtering, and the cursor
+        for the next page.
+        """
+        keys = (Investment.created_at, Investment.id)
+        query = select(Investment)
 
         if user_id is not None:
-            query = query.filter(Investment.user_id == user_id)
+            query = query.where(Investment.user_id == user_id)
         if project_id is not None:
-            query = query.filter(Investment.project_id == project_id)
+            query = query.where(Investment.project_id == project_id)
 
-        return query.offset(skip).limit(limit).all()
+        result = await db.scalars(paginate(query.offset(skip), keys, cursor, limit))
+        return split_page(result.all(), keys, limit)
 
     @staticmethod
-    def create_investment(
-        db: Session, investment_create: InvestmentCreate
+    async def create_investment(
+        db: AsyncSession, investment_create: InvestmentCreate
     ) -> Investment:
         """Create a new investment."""
-        return InvestmentService.get_or_create_investment(
+        return await InvestmentService.get_or_create_investment(
             db, investment_create.user_id, investment_create.project_id
         )
 
     @staticmethod
-    def update_investment(
-        db: Session,
+    async def update_investment(
+        db: AsyncSession,
         investment_id: UUID,
         investment_update: InvestmentUpdate,
     ) -> Investment | None:
-        """Update an investment."""
-        db_investment = InvestmentService.get_investment(db, investment_id)
+        """
+        Update an investment. Moving it to another project moves its confirmed and
+        pending amounts (and its investor count) between the projects' funding rollups.
+        """
+        db_investment = await InvestmentService.get_investment(db, investment_id)
         if not db_investment:
             return None
 
         update_data = investment_update.model_dump(exclude_unset=True)
+        old_project_id = db_investment.project_id
 
         for field, value in update_data.items():
             setattr(db_investment, field, value)
 
-        db.commit()
-        db.refresh(db_investment)
+        if db_investment.project_id != old_project_id:
+            new_project_id = db_investment.project_id
+            await db.flush()
+            await db.run_sync(
+                lambda session: apply_project_move(
+                    session.connection(), investment_id, old_project_id, new_project_id
+                )
+            )
+        await db.commit()
         return db_investment
 
     @staticmethod
-    def delete_investment(db: Session, investment_id: UUID) -> bool:
+    async def delete_investment(db: AsyncSession, investment_id: UUID) -> bool:
         """Delete an investment."""
-        db_investment = InvestmentService.get_investment(db, investment_id)
+        db_investment = await InvestmentService.get_investment(db, investment_id)
         if not db_investment:
             return False
 
-        db.delete(db_investment)
-        db.commit()
+        await db.delete(db_investment)
+        await db.commit()
         return True
+
+    @staticmethod
+    def _confirmed_totals_subquery() -> Subquery:
+        """Confirmed total and count per investment, summed from transactions."""
+        return (
+            select(
+                Transaction.investment_id,
+                func.sum(Transaction.amount).label("total"),
+                func.count().label("count"),
+            )
+            .where(Transaction.status == TransactionStatus.CONFIRMED)
+            .group_by(Transaction.investment_id)
+            .subquery()
+        )
+
+    @staticmethod
+    async def get_confirmed_total_mismatches(db: AsyncSession) -> List[dict]:
+        """Find investments whose denormalized confirmed totals disagree with transactions."""
+        totals = InvestmentService._confirmed_totals_subquery()
+        actual_total = func.coalesce(totals.c.total, 0)
+        actual_count = func.coalesce(totals.c.count, 0)
+        result = await db.execute(
+            select(
+                Investment.id,
+                Investment.confirmed_total,
+                Investment.confirmed_count,
+                actual_total,
+                actual_count,
+            )
+            .outerjoin(totals, totals.c.investment_id == Investment.id)
+            .where(
+                (Investment.confirmed_total != actual_total)
+                | (Investment.confirmed_count != actual_count)
+            )
+        )
+        return [
+            {
+                "investment_id": investment_id,
+                "stored_total": stored_total,
+                "stored_count": stored_count,
+                "actual_total": Decimal(total),
+                "actual_count": count,
+            }
+            for investment_id, stored_total, stored_count, total, count in result.all()
+        ]
+
+    @staticmethod
+    async def recompute_confirmed_totals(
+        db: AsyncSession, investment_ids: List[UUID] | None = None
+    ) -> None:
+        """Rebuild denormalized confirmed totals from transactions (all, or the given ids)."""
+        confirmed = (Transaction.investment_id == Investment.id) & (
+            Transaction.status == TransactionStatus.CONFIRMED
+        )
+        total = (
+            select(func.coalesce(func.sum(Transaction.amount), 0))
+            .where(confirmed)
+            .scalar_subquery()
+        )
+        count = select(func.count()).where(confirmed).scalar_subquery()
+        statement = update(Investment).values(confirmed_total=total, confirmed_count=count)
+        if investment_ids is not None:
+            statement = statement.where(Investment.id.in_(investment_ids))
+        await db.execute(statement)
+        await db.commit()
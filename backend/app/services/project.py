@@ -0,0 +1,117 @@
+from decimal import Decimal
+from typing import List
+
+from sqlalchemy import ScalarSelect, String, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.investment import Investment
+from app.models.project import Project
+from app.models.transaction import Transaction, TransactionStatus
+from app.pagination import paginate, split_page
+
+
+class ProjectService:
+    """Service for project reads and funding rollup maintenance."""
+
+    @staticmethod
+    async def get_project(db: AsyncSession, project_id: int) -> Project | None:
+        """Get a project by ID."""
+        return await db.get(Project, project_id)
+
+    @staticmethod
+    async def get_projects(
+        db: AsyncSession, skip: int = 0, limit: int = 100, cursor: str | None = None
+    ) -> tuple[List[Project], str | None]:
+        """Get a page of projects (with funding rollups) and the cursor for the next page."""
+        keys = (Project.id,)
+        result = await db.scalars(
+            paginate(select(Project).offset(skip), keys, cursor, limit)
+        )
+        return split_page(result.all(), keys, limit)
+
+    @staticmethod
+    async def get_pda_wallets(db: AsyncSession) -> dict[str, int]:
+        """Map each configured project PDA wallet to its project (the oldest, if shared)."""
+        result = await db.execute(
+            select(Project.solana_pda_wallet, func.min(Project.id))
+            .where(Project.solana_pda_wallet.is_not(None))
+            .group_by(Project.solana_pda_wallet)
+        )
+        return {wallet: project_id for wallet, project_id in result}
+
+    @staticmethod
+    def _aggregate_transactions(column, status: TransactionStatus) -> ScalarSelect:
+        """Correlated aggregate over the current project's transactions in `status`."""
+        return (
+            select(column)
+            .join(Investment, Investment.id == Transaction.investment_id)
+            .where(
+                Investment.project_id == cast(Project.id, String),
+                Transaction.status == status,
+            )
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def _funding_subqueries() -> dict[str, ScalarSelect]:
+        """Funding rollup columns recomputed from transactions."""
+        aggregate = ProjectService._aggregate_transactions
+        amount_sum = func.coalesce(func.sum(Transaction.amount), 0)
+        return {
+            "funded_total": aggregate(amount_sum, TransactionStatus.CONFIRMED),
+            "pending_total": aggregate(amount_sum, TransactionStatus.PENDING),
+            "investor_count": aggregate(
+                func.count(func.distinct(Transaction.investment_id)),
+                TransactionStatus.CONFIRMED,
+            ),
+        }
+
+    @staticmethod
+    async def get_funding_mismatches(db: AsyncSession) -> List[dict]:
+        """Find projects whose funding rollup disagrees with their transactions."""
+        actual = ProjectService._funding_subqueries()
+        result = await db.execute(
+            select(
+                Project.id,
+                Project.funded_total,
+                Project.pending_total,
+                Project.investor_count,
+                actual["funded_total"],
+                actual["pending_total"],
+                actual["investor_count"],
+            ).where(
+                (Project.funded_total != actual["funded_total"])
+                | (Project.pending_total != actual["pending_total"])
+                | (Project.investor_count != actual["investor_count"])
+            )
+        )
+        return [
+            {
+                "project_id": row[0],
+                "stored": {"funded": row[1], "pending": row[2], "investors": row[3]},
+                "actual": {
+                    "funded": Decimal(row[4]),
+                    "pending": Decimal(row[5]),
+                    "investors": row[6],
+                },
+            }
+            for row in result.all()
+        ]
+
+    @staticmethod
+    async def recompute_funding(
+        db: AsyncSession, project_ids: List[int] | None = None
+    ) -> None:
+        """Rebuild funding rollups from transactions (all projects, or the given ids)."""
+        last_inflow_at = ProjectService._aggregate_transactions(
+            func.max(Transaction.transaction_verified_at), TransactionStatus.CONFIRMED
+        )
+        statement = update(Project).values(
+            **ProjectService._funding_subqueries(),
+            last_inflow_at=last_inflow_at,
+            updated_at=Project.updated_at,
+        )
+        if project_ids is not None:
+            statement = statement.where(Project.id.in_(project_ids))
+        await db.execute(statement)
+        await db.commit()
@@ -0,0 +1,287 @@
+"""
+Background reconciliation of Solana transactions whose status can still change.
+
+Each pass loads pending transactions (and recently failed ones) that have a signature,
+checks all their signatures with batched getSignatureStatuses calls (256 per call) and
+runs the full getTransaction verification only for signatures that have landed at the
+confirm commitment, with bounded concurrency. Signatures that have not landed yet are
+rechecked with exponential backoff on verification_attempts, so throughput scales with
+batch size rather than with clients retrying /confirm.
+
+The same passes finish provisional confirmations (accepted at "confirmed" commitment):
+once the signature is finalized the transaction is verified again at finalized and
+promoted, and if the cluster has forgotten the signature for RECONCILER_ROLLBACK_SECONDS
+(it was confirmed on an abandoned fork) the confirmation is rolled back to failed.
+
+Run it in a single process: set RECONCILER_ENABLED on one API instance, or run passes
+with `python -m app.maintenance reconcile-transactions`.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Settings, get_settings
+from app.database import SessionLocal
+from app.models.transaction import Transaction, TransactionStatus
+from app.services.solana import SolanaService
+from app.services.transaction import TransactionService
+from app.services.transaction_events import get_transaction_events
+
+logger = logging.getLogger(__name__)
+
+# Commitment levels at which verify_transaction can fetch a landed signature, per
+# SOLANA_CONFIRM_COMMITMENT
+LANDED_COMMITMENTS = {"confirmed": ("confirmed", "finalized"), "finalized": ("finalized",)}
+
+
+@dataclass
+class ReconcileStats:
+    """Outcome counts of one reconciliation pass."""
+
+    scanned: int = 0
+    checked: int = 0
+    confirmed: int = 0
+    failed: int = 0
+    deferred: int = 0
+    promoted: int = 0
+    rolled_back: int = 0
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    id: UUID
+    signature: str
+    status: TransactionStatus
+    commitment: str | None
+    verified_at: datetime | None
+    expected_amount: Decimal | None
+    expected_recipient: str | None
+
+    @property
+    def provisional(self) -> bool:
+        return self.status == TransactionStatus.CONFIRMED
+
+
+@dataclass(frozen=True)
+class _Outcome:
+    candidate: _Candidate
+    new_status: TransactionStatus | None  # None: not settled yet, check again later
+    failure_reason: str | None = None
+    commitment: str | None = None
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class TransactionReconciler:
+    """Settles pending Solana transactions without waiting for clients to call /confirm."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        settings: Settings | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.settings = settings or get_settings()
+
+    def backoff_seconds(self, attempts: int) -> float:
+        """Delay before rechecking a transaction that has been checked `attempts` times."""
+        if attempts <= 0:
+            return 0.0
+        return min(
+            self.settings.reconciler_backoff_base_seconds * 2 ** (attempts - 1),
+            self.settings.reconciler_backoff_max_seconds,
+        )
+
+    def _due_before(self, now: datetime) -> list[datetime]:
+        """
+        Per attempt count, the time before which a transaction must have last been
+        checked to be due now; the last entry covers every higher count (the backoff
+        stops growing there, or attempts run out).
+        """
+        due_before = []
+        for attempts in range(self.settings.reconciler_max_attempts + 1):
+            delay = self.backoff_seconds(attempts)
+            due_before.append(now - timedelta(seconds=delay))
+            if delay >= self.settings.reconciler_backoff_max_seconds:
+                break
+        return due_before
+
+    async def _load_candidates(self, now: datetime) -> tuple[int, list[_Candidate]]:
+        failed_since = now - timedelta(seconds=self.settings.reconciler_failed_lookback_seconds)
+        async with self.session_factory() as db:
+            transactions = await TransactionService.get_reconcilable_transactions(
+                db,
+                failed_since=failed_since,
+                max_attempts=self.settings.reconciler_max_attempts,
+                limit=self.settings.reconciler_batch_size,
+                due_before=self._due_before(now),
+            )
+        candidates = [
+            _Candidate(
+                id=tx.id,
+                signature=tx.solana_transaction_signature,
+                status=tx.status,
+                commitment=tx.solana_commitment,
+                verified_at=tx.transaction_verified_at,
+                expected_amount=(
+                    SolanaService.convert_sol_to_lamports(tx.solana_amount)
+                    if tx.solana_amount
+                    else None
+                ),
+                expected_recipient=tx.pda_address,
+            )
+            for tx in transactions
+        ]
+        return len(transactions), candidates
+
+    async def _resolve(
+        self, candidate: _Candidate, status: dict | None, limiter: asyncio.Semaphore
+    ) -> _Outcome:
+        if candidate.provisional:
+            return await self._resolve_provisional(candidate, status, limiter)
+
+        commitment = self.settings.solana_confirm_commitment
+        if status is None or status.get("confirmationStatus") not in LANDED_COMMITMENTS[commitment]:
+            return _Outcome(candidate, None)
+        if status.get("err"):
+            return _Outcome(
+                candidate, TransactionStatus.FAILED, f"Transaction failed: {status['err']}"
+            )
+
+        async with limiter:
+            result = await SolanaService.verify_transaction(
+                candidate.signature,
+                expected_amount=candidate.expected_amount,
+                expected_recipient=candidate.expected_recipient,
+                commitment=commitment,
+            )
+        if result["verified"]:
+            return _Outcome(candidate, TransactionStatus.CONFIRMED, commitment=result["commitment"])
+        if result["confirmed"]:
+            return _Outcome(candidate, TransactionStatus.FAILED, result.get("error"))
+        # RPC trouble while fetching the transaction: try again on a later pass
+        return _Outcome(candidate, None)
+
+    async def _resolve_provisional(
+        self, candidate: _Candidate, status: dict | None, limiter: asyncio.Semaphore
+    ) -> _Outcome:
+        """Promote a provisional confirmation once finalized, or roll it back if dropped."""
+        if status is None:
+            confirmed_for = datetime.now(timezone.utc) - _as_utc(candidate.verified_at)
+            if confirmed_for.total_seconds() >= self.settings.reconciler_rollback_seconds:
+                return _Outcome(
+                    candidate, TransactionStatus.FAILED, "Transaction dropped before finalization"
+                )
+            return _Outcome(candidate, None)
+        if status.get("confirmationStatus") != "finalized":
+            return _Outcome(candidate, None)
+        if status.get("err"):
+            return _Outcome(
+                candidate, TransactionStatus.FAILED, f"Transaction failed: {status['err']}"
+            )
+
+        async with limiter:
+            result = await SolanaService.verify_transaction(
+                candidate.signature,
+                expected_amount=candidate.expected_amount,
+                expected_recipient=candidate.expected_recipient,
+            )
+        if result["verified"]:
+            return _Outcome(candidate, TransactionStatus.CONFIRMED, commitment="finalized")
+        if result["confirmed"]:
+            return _Outcome(candidate, TransactionStatus.FAILED, result.get("error"))
+        return _Outcome(candidate, None)
+
+    async def _apply(self, outcomes: list[_Outcome], stats: ReconcileStats) -> None:
+        async with self.session_factory() as db:
+            # Lock the rows so a concurrent confirm cannot apply the same transition twice
+            result = await db.scalars(
+                select(Transaction)
+                .where(Transaction.id.in_([outcome.candidate.id for outcome in outcomes]))
+                .with_for_update()
+            )
+            transactions = {tx.id: tx for tx in result.all()}
+
+            for outcome in outcomes:
+                tx = transactions.get(outcome.candidate.id)
+                if (
+                    tx is None
+                    or tx.status != outcome.candidate.status
+                    or tx.solana_commitment != outcome.candidate.commitment
+                    or tx.solana_transaction_signature != outcome.candidate.signature
+                ):
+                    continue  # deleted, settled or re-signed since this pass loaded it
+                tx.verification_attempts += 1
+                if outcome.new_status == TransactionStatus.CONFIRMED:
+                    if outcome.candidate.provisional:
+                        stats.promoted += 1
+                    else:
+                        tx.status = TransactionStatus.CONFIRMED
+                        tx.transaction_verified_at = datetime.utcnow()
+                        tx.failure_reason = None
+                        stats.confirmed += 1
+                    tx.solana_commitment = outcome.commitment
+                elif outcome.new_status == TransactionStatus.FAILED:
+                    tx.status = TransactionStatus.FAILED
+                    tx.solana_commitment = None
+                    tx.failure_reason = (outcome.failure_reason or "Verification failed")[:500]
+                    if outcome.candidate.provisional:
+                        stats.rolled_back += 1
+                    else:
+                        stats.failed += 1
+                else:
+                    stats.deferred += 1
+
+            await db.commit()
+
+        events = get_transaction_events()
+        for outcome in outcomes:
+            if outcome.new_status is not None:
+                events.publish(outcome.candidate.id)
+
+    async def run_once(self) -> ReconcileStats:
+        """Run one reconciliation pass over the due transactions."""
+        now = datetime.now(timezone.utc)
+        scanned, candidates = await self._load_candidates(now)
+        stats = ReconcileStats(scanned=scanned, checked=len(candidates))
+        if not candidates:
+            return stats
+
+        statuses = await SolanaService.get_signature_statuses(
+            [candidate.signature for candidate in candidates]
+        )
+        limiter = asyncio.Semaphore(self.settings.reconciler_concurrency)
+        outcomes = await asyncio.gather(
+            *(
+                self._resolve(candidate, status, limiter)
+                for candidate, status in zip(candidates, statuses)
+            )
+        )
+        await self._apply(list(outcomes), stats)
+        return stats
+
+    async def run_forever(self) -> None:
+        """Run passes until cancelled; back-to-back while full batches are due."""
+        while True:
+            try:
+                stats = await self.run_once()
+            except Exception:
+                logger.exception("Transaction reconciliation pass failed")
+                stats = ReconcileStats()
+            if stats.checked:
+                logger.info(
+                    f"Reconciled {stats.checked} transactions: {stats.confirmed} confirmed, "
+                    f"{stats.failed} failed, {stats.promoted} finalized, "
+                    f"{stats.rolled_back} rolled back, {stats.deferred} deferred"
+                )
+            if stats.checked < self.settings.reconciler_batch_size:
+                await asyncio.sleep(self.settings.reconciler_interval_seconds)
@@ -0,0 +1,164 @@
+"""
+Client-side throttling of Solana RPC traffic.
+
+Two limits apply to every request the RPC pool sends. A token bucket caps the request
+rate at what the node allows (each JSON-RPC call in a batch costs one token). An
+adaptive concurrency limit bounds how many requests are in flight: it grows by about one
+per round trip while requests succeed and is cut multiplicatively on a 429 or a timeout
+(AIMD, as in TCP congestion control), so throughput settles just under the node's limit
+instead of oscillating through bursts of 429s. Callers over either limit queue until
+their deadline rather than failing straight away.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import httpx
+
+
+class RpcQueueTimeout(httpx.TimeoutException):
+    """A request could not get through the RPC limiter before its deadline."""
+
+
+class RpcLimiter:
+    """Token bucket plus AIMD concurrency limit, shared by all RPC requests of a process."""
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 1,
+        initial_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease_factor = decrease_factor
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+
+        self.in_flight = 0
+        self.waiting = 0
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._last_decrease = 0.0
+        self._condition: asyncio.Condition | None = None
+        self.timeouts = 0
+        self.decreases = 0
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be built outside the event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _reserve(self, cost: int, deadline: float) -> float:
+        """
+        Take `cost` tokens, going into debt if needed, and return how long to wait until
+        the debt is paid off. Reservations are served in call order, so a large batch
+        cannot be starved by a stream of single calls.
+        """
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        wait = max(0.0, (cost - self._tokens) / self.rate)
+        if now + wait > deadline:
+            raise RpcQueueTimeout("RPC rate limit: no capacity before the deadline")
+        self._tokens -= cost
+        return wait
+
+    async def _acquire_slot(self, deadline: float) -> None:
+        async with self.condition:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self.condition.wait_for(lambda: self.in_flight < int(self.limit)),
+                    timeout=max(0.0, deadline - time.monotonic()),
+                )
+            except asyncio.TimeoutError:
+                raise RpcQueueTimeout("RPC concurrency limit: no slot before the deadline")
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+    async def _release_slot(self) -> None:
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify(max(0, int(self.limit) - self.in_flight))
+
+    @asynccontextmanager
+    async def slot(self, deadline: float, cost: int = 1) -> AsyncIterator["RpcPermit"]:
+        """
+        Wait for a concurrency slot and `cost` tokens, until `deadline` (time.monotonic).
+
+        Raises RpcQueueTimeout if that is not possible in time. The yielded permit
+        reports the outcome of the request, which adjusts the concurrency limit.
+        """
+        try:
+            await self._acquire_slot(deadline)
+        except RpcQueueTimeout:
+            self.timeouts += 1
+            raise
+        try:
+            try:
+                wait = self._reserve(cost, deadline)
+            except RpcQueueTimeout:
+                self.timeouts += 1
+                raise
+            if wait:
+                try:
+                    await asyncio.sleep(wait)
+                except asyncio.CancelledError:
+                    self._tokens += cost  # give back what was never used
+                    raise
+            permit = RpcPermit(self)
+            yield permit
+        finally:
+            await self._release_slot()
+
+    def on_success(self) -> None:
+        """Additive increase: about one more slot per round trip of the whole window."""
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def on_overload(self, started_at: float) -> None:
+        """
+        Multiplicative decrease after a 429 or timeout. Only requests sent after the last
+        decrease count, so one burst of rejections halves the limit once, not per reply.
+        """
+        if started_at < self._last_decrease:
+            return
+        self._last_decrease = time.monotonic()
+        self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+        self.decreases += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the current limits, queue and counters."""
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rate": self.rate or None,
+            "queue_timeouts": self.timeouts,
+            "decreases": self.decreases,
+        }
+
+
+class RpcPermit:
+    """Admission for one request; report its outcome with success() or overloaded()."""
+
+    def __init__(self, limiter: RpcLimiter) -> None:
+        self.limiter = limiter
+        self.started_at = time.monotonic()
+
+    def success(self) -> None:
+        self.limiter.on_success()
+
+    def overloaded(self) -> None:
+        self.limiter.on_overload(self.started_at)
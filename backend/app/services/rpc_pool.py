@@ -0,0 +1,283 @@
+"""
+Routing of Solana JSON-RPC requests across several endpoints.
+
+Each endpoint keeps an exponentially weighted moving average (EWMA) of its latency and a
+window of recent samples. Requests go to the fastest healthy endpoint. On a transport
+error, a 5xx or a 429 they fail over to the next one. Rate-limited endpoints sit out for
+their Retry-After period (requests wait for them if all are rate limiting), and
+endpoints that keep failing sit out for a cooldown.
+Idempotent reads can be hedged: if the first endpoint has not answered within its
+configured latency percentile, the same request also goes to the next endpoint and the
+first good answer wins. Every request first passes the shared RpcLimiter (rate and
+adaptive concurrency limits), waiting up to SOLANA_RPC_QUEUE_TIMEOUT_SECONDS for room.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Callable
+
+import httpx
+
+from app.config import Settings
+from app.services.rpc_limiter import RpcLimiter, RpcQueueTimeout
+
+# Seconds a node that answered 429 without a Retry-After header is left alone
+DEFAULT_RETRY_AFTER = 1.0
+
+
+def _should_fail_over(response: httpx.Response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def _cost(payload: Any) -> int:
+    """Number of JSON-RPC calls in a payload; nodes rate-limit batches per call."""
+    return len(payload) if isinstance(payload, list) else 1
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class RpcEndpoint:
+    """One RPC endpoint with its latency estimate and health state."""
+
+    def __init__(self, url: str, ewma_alpha: float = 0.2, window: int = 100) -> None:
+        self.url = url
+        self.ewma_alpha = ewma_alpha
+        self.ewma_seconds: float | None = None
+        self.samples: deque[float] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.throttled_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.rate_limited = 0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def record_latency(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        if self.ewma_seconds is None:
+            self.ewma_seconds = seconds
+        else:
+            self.ewma_seconds += self.ewma_alpha * (seconds - self.ewma_seconds)
+
+    def record_success(self, seconds: float) -> None:
+        self.record_latency(seconds)
+        self.consecutive_failures = 0
+
+    def record_failure(self, now: float, threshold: int, cooldown: float) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= threshold:
+            self.unhealthy_until = now + cooldown
+
+    def record_rate_limit(self, now: float, retry_after: float) -> None:
+        self.rate_limited += 1
+        self.throttled_until = max(self.throttled_until, now + retry_after)
+        self.unhealthy_until = max(self.unhealthy_until, self.throttled_until)
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Latency below which `percentile` (0-1) of recent requests finished."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(percentile * len(ordered)) - 1)]
+
+    def stats(self, now: float) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy(now),
+            "ewma_ms": self.ewma_seconds * 1000 if self.ewma_seconds is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+        }
+
+
+class RpcPool:
+    """Sends JSON-RPC payloads to the fastest healthy endpoint, with failover and hedging."""
+
+    def __init__(
+        self,
+        urls: list[str],
+        settings: Settings,
+        client_factory: Callable[[], httpx.AsyncClient],
+    ) -> None:
+        if not urls:
+            raise ValueError("RpcPool needs at least one endpoint URL")
+        self.settings = settings
+        self.client_factory = client_factory
+        self.endpoints = [RpcEndpoint(url, settings.solana_rpc_ewma_alpha) for url in urls]
+        self.limiter = RpcLimiter(
+            rate=settings.solana_rpc_rate_limit,
+            burst=settings.solana_rpc_rate_burst,
+            initial_concurrency=settings.solana_rpc_concurrency_initial,
+            min_concurrency=settings.solana_rpc_concurrency_min,
+            max_concurrency=settings.solana_rpc_concurrency_max,
+        )
+        self.hedged = 0
+        self.hedges_won = 0
+        self.throttle_waits = 0
+
+    def ranked(self) -> list[RpcEndpoint]:
+        """
+        Endpoints in the order to try them: healthy ones fastest first (unmeasured ones
+        first, so they get measured), then the others by when they come back.
+        """
+        now = time.monotonic()
+        healthy = [e for e in self.endpoints if e.healthy(now)]
+        healthy.sort(key=lambda e: e.ewma_seconds or 0.0)
+        resting = sorted(
+            (e for e in self.endpoints if not e.healthy(now)), key=lambda e: e.unhealthy_until
+        )
+        return healthy + resting
+
+    def _hedge_delay(self, endpoint: RpcEndpoint) -> float | None:
+        latency = endpoint.latency_percentile(self.settings.solana_rpc_hedge_percentile)
+        if latency is None:
+            return None  # no samples yet to tell what "slow" is
+        return max(latency, self.settings.solana_rpc_hedge_min_delay_ms / 1000)
+
+    async def _send(self, endpoint: RpcEndpoint, payload: Any, deadline: float) -> httpx.Response:
+        async with self.limiter.slot(deadline, _cost(payload)) as permit:
+            endpoint.requests += 1
+            start = time.monotonic()
+            try:
+                response = await self.client_factory().post(endpoint.url, json=payload)
+            except httpx.TransportError as e:
+                if isinstance(e, httpx.TimeoutException):
+                    permit.overloaded()
+                endpoint.record_failure(
+                    time.monotonic(),
+                    self.settings.solana_rpc_failure_threshold,
+                    self.settings.solana_rpc_cooldown_seconds,
+                )
+                raise
+            except asyncio.CancelledError:
+                # Lost a hedge race: it took at least this long, which is worth knowing
+                endpoint.record_latency(time.monotonic() - start)
+                raise
+
+            now = time.monotonic()
+            if response.status_code == 429:
+                permit.overloaded()
+                endpoint.record_rate_limit(now, _retry_after(response) or DEFAULT_RETRY_AFTER)
+            elif response.status_code >= 500:
+                endpoint.record_failure(
+                    now,
+                    self.settings.solana_rpc_failure_threshold,
+                    self.settings.solana_rpc_cooldown_seconds,
+                )
+            else:
+                permit.success()
+                endpoint.record_success(now - start)
+            return response
+
+    async def _hedged_send(
+        self, primary: RpcEndpoint, backup: RpcEndpoint, payload: Any, deadline: float
+    ) -> httpx.Response:
+        """Send to `primary`, and to `backup` too if `primary` is slower than usual."""
+        first = asyncio.create_task(self._send(primary, payload, deadline))
+        delay = self._hedge_delay(primary)
+        if delay is not None:
+            try:
+                await asyncio.wait({first}, timeout=delay)
+            except asyncio.CancelledError:
+                first.cancel()
+                raise
+        if first.done() or delay is None:
+            return await first
+
+        self.hedged += 1
+        second = asyncio.create_task(self._send(backup, payload, deadline))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and not _should_fail_over(task.result()):
+                        if task is second:
+                            self.hedges_won += 1
+                        return task.result()
+            # Both failed: report the primary's outcome
+            return await first
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _post_once(self, payload: Any, hedge: bool, deadline: float) -> httpx.Response:
+        """One pass over the endpoints in ranked order, failing over until one answers."""
+        candidates = self.ranked()
+        last_response: httpx.Response | None = None
+        last_error: httpx.TransportError | None = None
+        while candidates:
+            endpoint = candidates.pop(0)
+            backup = candidates[0] if hedge and candidates else None
+            backup_requests = backup.requests if backup else 0
+            try:
+                if backup:
+                    response = await self._hedged_send(endpoint, backup, payload, deadline)
+                else:
+                    response = await self._send(endpoint, payload, deadline)
+            except RpcQueueTimeout:
+                raise  # waiting longer for another endpoint would not help
+            except httpx.TransportError as e:
+                last_error = e
+                continue
+            finally:
+                if backup and backup.requests != backup_requests:
+                    candidates.remove(backup)  # already tried as the hedge
+            if not _should_fail_over(response):
+                return response
+            last_response = response
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+    async def post(self, payload: Any, hedge: bool | None = None) -> httpx.Response:
+        """
+        Send a JSON-RPC payload (a call or a batch) and return the first good response.
+
+        Tries endpoints in ranked order, failing over on transport errors, 5xx and 429.
+        With `hedge` (default: SOLANA_RPC_HEDGE_ENABLED) a slow request is raced against
+        the next endpoint, so only use it for idempotent reads. If every endpoint is rate
+        limiting, waits for the first to come back. If every endpoint fails otherwise,
+        returns the last error response or raises the last transport error. Raises
+        RpcQueueTimeout (an httpx.TimeoutException) if the request cannot go out within
+        SOLANA_RPC_QUEUE_TIMEOUT_SECONDS.
+        """
+        deadline = time.monotonic() + self.settings.solana_rpc_queue_timeout_seconds
+        if hedge is None:
+            hedge = self.settings.solana_rpc_hedge_enabled
+        while True:
+            now = time.monotonic()
+            resume_at = min(endpoint.throttled_until for endpoint in self.endpoints)
+            if resume_at > now:
+                # Queue until an endpoint accepts traffic again rather than hammer them
+                if resume_at > deadline:
+                    self.limiter.timeouts += 1
+                    raise RpcQueueTimeout("Every RPC endpoint is rate limiting")
+                self.throttle_waits += 1
+                await asyncio.sleep(resume_at - now)
+            response = await self._post_once(payload, hedge, deadline)
+            if response.status_code != 429:
+                return response
+
+    def stats(self) -> dict[str, Any]:
+        """Return per-endpoint health and latency, hedging counters and limiter state."""
+        now = time.monotonic()
+        return {
+            "endpoints": [endpoint.stats(now) for endpoint in self.ranked()],
+            "hedged": self.hedged,
+            "hedges_won": self.hedges_won,
+            "throttle_waits": self.throttle_waits,
+            "limiter": self.limiter.stats(),
+        }
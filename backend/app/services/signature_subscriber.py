@@ -0,0 +1,242 @@
+"""
+Push-based confirmation of pending Solana transactions.
+
+Holds one websocket to the RPC node and keeps a signatureSubscribe subscription (at
+SOLANA_CONFIRM_COMMITMENT) for every pending transaction with a signature, newest first, up
+to SIGNATURE_SUBSCRIBER_MAX_SIGNATURES. When a notification arrives the transaction is
+handed to the confirmation queue, so the database reflects a landed transaction within
+one getTransaction round trip instead of the next client retry or reconciler pass.
+
+While the socket is down it falls back to polling (a reconciler pass per reconnect
+attempt, unless the reconciler already runs in this process). Run it in a single
+process: set SIGNATURE_SUBSCRIBER_ENABLED on one API instance. For local runs, the fake
+RPC node in app.fake_solana_rpc also serves signatureSubscribe on its websocket.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlsplit, urlunsplit
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import WebSocketException
+
+from app.config import Settings, get_settings
+from app.database import SessionLocal
+from app.services.confirmation_queue import get_confirmation_queue
+from app.services.reconciler import TransactionReconciler
+from app.services.transaction import TransactionService
+
+logger = logging.getLogger(__name__)
+
+
+def websocket_url(rpc_url: str) -> str:
+    """Derive the pubsub websocket URL of an RPC node from its HTTP URL."""
+    parts = urlsplit(rpc_url)
+    scheme = {"http": "ws", "https": "wss"}.get(parts.scheme, parts.scheme)
+    return urlunsplit(parts._replace(scheme=scheme))
+
+
+class SignatureSubscriber:
+    """Subscribes to pending signatures over one websocket and verifies them on arrival."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        settings: Settings | None = None,
+        ws_url: str | None = None,
+        on_landed: Callable[[UUID], Any] | None = None,
+        fallback: Callable[[], Awaitable[Any]] | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.settings = settings or get_settings()
+        self.ws_url = (
+            ws_url or self.settings.solana_ws_url or websocket_url(self.settings.solana_rpc_url)
+        )
+        self.on_landed = on_landed or get_confirmation_queue().enqueue
+        if fallback is None and not self.settings.reconciler_enabled:
+            fallback = TransactionReconciler(session_factory, self.settings).run_once
+        self.fallback = fallback
+
+        self._running = False
+        self._watched: dict[str, UUID] = {}  # signature -> transaction ID
+        self._requests: dict[int, str] = {}  # in-flight subscribe request ID -> signature
+        self._subscriptions: dict[int, str] = {}  # subscription ID -> signature
+        # Signatures notified recently (-> when): still pending in the database until the
+        # confirmation queue commits them, but subscribing again would only re-notify
+        self._notified: dict[str, float] = {}
+        self._request_ids = itertools.count(1)
+        self._changed = asyncio.Event()
+        self.connected = False
+        self.notifications = 0
+        self.reconnects = 0
+
+    def watch(self, transaction_id: UUID, signature: str) -> None:
+        """
+        Subscribe to a just-recorded signature without waiting for the next refresh
+        (no-op unless running).
+        """
+        if not self._running or signature in self._watched or signature in self._notified:
+            return
+        self._watched[signature] = transaction_id
+        self._changed.set()
+
+    def _subscribed(self) -> set[str]:
+        return set(self._requests.values()) | set(self._subscriptions.values())
+
+    async def _refresh(self) -> None:
+        """
+        Replace the watch list with the pending signatures currently in the database,
+        except those notified within SIGNATURE_SUBSCRIBER_NOTIFIED_TTL_SECONDS.
+        """
+        async with self.session_factory() as db:
+            pending = await TransactionService.get_pending_signatures(
+                db, limit=self.settings.signature_subscriber_max_signatures
+            )
+        expired_before = time.monotonic() - self.settings.signature_subscriber_notified_ttl_seconds
+        self._notified = {
+            signature: at for signature, at in self._notified.items() if at > expired_before
+        }
+        self._watched = {
+            signature: transaction_id
+            for transaction_id, signature in pending
+            if signature not in self._notified
+        }
+
+    async def _sync(self, ws: ClientConnection) -> None:
+        """Subscribe newly watched signatures and drop subscriptions no longer pending."""
+        while True:
+            await self._refresh()
+            subscribed = self._subscribed()
+            for signature in self._watched.keys() - subscribed:
+                request_id = next(self._request_ids)
+                self._requests[request_id] = signature
+                await ws.send(
+                    json.dumps(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": request_id,
+                            "method": "signatureSubscribe",
+                            "params": [
+                                signature,
+                                # What verification accepts
+                                {"commitment": self.settings.solana_confirm_commitment},
+                            ],
+                        }
+                    )
+                )
+            for subscription_id, signature in list(self._subscriptions.items()):
+                if signature not in self._watched:
+                    del self._subscriptions[subscription_id]
+                    await ws.send(
+                        json.dumps(
+                            {
+                                "jsonrpc": "2.0",
+                                "id": next(self._request_ids),
+                                "method": "signatureUnsubscribe",
+                                "params": [subscription_id],
+                            }
+                        )
+                    )
+
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(),
+                    timeout=self.settings.signature_subscriber_refresh_seconds,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def _handle(self, message: dict) -> None:
+        """Process one message from the socket: a subscribe reply or a notification."""
+        if message.get("method") == "signatureNotification":
+            params = message.get("params") or {}
+            # Solana removes signature subscriptions after their one notification
+            signature = self._subscriptions.pop(params.get("subscription"), None)
+            transaction_id = self._watched.pop(signature, None)
+            if transaction_id is not None:
+                self._notified[signature] = time.monotonic()
+                self.notifications += 1
+                self.on_landed(transaction_id)
+            return
+
+        signature = self._requests.pop(message.get("id"), None)
+        if signature is None:
+            return  # reply to an unsubscribe
+        if "error" in message:
+            logger.warning(f"signatureSubscribe failed for {signature}: {message['error']}")
+            self._watched.pop(signature, None)
+        else:
+            self._subscriptions[message["result"]] = signature
+
+    async def _listen(self, ws: ClientConnection) -> None:
+        async for raw in ws:
+            self._handle(json.loads(raw))
+
+    async def _session(self, ws: ClientConnection) -> None:
+        """Run the sync and listen loops until either ends (the socket closed)."""
+        tasks = [asyncio.create_task(self._sync(ws)), asyncio.create_task(self._listen(ws))]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_forever(self) -> None:
+        """Stay subscribed until cancelled, reconnecting with backoff and polling meanwhile."""
+        self._running = True
+        delay = 1.0
+        try:
+            while True:
+                try:
+                    async with connect(self.ws_url, ping_interval=20) as ws:
+                        self.connected = True
+                        delay = 1.0
+                        logger.info(f"Signature subscriber connected to {self.ws_url}")
+                        await self._session(ws)
+                except (OSError, WebSocketException, asyncio.TimeoutError) as e:
+                    logger.warning(f"Signature subscriber connection lost: {e!r}")
+                except Exception:
+                    logger.exception("Signature subscriber failed")
+                finally:
+                    self.connected = False
+                    self._requests.clear()
+                    self._subscriptions.clear()
+
+                # Socket is down: poll so landed transactions still settle meanwhile
+                if self.fallback is not None:
+                    try:
+                        await self.fallback()
+                    except Exception:
+                        logger.exception("Signature subscriber fallback poll failed")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.settings.signature_subscriber_reconnect_max_seconds)
+                self.reconnects += 1
+        finally:
+            self._running = False
+
+    def stats(self) -> dict[str, Any]:
+        """Return connection state, subscription counts and counters."""
+        return {
+            "connected": self.connected,
+            "watched": len(self._watched),
+            "subscriptions": len(self._subscriptions),
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+        }
+
+
+@lru_cache
+def get_signature_subscriber() -> SignatureSubscriber:
+    """Return the process-wide signature subscriber (started by the app lifespan)."""
+    return SignatureSubscriber()
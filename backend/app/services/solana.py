@@ -1,10 +1,77 @@
+import asyncio
 import httpx
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from decimal import Decimal
+from functools import lru_cache
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.services.rpc_limiter import RpcQueueTimeout
+from app.services.rpc_pool import RpcPool
+from app.services.solana_cache import FinalizedTransfer, get_finalized_transaction_cache
 
 settings = get_settings()
 
+# getSignatureStatuses accepts at most this many signatures per call
+MAX_SIGNATURES_PER_STATUS_REQUEST = 256
+# getTransaction calls sent per JSON-RPC batch request
+MAX_TRANSACTIONS_PER_BATCH_REQUEST = 100
+# getSignaturesForAddress returns at most this many signatures per call
+MAX_SIGNATURES_PER_ADDRESS_REQUEST = 1000
+
+# Process-wide RPC client: reuses keep-alive connections instead of a TCP/TLS handshake
+# per call. Opened in the app lifespan; created lazily for scripts and workers.
+_rpc_client: httpx.AsyncClient | None = None
+
+
+def _build_rpc_client(settings: Settings) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=settings.solana_rpc_http2,
+        timeout=httpx.Timeout(
+            settings.solana_rpc_request_timeout,
+            connect=settings.solana_rpc_connect_timeout,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.solana_rpc_max_connections,
+            max_keepalive_connections=settings.solana_rpc_max_keepalive_connections,
+            keepalive_expiry=settings.solana_rpc_keepalive_expiry,
+        ),
+    )
+
+
+def get_rpc_client() -> httpx.AsyncClient:
+    """Return the shared Solana RPC client, creating it on first use."""
+    global _rpc_client
+    if _rpc_client is None or _rpc_client.is_closed:
+        _rpc_client = _build_rpc_client(settings)
+    return _rpc_client
+
+
+@lru_cache
+def get_rpc_pool() -> RpcPool:
+    """Return the process-wide RPC endpoint pool (sends through the shared client)."""
+    return RpcPool(settings.rpc_urls_list, settings, client_factory=get_rpc_client)
+
+
+async def close_rpc_client() -> None:
+    """Close the shared Solana RPC client and its pooled connections."""
+    global _rpc_client
+    if _rpc_client is not None:
+        await _rpc_client.aclose()
+        _rpc_client = None
+
+
+@dataclass(frozen=True)
+class InboundTransfer:
+    """SOL received by a wallet in one finalized transaction."""
+
+    signature: str
+    slot: int
+    block_time: datetime | None
+    sender: str | None
+    amount_lamports: Decimal
+
 
 class SolanaService:
     """Service for Solana transaction verification."""
@@ -14,14 +81,23 @@ class SolanaService:
         transaction_signature: str,
         expected_amount: Decimal | None = None,
         expected_recipient: str | None = None,
+        commitment: str = "finalized",
     ) -> dict:
         """
         Verify a Solana transaction.
 
+        At "confirmed" commitment a transaction is accepted once a supermajority of the
+        cluster has voted on it, about a second after it lands instead of the ~13s it
+        takes to finalize; the result's `commitment` tells whether it is final already
+        or still provisional. Finalized transactions never change, so their transfer
+        data (and only theirs) is cached by signature and re-verifications cost a lookup
+        instead of an RPC call.
+
         Args:
             transaction_signature: The Solana transaction signature to verify
             expected_amount: Optional expected amount in lamports
             expected_recipient: Optional expected recipient wallet address
+            commitment: Lowest commitment accepted, "confirmed" or "finalized"
 
         Returns:
             dict with keys:
@@ -29,119 +105,247 @@ class SolanaService:
                 - confirmed: bool
                 - amount: Decimal (in lamports)
                 - recipient: str
+                - commitment: str ("confirmed" or "finalized", once found)
                 - error: str (if verification failed)
+                - retryable: bool (True if the RPC limiter had no room for the request
+                  in time: nothing was learned about the transaction, retry later)
         """
-        rpc_url = settings.solana_rpc_url
+        results = await SolanaService.verify_transactions(
+            [(transaction_signature, expected_amount, expected_recipient)], commitment
+        )
+        return results[0]
 
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Get transaction details
-                response = await client.post(
-                    rpc_url,
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "getTransaction",
-                        "params": [
-                            transaction_signature,
-                            {
-                                "encoding": "jsonParsed",
-                                "maxSupportedTransactionVersion": 0,
-                            },
-                        ],
-                    },
+    @staticmethod
+    async def verify_transactions(
+        transactions: list[tuple[str, Decimal | None, str | None]],
+        commitment: str = "finalized",
+    ) -> list[dict]:
+        """
+        Verify many Solana transactions with batched RPC calls.
+
+        Takes (signature, expected_amount, expected_recipient) tuples and returns one
+        verify_transaction-style result per tuple, in order. Cached signatures cost no
+        RPC call; the rest are fetched with JSON-RPC batches of getTransaction calls,
+        MAX_TRANSACTIONS_PER_BATCH_REQUEST per HTTP request. Fetching is bounded by
+        TRANSACTION_VERIFICATION_TIMEOUT as a whole (each RPC request also has its own
+        timeout); signatures not fetched by then get a timeout result.
+        """
+        cache = get_finalized_transaction_cache()
+        transfers: dict[str, tuple[FinalizedTransfer | dict, bool]] = {}
+        for signature, _, _ in transactions:
+            if signature not in transfers:
+                cached = await cache.get(signature)
+                if cached is not None:
+                    transfers[signature] = (cached, True)
+
+        missing = list(dict.fromkeys(s for s, _, _ in transactions if s not in transfers))
+        deadline = time.monotonic() + settings.transaction_verification_timeout
+        for start in range(0, len(missing), MAX_TRANSACTIONS_PER_BATCH_REQUEST):
+            batch = missing[start : start + MAX_TRANSACTIONS_PER_BATCH_REQUEST]
+            try:
+                fetched = await asyncio.wait_for(
+                    SolanaService._fetch_transfers(batch, commitment),
+                    timeout=max(0.0, deadline - time.monotonic()),
                 )
-                response.raise_for_status()
-                result = response.json()
-
-                if "error" in result:
-                    return {
-                        "verified": False,
-                        "confirmed": False,
-                        "error": result["error"].get("message", "Unknown RPC error"),
-                    }
-
-                transaction_data = result.get("result")
-                if not transaction_data:
-                    return {
-                        "verified": False,
-                        "confirmed": False,
-                        "error": "Transaction not found",
-                    }
-
-                # Check if transaction is confirmed
-                if transaction_data.get("meta", {}).get("err"):
-                    return {
-                        "verified": False,
-                        "confirmed": True,
-                        "error": f"Transaction failed: {transaction_data['meta']['err']}",
-                    }
-
-                # Extract transaction details
-                transaction = transaction_data.get("transaction", {})
-                message = transaction.get("message", {})
-                account_keys = message.get("accountKeys", [])
-
-                # Extract transfer amount and recipient from instructions
-                # This is a simplified version - you may need to adjust based on your transaction structure
-                meta = transaction_data.get("meta", {})
-                pre_balances = meta.get("preBalances", [])
-                post_balances = meta.get("postBalances", [])
-                pre_token_balances = meta.get("preTokenBalances", [])
-                post_token_balances = meta.get("postTokenBalances", [])
-
-                # Calculate SOL transfer (simplified - assumes single transfer)
-                # In production, you'd parse the instructions more carefully
-                amount_lamports = Decimal(0)
-                recipient = None
-
-                # Try to find the recipient by looking at balance changes
-                # This is simplified - adjust based on your actual transaction structure
-                if account_keys and len(pre_balances) == len(post_balances):
-                    for i, (pre, post) in enumerate(zip(pre_balances, post_balances)):
-                        if post > pre:
-                            amount_lamports = Decimal(post - pre)
-                            if i < len(account_keys):
-                                recipient = account_keys[i].get("pubkey")
-                            break
-
-                # Verify expected values if provided
-                if expected_amount and amount_lamports != expected_amount:
-                    return {
-                        "verified": False,
-                        "confirmed": True,
-                        "error": f"Amount mismatch: expected {expected_amount}, got {amount_lamports}",
-                    }
-
-                # Verify recipient if provided
-                if expected_recipient:
-                    # Check if recipient matches expected (case-insensitive)
-                    if recipient and recipient.lower() != expected_recipient.lower():
-                        return {
+            except asyncio.TimeoutError:
+                fetched = [
+                    (
+                        {
                             "verified": False,
-                            "confirmed": True,
-                            "error": f"Recipient mismatch: expected {expected_recipient}, got {recipient}",
-                        }
+                            "confirmed": False,
+                            "error": "Request timeout while verifying transaction",
+                        },
+                        False,
+                    )
+                    for _ in batch
+                ]
+            for signature, (transfer, finalized) in zip(batch, fetched):
+                transfers[signature] = (transfer, finalized)
+                if finalized and isinstance(transfer, FinalizedTransfer):
+                    await cache.put(signature, transfer)
 
-                return {
-                    "verified": True,
-                    "confirmed": True,
-                    "amount": amount_lamports,
-                    "recipient": recipient,
+        results = []
+        for signature, expected_amount, expected_recipient in transactions:
+            transfer, finalized = transfers[signature]
+            if isinstance(transfer, FinalizedTransfer):
+                transfer = SolanaService.check_transfer(
+                    transfer, expected_amount, expected_recipient
+                )
+                transfer["commitment"] = "finalized" if finalized else "confirmed"
+            results.append(transfer)
+        return results
+
+    @staticmethod
+    def _get_transaction_call(
+        transaction_signature: str, call_id: int = 1, commitment: str = "finalized"
+    ) -> dict:
+        """Build a getTransaction JSON-RPC call at `commitment`."""
+        return {
+            "jsonrpc": "2.0",
+            "id": call_id,
+            "method": "getTransaction",
+            "params": [
+                transaction_signature,
+                {
+                    "encoding": "jsonParsed",
+                    "maxSupportedTransactionVersion": 0,
+                    "commitment": commitment,
+                },
+            ],
+        }
+
+    @staticmethod
+    async def _fetch_transfers(
+        signatures: list[str], commitment: str = "finalized"
+    ) -> list[tuple[FinalizedTransfer | dict, bool]]:
+        """
+        Fetch several transactions at `commitment` in one HTTP request and extract their
+        transfers.
+
+        Returns (transfer, finalized) per signature, in order; instead of a transfer, a
+        verification result dict if it could not be fetched (RPC error, timeout, not
+        found or below `commitment` yet). Below finalized, a getSignatureStatuses call
+        rides in the same batch to tell which of the transactions are final already.
+        """
+        calls = [
+            SolanaService._get_transaction_call(sig, i, commitment)
+            for i, sig in enumerate(signatures)
+        ]
+        if commitment != "finalized":
+            calls.append(
+                {
+                    "jsonrpc": "2.0",
+                    "id": len(signatures),
+                    "method": "getSignatureStatuses",
+                    "params": [signatures],
                 }
+            )
 
+        retryable = False
+        try:
+            replies = await SolanaService._post_calls(calls)
+        except RpcQueueTimeout:
+            # Never sent: our own throttling, not a verdict on the transaction
+            error = "Solana RPC busy, verification deferred"
+            retryable = True
         except httpx.TimeoutException:
-            return {
-                "verified": False,
-                "confirmed": False,
-                "error": "Request timeout while verifying transaction",
-            }
+            error = "Request timeout while verifying transaction"
         except httpx.HTTPStatusError as e:
-            return {
-                "verified": False,
-                "confirmed": False,
-                "error": f"HTTP error: {e.response.status_code}",
+            error = f"HTTP error: {e.response.status_code}"
+        except Exception as e:
+            error = f"Verification error: {str(e)}"
+        else:
+            finalized = [commitment == "finalized"] * len(signatures)
+            if commitment != "finalized":
+                # No status (RPC error): treat as provisional, the reconciler rechecks
+                statuses = (replies.pop().get("result") or {}).get("value") or []
+                finalized = [
+                    bool(status) and status.get("confirmationStatus") == "finalized"
+                    for status in statuses + [None] * (len(signatures) - len(statuses))
+                ]
+            return [
+                (SolanaService._parse_transaction_reply(reply), is_final)
+                for reply, is_final in zip(replies, finalized)
+            ]
+
+        result = {"verified": False, "confirmed": False, "error": error}
+        if retryable:
+            result["retryable"] = True
+        return [(dict(result), False) for _ in signatures]
+
+    @staticmethod
+    async def _get_transaction_replies(signatures: list[str]) -> list[dict]:
+        """
+        Send getTransaction calls (finalized) for `signatures` in one HTTP request and
+        return the JSON-RPC replies in order.
+
+        Raises httpx.HTTPError on transport failures.
+        """
+        return await SolanaService._post_calls(
+            [SolanaService._get_transaction_call(sig, i) for i, sig in enumerate(signatures)]
+        )
+
+    @staticmethod
+    async def _post_calls(calls: list[dict]) -> list[dict]:
+        """
+        Send JSON-RPC calls in one HTTP request (a batch when there is more than one)
+        and return their replies in call order.
+
+        Raises httpx.HTTPError on transport failures.
+        """
+        response = await get_rpc_pool().post(calls if len(calls) > 1 else calls[0])
+        response.raise_for_status()
+        payload = response.json()
+        if isinstance(payload, dict) and len(calls) > 1:
+            # Batch rejected as a whole (e.g. batching disabled on the node)
+            replies = {call["id"]: payload for call in calls}
+        else:
+            replies = {
+                reply.get("id"): reply
+                for reply in (payload if isinstance(payload, list) else [payload])
             }
+        return [
+            replies.get(call["id"], {"error": {"message": "Missing RPC response"}})
+            for call in calls
+        ]
+
+    @staticmethod
+    def _parse_transaction_reply(result: dict) -> FinalizedTransfer | dict:
+        """Extract the transfer from a getTransaction reply, or a verification result dict."""
+        try:
+            if "error" in result:
+                return {
+                    "verified": False,
+                    "confirmed": False,
+                    "error": result["error"].get("message", "Unknown RPC error"),
+                }
+
+            transaction_data = result.get("result")
+            if not transaction_data:
+                return {
+                    "verified": False,
+                    "confirmed": False,
+                    "error": "Transaction not found",
+                }
+
+            # Check if transaction failed on chain
+            meta = transaction_data.get("meta", {})
+            if meta.get("err"):
+                return FinalizedTransfer(
+                    amount_lamports=Decimal(0),
+                    recipient=None,
+                    error=f"Transaction failed: {meta['err']}",
+                )
+
+            # Extract transaction details
+            transaction = transaction_data.get("transaction", {})
+            message = transaction.get("message", {})
+            account_keys = message.get("accountKeys", [])
+
+            # Extract transfer amount and recipient from instructions
+            # This is a simplified version - you may need to adjust based on your transaction structure
+            pre_balances = meta.get("preBalances", [])
+            post_balances = meta.get("postBalances", [])
+
+            # Calculate SOL transfer (simplified - assumes single transfer)
+            # In production, you'd parse the instructions more carefully
+            amount_lamports = Decimal(0)
+            recipient = None
+
+            # Try to find the recipient by looking at balance changes
+            # This is simplified - adjust based on your actual transaction structure
+            if account_keys and len(pre_balances) == len(post_balances):
+                for i, (pre, post) in enumerate(zip(pre_balances, post_balances)):
+                    if post > pre:
+                        amount_lamports = Decimal(post - pre)
+                        if i < len(account_keys):
+                            recipient = account_keys[i].get("pubkey")
+                        break
+
+            return FinalizedTransfer(
+                amount_lamports=amount_lamports, recipient=recipient, error=None
+            )
+
         except Exception as e:
             return {
                 "verified": False,
@@ -149,6 +353,172 @@ class SolanaService:
                 "error": f"Verification error: {str(e)}",
             }
 
+    @staticmethod
+    def check_transfer(
+        transfer: FinalizedTransfer,
+        expected_amount: Decimal | None,
+        expected_recipient: str | None,
+    ) -> dict:
+        """Check a finalized transfer against the expected amount and recipient."""
+        if transfer.error:
+            return {"verified": False, "confirmed": True, "error": transfer.error}
+
+        # Verify expected values if provided
+        if expected_amount and transfer.amount_lamports != expected_amount:
+            return {
+                "verified": False,
+                "confirmed": True,
+                "error": f"Amount mismatch: expected {expected_amount}, got {transfer.amount_lamports}",
+            }
+
+        # Verify recipient if provided
+        if expected_recipient:
+            # Check if recipient matches expected (case-insensitive)
+            recipient = transfer.recipient
+            if recipient and recipient.lower() != expected_recipient.lower():
+                return {
+                    "verified": False,
+                    "confirmed": True,
+                    "error": f"Recipient mismatch: expected {expected_recipient}, got {recipient}",
+                }
+
+        return {
+            "verified": True,
+            "confirmed": True,
+            "amount": transfer.amount_lamports,
+            "recipient": transfer.recipient,
+        }
+
+    @staticmethod
+    async def get_signature_statuses(signatures: list[str]) -> list[dict | None]:
+        """
+        Look up the cluster status of many signatures with batched getSignatureStatuses.
+
+        Sends one RPC call per MAX_SIGNATURES_PER_STATUS_REQUEST signatures. Returns one
+        entry per signature, in order: None if the signature has not landed, otherwise
+        the RPC status object (slot, confirmations, err, confirmationStatus).
+
+        Raises httpx.HTTPError on transport failures and RuntimeError on RPC errors.
+        """
+        statuses: list[dict | None] = []
+        for start in range(0, len(signatures), MAX_SIGNATURES_PER_STATUS_REQUEST):
+            batch = signatures[start : start + MAX_SIGNATURES_PER_STATUS_REQUEST]
+            response = await get_rpc_pool().post(
+                {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "getSignatureStatuses",
+                    "params": [batch, {"searchTransactionHistory": True}],
+                }
+            )
+            response.raise_for_status()
+            result = response.json()
+            if "error" in result:
+                raise RuntimeError(
+                    result["error"].get("message", "Unknown RPC error")
+                )
+            statuses.extend(result["result"]["value"])
+        return statuses
+
+    @staticmethod
+    async def get_signatures_for_address(
+        address: str,
+        until: str | None = None,
+        before: str | None = None,
+        limit: int = MAX_SIGNATURES_PER_ADDRESS_REQUEST,
+    ) -> list[dict]:
+        """
+        List finalized signatures involving `address`, newest first, with
+        getSignaturesForAddress: those after `until` and before `before` (exclusive),
+        at most `limit`. Entries carry signature, slot, err and blockTime.
+
+        Raises httpx.HTTPError on transport failures and RuntimeError on RPC errors.
+        """
+        options: dict = {"limit": limit, "commitment": "finalized"}
+        if until:
+            options["until"] = until
+        if before:
+            options["before"] = before
+        response = await get_rpc_pool().post(
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getSignaturesForAddress",
+                "params": [address, options],
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
+        if "error" in result:
+            raise RuntimeError(result["error"].get("message", "Unknown RPC error"))
+        return result["result"]
+
+    @staticmethod
+    async def get_inbound_transfers(wallet: str, signatures: list[str]) -> list[InboundTransfer]:
+        """
+        Fetch finalized transactions and return the SOL each one moved into `wallet`, in
+        the order given; transactions that failed or paid nothing in are left out.
+
+        Uses JSON-RPC batches like verify_transactions and caches every transfer it
+        parses, so a later confirm of the same signature costs no RPC call.
+
+        Raises httpx.HTTPError on transport failures and RuntimeError if a transaction
+        could not be fetched, so that callers do not skip past it.
+        """
+        cache = get_finalized_transaction_cache()
+        inbound = []
+        for start in range(0, len(signatures), MAX_TRANSACTIONS_PER_BATCH_REQUEST):
+            batch = signatures[start : start + MAX_TRANSACTIONS_PER_BATCH_REQUEST]
+            replies = await SolanaService._get_transaction_replies(batch)
+            for signature, reply in zip(batch, replies):
+                if "error" in reply:
+                    message = reply["error"].get("message", "Unknown RPC error")
+                    raise RuntimeError(f"getTransaction {signature}: {message}")
+                if not reply.get("result"):
+                    raise RuntimeError(f"getTransaction {signature}: not available")
+                transfer = SolanaService._parse_transaction_reply(reply)
+                if isinstance(transfer, FinalizedTransfer):
+                    await cache.put(signature, transfer)
+                received = SolanaService._parse_inbound_transfer(signature, reply["result"], wallet)
+                if received is not None:
+                    inbound.append(received)
+        return inbound
+
+    @staticmethod
+    def _parse_inbound_transfer(
+        signature: str, transaction_data: dict, wallet: str
+    ) -> InboundTransfer | None:
+        """Extract the SOL `wallet` received in a transaction from its balance changes."""
+        meta = transaction_data.get("meta") or {}
+        if meta.get("err"):
+            return None
+        message = (transaction_data.get("transaction") or {}).get("message", {})
+        account_keys = [
+            key.get("pubkey") if isinstance(key, dict) else key
+            for key in message.get("accountKeys", [])
+        ]
+        pre_balances = meta.get("preBalances", [])
+        post_balances = meta.get("postBalances", [])
+        if wallet not in account_keys or len(pre_balances) != len(post_balances):
+            return None
+        deltas = [post - pre for pre, post in zip(pre_balances, post_balances)]
+        received = deltas[account_keys.index(wallet)]
+        if received <= 0:
+            return None
+
+        # The sender is the account that paid the most (fees included)
+        payer = min(range(len(deltas)), key=lambda i: deltas[i])
+        block_time = transaction_data.get("blockTime")
+        return InboundTransfer(
+            signature=signature,
+            slot=transaction_data.get("slot", 0),
+            block_time=(
+                datetime.fromtimestamp(block_time, tz=timezone.utc) if block_time else None
+            ),
+            sender=account_keys[payer] if deltas[payer] < 0 else None,
+            amount_lamports=Decimal(received),
+        )
+
     @staticmethod
     def convert_lamports_to_sol(lamports: Decimal) -> Decimal:
         """Convert lamports to SOL."""
@@ -0,0 +1,140 @@
+"""Cache of finalized Solana transfers, keyed by transaction signature."""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.models.finalized_transaction import FinalizedSolanaTransaction
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FinalizedTransfer:
+    """What verification needs from a finalized transaction: never changes once final."""
+
+    amount_lamports: Decimal
+    recipient: str | None
+    error: str | None  # on-chain failure, if the transaction failed
+
+
+class FinalizedTransactionCache:
+    """
+    Bounded in-memory LRU of finalized transfers, optionally backed by a database table.
+
+    Only finalized transactions may be stored: they cannot be rolled back, so entries
+    never expire. The database tier survives restarts and is shared across processes.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.session_factory = session_factory
+        self._entries: OrderedDict[str, FinalizedTransfer] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _remember(self, signature: str, transfer: FinalizedTransfer) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[signature] = transfer
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get(self, signature: str) -> FinalizedTransfer | None:
+        """Return the cached transfer for a signature, or None on a miss."""
+        with self._lock:
+            transfer = self._entries.get(signature)
+            if transfer is not None:
+                self._entries.move_to_end(signature)
+                self.hits += 1
+                return transfer
+
+        if self.session_factory is not None:
+            try:
+                async with self.session_factory() as db:
+                    row = await db.get(FinalizedSolanaTransaction, signature)
+            except SQLAlchemyError:
+                logger.warning("Finalized transaction cache lookup failed", exc_info=True)
+                row = None
+            if row is not None:
+                transfer = FinalizedTransfer(
+                    amount_lamports=row.amount_lamports,
+                    recipient=row.recipient,
+                    error=row.error,
+                )
+                self._remember(signature, transfer)
+                with self._lock:
+                    self.db_hits += 1
+                return transfer
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def put(self, signature: str, transfer: FinalizedTransfer) -> None:
+        """Cache a finalized transfer (callers must only pass finalized results)."""
+        self._remember(signature, transfer)
+        if self.session_factory is None:
+            return
+        try:
+            async with self.session_factory() as db:
+                db.add(
+                    FinalizedSolanaTransaction(
+                        signature=signature,
+                        amount_lamports=transfer.amount_lamports,
+                        recipient=transfer.recipient,
+                        error=transfer.error,
+                    )
+                )
+                await db.commit()
+        except IntegrityError:
+            pass  # another process stored it first; the content is identical
+        except SQLAlchemyError:
+            logger.warning("Finalized transaction cache write failed", exc_info=True)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (the database tier is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters, hit ratio (either tier) and current in-memory size."""
+        with self._lock:
+            lookups = self.hits + self.db_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.db_hits) / lookups if lookups else 0.0,
+            }
+
+
+@lru_cache
+def get_finalized_transaction_cache() -> FinalizedTransactionCache:
+    """Return the process-wide finalized transaction cache."""
+    settings = get_settings()
+    session_factory = None
+    if settings.solana_finalized_cache_persist:
+        from app.database import SessionLocal
+
+        session_factory = SessionLocal
+    return FinalizedTransactionCache(
+        max_size=settings.solana_finalized_cache_size,
+        session_factory=session_factory,
+    )
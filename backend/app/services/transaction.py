@@ -1,126 +1,263 @@
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import List
+from typing import List, Sequence
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, String, and_, case, cast, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.transaction import Transaction, TransactionStatus
+from app.config import get_settings
+from app.models.investment import Investment
+from app.models.project import Project
+from app.models.transaction import (
+    Transaction,
+    TransactionStatus,
+    apply_status_change,
+    apply_status_changes,
+)
+from app.pagination import paginate, split_page
 from app.schemas.transaction import TransactionConfirm, TransactionCreate
 from app.services.solana import SolanaService
+from app.services.transaction_events import get_transaction_events
+
+
+@dataclass(frozen=True)
+class ConfirmContext:
+    """A transaction with what confirming it needs from its investment and project."""
+
+    transaction: Transaction
+    user_id: int
+    project_id: str
+    project_found: bool
+    pda_wallet: str | None
 
 
 class TransactionService:
     """Service for transaction CRUD operations."""
 
     @staticmethod
-    def get_transaction(db: Session, transaction_id: UUID) -> Transaction | None:
+    async def get_transaction(db: AsyncSession, transaction_id: UUID) -> Transaction | None:
         """Get a transaction by ID."""
-        return db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        return await db.get(Transaction, transaction_id)
 
     @staticmethod
-    def get_transaction_by_signature(db: Session, signature: str) -> Transaction | None:
+    async def get_transaction_by_signature(
+        db: AsyncSession, signature: str
+    ) -> Transaction | None:
         """Get a transaction by Solana signature (for idempotency)."""
-        return (
-            db.query(Transaction)
-            .filter(Transaction.solana_transaction_signature == signature)
-            .first()
+        return await db.scalar(
+            select(Transaction)
+            .where(Transaction.solana_transaction_signature == signature)
+            .limit(1)
         )
 
     @staticmethod
-    def get_transactions_by_investment(
-        db: Session, investment_id: UUID
+    async def get_transaction_status(db: AsyncSession, transaction_id: UUID) -> Row | None:
+        """
+        Get the status fields of a transaction and its owner's user ID in one narrow
+        query, for status polling.
+        """
+        result = await db.execute(
+            select(
+                Transaction.id,
+                Transaction.status,
+                Transaction.solana_commitment,
+                Transaction.failure_reason,
+                Transaction.verification_attempts,
+                Transaction.transaction_verified_at,
+                Transaction.updated_at,
+                Investment.user_id,
+            )
+            .join(Investment, Investment.id == Transaction.investment_id)
+            .where(Transaction.id == transaction_id)
+        )
+        return result.one_or_none()
+
+    @staticmethod
+    async def get_transactions_by_investment(
+        db: AsyncSession,
+        investment_id: UUID,
+        limit: int = 100,
+        cursor: str | None = None,
+        user_id: int | None = None,
+    ) -> tuple[List[Transaction], str | None]:
+        """
+        Get a page of transactions for a specific investment, newest first, and the
+        cursor for the next page. With `user_id`, only if the investment is that user's.
+        """
+        keys = (Transaction.created_at, Transaction.id)
+        query = select(Transaction).where(Transaction.investment_id == investment_id)
+        if user_id is not None:
+            query = query.join(Investment, Investment.id == Transaction.investment_id).where(
+                Investment.user_id == user_id
+            )
+        result = await db.scalars(paginate(query, keys, cursor, limit, descending=True))
+        return split_page(result.all(), keys, limit)
+
+    @staticmethod
+    async def get_pending_transactions(
+        db: AsyncSession, limit: int = 100, cursor: str | None = None
+    ) -> tuple[List[Transaction], str | None]:
+        """Get a page of pending transactions, oldest first, and the next page's cursor."""
+        keys = (Transaction.created_at, Transaction.id)
+        query = select(Transaction).where(Transaction.status == TransactionStatus.PENDING)
+        result = await db.scalars(paginate(query, keys, cursor, limit))
+        return split_page(result.all(), keys, limit)
+
+    @staticmethod
+    async def get_reconcilable_transactions(
+        db: AsyncSession,
+        failed_since: datetime,
+        max_attempts: int,
+        limit: int,
+        due_before: Sequence[datetime],
     ) -> List[Transaction]:
-        """Get all transactions for a specific investment."""
-        return (
-            db.query(Transaction)
-            .filter(Transaction.investment_id == investment_id)
-            .order_by(Transaction.created_at.desc())
-            .all()
+        """
+        Get transactions with a signature that may still change status and are due for
+        a recheck, least recently checked first: pending ones and failed ones created
+        since `failed_since` that were checked fewer than `max_attempts` times, and
+        provisionally confirmed ones however often they were checked (they must end up
+        finalized or rolled back).
+
+        `due_before[n]` is the time before which a transaction checked n times must have
+        last changed to be due again; the last entry applies to all higher counts.
+        """
+        due = Transaction.updated_at <= case(
+            {attempts: cutoff for attempts, cutoff in enumerate(due_before[:-1])},
+            value=Transaction.verification_attempts,
+            else_=due_before[-1],
+        )
+        result = await db.scalars(
+            select(Transaction)
+            .where(
+                Transaction.solana_transaction_signature.is_not(None),
+                or_(
+                    and_(
+                        Transaction.status == TransactionStatus.PENDING,
+                        Transaction.verification_attempts < max_attempts,
+                    ),
+                    Transaction.solana_commitment == "confirmed",
+                    and_(
+                        Transaction.status == TransactionStatus.FAILED,
+                        Transaction.created_at >= failed_since,
+                        Transaction.verification_attempts < max_attempts,
+                    ),
+                ),
+                due,
+            )
+            .order_by(Transaction.updated_at, Transaction.id)
+            .limit(limit)
         )
+        return list(result.all())
 
     @staticmethod
-    def get_pending_transactions(db: Session) -> List[Transaction]:
-        """Get all pending transactions."""
-        return (
-            db.query(Transaction)
-            .filter(Transaction.status == TransactionStatus.PENDING)
-            .all()
+    async def get_pending_signatures(db: AsyncSession, limit: int) -> List[tuple[UUID, str]]:
+        """Get (id, signature) of pending transactions that have a signature, newest first."""
+        result = await db.execute(
+            select(Transaction.id, Transaction.solana_transaction_signature)
+            .where(
+                Transaction.status == TransactionStatus.PENDING,
+                Transaction.solana_transaction_signature.is_not(None),
+            )
+            .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+            .limit(limit)
+        )
+        return [(row.id, row.solana_transaction_signature) for row in result]
+
+    @staticmethod
+    async def get_transactions_by_signatures(
+        db: AsyncSession, signatures: Sequence[str]
+    ) -> dict[str, Transaction]:
+        """Get the transactions holding any of `signatures`, locked for update."""
+        result = await db.scalars(
+            select(Transaction)
+            .where(Transaction.solana_transaction_signature.in_(signatures))
+            .with_for_update()
         )
+        return {tx.solana_transaction_signature: tx for tx in result.all()}
 
     @staticmethod
-    def create_transaction(
-        db: Session, transaction_create: TransactionCreate
+    async def get_unsigned_pending_transactions(
+        db: AsyncSession, pda_wallet: str
+    ) -> List[Transaction]:
+        """
+        Get pending transactions into a project PDA wallet that have a sender wallet and
+        an expected SOL amount but no signature yet, oldest first, locked for update: the
+        ones a deposit to that wallet can be matched to by sender and amount.
+        """
+        result = await db.scalars(
+            select(Transaction)
+            .join(Investment, Investment.id == Transaction.investment_id)
+            .join(Project, cast(Project.id, String) == Investment.project_id)
+            .where(
+                Project.solana_pda_wallet == pda_wallet,
+                Transaction.status == TransactionStatus.PENDING,
+                Transaction.solana_transaction_signature.is_(None),
+                Transaction.solana_amount.is_not(None),
+                Transaction.user_wallet.is_not(None),
+            )
+            .order_by(Transaction.created_at, Transaction.id)
+            .with_for_update(of=Transaction)
+        )
+        return list(result.all())
+
+    @staticmethod
+    async def create_transaction(
+        db: AsyncSession, transaction_create: TransactionCreate
     ) -> Transaction:
         """Create a new pending transaction."""
         db_transaction = Transaction(
             investment_id=transaction_create.investment_id,
             amount=transaction_create.amount,
             status=TransactionStatus.PENDING,
+            solana_amount=transaction_create.solana_amount,
+            user_wallet=transaction_create.wallet_address,
         )
         db.add(db_transaction)
-        db.commit()
-        db.refresh(db_transaction)
+        await db.commit()
         return db_transaction
 
     @staticmethod
     async def confirm_transaction(
-        db: Session,
-        transaction_id: UUID,
+        db: AsyncSession,
+        context: ConfirmContext,
         transaction_confirm: TransactionConfirm,
     ) -> Transaction | None:
         """
         Confirm a transaction by verifying it on Solana blockchain.
 
-        Returns the updated transaction or None if not found.
-        """
-        db_transaction = TransactionService.get_transaction(db, transaction_id)
-        if not db_transaction:
-            return None
-
-        # Check if signature already exists (idempotency)
-        existing = TransactionService.get_transaction_by_signature(
-            db, transaction_confirm.transaction_signature
-        )
-        if existing and existing.id != transaction_id:
-            db_transaction.status = TransactionStatus.FAILED
-            db_transaction.failure_reason = "Transaction signature already used"
-            db.commit()
-            db.refresh(db_transaction)
-            return db_transaction
-
-        # Get the project's PDA wallet from the investment
-        from app.models.project import Project
+        `context` comes from get_transaction_context. Runs in three phases so no pooled
+        connection is held while waiting on the RPC node: read what verification needs
+        and end the DB transaction, verify with no DB resources held, then write the
+        result with a conditional UPDATE that only applies if nobody changed the
+        transaction in the meantime (otherwise the current state is returned).
 
-        try:
-            project_id = int(db_transaction.investment.project_id)
-        except (ValueError, TypeError):
-            db_transaction.status = TransactionStatus.FAILED
-            db_transaction.failure_reason = "Invalid project ID format"
-            db.commit()
-            db.refresh(db_transaction)
-            return db_transaction
+        If the RPC limiter has no room for the verification (a retryable result), the
+        signature is stored and the transaction left pending, as record_signature does,
+        for background verification instead of failing it.
 
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if not project:
-            db_transaction.status = TransactionStatus.FAILED
-            db_transaction.failure_reason = "Project not found"
-            db.commit()
-            db.refresh(db_transaction)
+        Returns the updated transaction or None if it was deleted meanwhile.
+        """
+        # Phase 1: read
+        db_transaction = context.transaction
+        transaction_id = db_transaction.id
+        pda_wallet = await TransactionService._confirmation_target(
+            db, context, transaction_confirm.transaction_signature
+        )
+        if pda_wallet is None:
             return db_transaction
 
-        if not project.solana_pda_wallet:
-            db_transaction.status = TransactionStatus.FAILED
-            db_transaction.failure_reason = "Project PDA wallet not configured"
-            db.commit()
-            db.refresh(db_transaction)
-            return db_transaction
+        read_status = db_transaction.status
+        read_attempts = db_transaction.verification_attempts
+        read_signature = db_transaction.solana_transaction_signature
+        # End the read transaction: returns the connection to the pool during the RPC
+        await db.commit()
 
-        # Verify transaction on Solana
+        # Phase 2: verify transaction on Solana
         expected_amount = None
         if transaction_confirm.solana_amount:
-            from app.services.solana import SolanaService
-
             expected_amount = SolanaService.convert_sol_to_lamports(
                 transaction_confirm.solana_amount
             )
@@ -128,42 +265,481 @@ class TransactionService:
         verification_result = await SolanaService.verify_transaction(
             transaction_confirm.transaction_signature,
             expected_amount=expected_amount,
-            expected_recipient=project.solana_pda_wallet,
+            expected_recipient=pda_wallet,
+            commitment=get_settings().solana_confirm_commitment,
+        )
+
+        # Phase 3: optimistic write, guarded by the state read in phase 1
+        values = {
+            "solana_transaction_signature": transaction_confirm.transaction_signature,
+            "user_wallet": transaction_confirm.wallet_address,
+            "pda_address": pda_wallet,
+        }
+        if transaction_confirm.solana_amount:
+            values["solana_amount"] = transaction_confirm.solana_amount
+
+        if verification_result["verified"]:
+            values["status"] = TransactionStatus.CONFIRMED
+            values["solana_commitment"] = verification_result["commitment"]
+            values["transaction_verified_at"] = datetime.utcnow()
+        elif verification_result.get("retryable"):
+            values["status"] = TransactionStatus.PENDING
+            values["solana_commitment"] = None
+            values["failure_reason"] = None
+        else:
+            values["status"] = TransactionStatus.FAILED
+            values["solana_commitment"] = None
+            values["failure_reason"] = verification_result.get(
+                "error", "Verification failed"
+            )
+
+        return await TransactionService._write_verification(
+            db, transaction_id, read_status, read_attempts, read_signature, values
         )
 
-        db_transaction.verification_attempts += 1
-        db_transaction.solana_transaction_signature = (
-            transaction_confirm.transaction_signature
+    @staticmethod
+    async def record_signature(
+        db: AsyncSession,
+        context: ConfirmContext,
+        transaction_confirm: TransactionConfirm,
+    ) -> Transaction | None:
+        """
+        Store a transaction's Solana details for verification in the background.
+
+        Runs the checks of confirm_transaction that need no RPC call and leaves the
+        transaction pending with its signature set, for verify_recorded_transaction (or
+        the reconciler) to settle. Confirmed transactions are returned unchanged.
+
+        Returns the transaction or None if it was deleted meanwhile.
+        """
+        db_transaction = context.transaction
+        transaction_id = db_transaction.id
+        if db_transaction.status == TransactionStatus.CONFIRMED:
+            return db_transaction
+
+        pda_wallet = await TransactionService._confirmation_target(
+            db, context, transaction_confirm.transaction_signature
         )
+        if pda_wallet is None:
+            return db_transaction
+
+        db_transaction.status = TransactionStatus.PENDING
+        db_transaction.failure_reason = None
+        db_transaction.solana_transaction_signature = transaction_confirm.transaction_signature
         db_transaction.user_wallet = transaction_confirm.wallet_address
-        db_transaction.pda_address = project.solana_pda_wallet
+        db_transaction.pda_address = pda_wallet
         if transaction_confirm.solana_amount:
             db_transaction.solana_amount = transaction_confirm.solana_amount
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another transaction claimed the same signature since the check above
+            await db.rollback()
+            db_transaction = await TransactionService.get_transaction(db, transaction_id)
+            if not db_transaction:
+                return None
+            return await TransactionService._fail_before_verification(
+                db, db_transaction, "Transaction signature already used"
+            )
+
+        get_transaction_events().publish(transaction_id)
+        return db_transaction
+
+    @staticmethod
+    async def verify_recorded_transaction(
+        db: AsyncSession, transaction_id: UUID
+    ) -> Transaction | None:
+        """
+        Verify a pending transaction whose signature was stored by record_signature.
+
+        Same phases as confirm_transaction, except that a signature the RPC node cannot
+        return at the confirm commitment yet only counts an attempt and leaves the
+        transaction pending for the reconciler, instead of failing it.
+
+        Returns the transaction or None if not found.
+        """
+        db_transaction = await TransactionService.get_transaction(db, transaction_id)
+        if (
+            not db_transaction
+            or db_transaction.status != TransactionStatus.PENDING
+            or not db_transaction.solana_transaction_signature
+        ):
+            return db_transaction
 
+        read_status = db_transaction.status
+        read_attempts = db_transaction.verification_attempts
+        read_signature = db_transaction.solana_transaction_signature
+        expected_amount = None
+        if db_transaction.solana_amount:
+            expected_amount = SolanaService.convert_sol_to_lamports(db_transaction.solana_amount)
+        expected_recipient = db_transaction.pda_address
+        await db.commit()
+
+        verification_result = await SolanaService.verify_transaction(
+            read_signature,
+            expected_amount=expected_amount,
+            expected_recipient=expected_recipient,
+            commitment=get_settings().solana_confirm_commitment,
+        )
+
+        values = {}
         if verification_result["verified"]:
-            db_transaction.status = TransactionStatus.CONFIRMED
-            db_transaction.transaction_verified_at = datetime.utcnow()
-        else:
-            db_transaction.status = TransactionStatus.FAILED
-            db_transaction.failure_reason = verification_result.get(
+            values["status"] = TransactionStatus.CONFIRMED
+            values["solana_commitment"] = verification_result["commitment"]
+            values["transaction_verified_at"] = datetime.utcnow()
+        elif verification_result["confirmed"]:
+            values["status"] = TransactionStatus.FAILED
+            values["solana_commitment"] = None
+            values["failure_reason"] = verification_result.get(
                 "error", "Verification failed"
             )
 
-        db.commit()
-        db.refresh(db_transaction)
+        return await TransactionService._write_verification(
+            db, transaction_id, read_status, read_attempts, read_signature, values
+        )
+
+    @staticmethod
+    def _context_query() -> Select:
+        return (
+            select(
+                Transaction,
+                Investment.user_id,
+                Investment.project_id,
+                Project.id,
+                Project.solana_pda_wallet,
+            )
+            .join(Investment, Investment.id == Transaction.investment_id)
+            .outerjoin(Project, cast(Project.id, String) == Investment.project_id)
+        )
+
+    @staticmethod
+    def _to_context(row: Row) -> ConfirmContext:
+        transaction, user_id, project_id, project_pk, pda_wallet = row
+        return ConfirmContext(
+            transaction=transaction,
+            user_id=user_id,
+            project_id=project_id,
+            project_found=project_pk is not None,
+            pda_wallet=pda_wallet,
+        )
+
+    @staticmethod
+    async def get_transaction_context(
+        db: AsyncSession,
+        transaction_id: UUID,
+        user_id: int | None = None,
+        for_update: bool = False,
+    ) -> ConfirmContext | None:
+        """
+        Load a transaction with its owner and project PDA wallet in one query.
+
+        With `user_id`, only a transaction of an investment of that user is returned.
+        With `for_update`, the transaction row stays locked until the DB transaction ends.
+        """
+        query = TransactionService._context_query().where(Transaction.id == transaction_id)
+        if user_id is not None:
+            query = query.where(Investment.user_id == user_id)
+        if for_update:
+            query = query.with_for_update(of=Transaction)
+        row = (await db.execute(query)).one_or_none()
+        return TransactionService._to_context(row) if row is not None else None
+
+    @staticmethod
+    async def get_confirm_contexts(
+        db: AsyncSession, transaction_ids: Sequence[UUID]
+    ) -> dict[UUID, ConfirmContext]:
+        """Load transactions with their owner and project PDA wallet in one query."""
+        result = await db.execute(
+            TransactionService._context_query().where(Transaction.id.in_(transaction_ids))
+        )
+        contexts = [TransactionService._to_context(row) for row in result]
+        return {context.transaction.id: context for context in contexts}
+
+    @staticmethod
+    async def confirm_transactions(
+        db: AsyncSession,
+        contexts: Sequence[ConfirmContext],
+        confirms: dict[UUID, TransactionConfirm],
+    ) -> dict[UUID, Transaction]:
+        """
+        Confirm many transactions at once, with the checks and outcomes of
+        confirm_transaction for each but a fixed number of DB round trips.
+
+        `contexts` come from get_confirm_contexts and `confirms` holds the Solana details
+        per transaction ID. One query finds signatures already used, all signatures are
+        verified with batched RPC calls while no connection is held, and the results are
+        written with one bulk UPDATE under row locks. Transactions changed by someone else
+        since they were read are left as they are, and ones the RPC limiter had no room
+        for are left pending with their signature, like confirm_transaction does.
+
+        Returns the resulting transactions by ID (deleted ones are missing).
+        """
+        if not contexts:
+            return {}
+
+        # Phase 1: checks that need no RPC call
+        signatures = [confirms[c.transaction.id].transaction_signature for c in contexts]
+        claimed = dict(
+            (
+                await db.execute(
+                    select(Transaction.solana_transaction_signature, Transaction.id).where(
+                        Transaction.solana_transaction_signature.in_(signatures)
+                    )
+                )
+            ).all()
+        )
+        rejected: dict[UUID, str] = {}
+        to_verify: list[ConfirmContext] = []
+        for context in contexts:
+            transaction_id = context.transaction.id
+            signature = confirms[transaction_id].transaction_signature
+            # Within the batch, the first entry using a signature claims it
+            owner = claimed.setdefault(signature, transaction_id)
+            reason = (
+                "Transaction signature already used"
+                if owner != transaction_id
+                else TransactionService._rejection_reason(context)
+            )
+            if reason:
+                rejected[transaction_id] = reason
+            else:
+                to_verify.append(context)
+
+        read_state = {
+            c.transaction.id: (
+                c.transaction.status,
+                c.transaction.verification_attempts,
+                c.transaction.solana_transaction_signature,
+            )
+            for c in contexts
+        }
+        await db.commit()
+
+        # Phase 2: verify all signatures, batched
+        verification_results = await SolanaService.verify_transactions(
+            [
+                (
+                    confirms[c.transaction.id].transaction_signature,
+                    SolanaService.convert_sol_to_lamports(
+                        confirms[c.transaction.id].solana_amount
+                    )
+                    if confirms[c.transaction.id].solana_amount
+                    else None,
+                    c.pda_wallet,
+                )
+                for c in to_verify
+            ],
+            commitment=get_settings().solana_confirm_commitment,
+        )
+        verified = {
+            c.transaction.id: (c, result) for c, result in zip(to_verify, verification_results)
+        }
+
+        # Phase 3: lock, skip rows changed since phase 1, bulk write
+        while True:
+            transactions = {
+                tx.id: tx
+                for tx in await db.scalars(
+                    select(Transaction)
+                    .where(Transaction.id.in_(list(read_state)))
+                    .order_by(Transaction.id)
+                    .with_for_update()
+                    .execution_options(populate_existing=True)
+                )
+            }
+            params, changes = [], []
+            for transaction_id, tx in transactions.items():
+                state = (tx.status, tx.verification_attempts, tx.solana_transaction_signature)
+                if state != read_state[transaction_id]:
+                    continue  # settled concurrently (another confirm or the reconciler)
+                if transaction_id in rejected:
+                    values = {
+                        "status": TransactionStatus.FAILED,
+                        "failure_reason": rejected[transaction_id],
+                        "solana_commitment": None,
+                    }
+                else:
+                    context, result = verified[transaction_id]
+                    confirm = confirms[transaction_id]
+                    values = {
+                        "verification_attempts": tx.verification_attempts + 1,
+                        "solana_transaction_signature": confirm.transaction_signature,
+                        "user_wallet": confirm.wallet_address,
+                        "pda_address": context.pda_wallet,
+                        "solana_amount": confirm.solana_amount or tx.solana_amount,
+                        "transaction_verified_at": tx.transaction_verified_at,
+                        "failure_reason": tx.failure_reason,
+                        "solana_commitment": tx.solana_commitment,
+                    }
+                    if result["verified"]:
+                        values["status"] = TransactionStatus.CONFIRMED
+                        values["solana_commitment"] = result["commitment"]
+                        values["transaction_verified_at"] = datetime.utcnow()
+                    elif result.get("retryable"):
+                        values["status"] = TransactionStatus.PENDING
+                        values["solana_commitment"] = None
+                        values["failure_reason"] = None
+                    else:
+                        values["status"] = TransactionStatus.FAILED
+                        values["solana_commitment"] = None
+                        values["failure_reason"] = result.get("error", "Verification failed")
+                params.append({"id": transaction_id, **values})
+                changes.append((tx.investment_id, tx.amount, tx.status, values["status"]))
+
+            try:
+                if params:
+                    # ORM bulk UPDATE by primary key: one executemany per set of columns
+                    await db.execute(update(Transaction), params)
+                    await db.run_sync(
+                        lambda session: apply_status_changes(session.connection(), changes)
+                    )
+                await db.commit()
+                break
+            except IntegrityError:
+                # Signatures claimed by other transactions while we were verifying
+                await db.rollback()
+                taken = await db.scalars(
+                    select(Transaction.solana_transaction_signature).where(
+                        Transaction.solana_transaction_signature.in_(signatures),
+                        Transaction.id.not_in(list(read_state)),
+                    )
+                )
+                taken = set(taken)
+                retry = False
+                for transaction_id, (context, _) in list(verified.items()):
+                    if confirms[transaction_id].transaction_signature in taken:
+                        del verified[transaction_id]
+                        rejected[transaction_id] = "Transaction signature already used"
+                        retry = True
+                if not retry:
+                    raise
+
+        events = get_transaction_events()
+        for item in params:
+            events.publish(item["id"])
+        result = await db.scalars(
+            select(Transaction)
+            .where(Transaction.id.in_(list(read_state)))
+            .execution_options(populate_existing=True)
+        )
+        return {tx.id: tx for tx in result}
+
+    @staticmethod
+    def _rejection_reason(context: ConfirmContext) -> str | None:
+        """Why a transaction cannot be confirmed before contacting Solana, if it cannot."""
+        try:
+            int(context.project_id)
+        except (ValueError, TypeError):
+            return "Invalid project ID format"
+        if not context.project_found:
+            return "Project not found"
+        if not context.pda_wallet:
+            return "Project PDA wallet not configured"
+        return None
+
+    @staticmethod
+    async def _confirmation_target(
+        db: AsyncSession, context: ConfirmContext, signature: str
+    ) -> str | None:
+        """
+        Return the PDA wallet a transaction must pay into, or mark the transaction failed
+        and return None if it cannot be confirmed with `signature`.
+        """
+        # Check if signature already exists (idempotency)
+        existing = await TransactionService.get_transaction_by_signature(db, signature)
+        if existing and existing.id != context.transaction.id:
+            reason = "Transaction signature already used"
+        else:
+            reason = TransactionService._rejection_reason(context)
+        if reason:
+            await TransactionService._fail_before_verification(db, context.transaction, reason)
+            return None
+        return context.pda_wallet
+
+    @staticmethod
+    async def _write_verification(
+        db: AsyncSession,
+        transaction_id: UUID,
+        read_status: TransactionStatus,
+        read_attempts: int,
+        read_signature: str | None,
+        values: dict,
+    ) -> Transaction | None:
+        """
+        Count a verification attempt and apply `values`, unless the transaction changed
+        since it was read (then its current state is returned instead).
+        """
+        try:
+            updated = await db.scalar(
+                update(Transaction)
+                .where(
+                    Transaction.id == transaction_id,
+                    Transaction.status == read_status,
+                    Transaction.verification_attempts == read_attempts,
+                    Transaction.solana_transaction_signature.is_not_distinct_from(
+                        read_signature
+                    ),
+                )
+                .values(verification_attempts=read_attempts + 1, **values)
+                .returning(Transaction)
+                .execution_options(populate_existing=True)
+            )
+            if updated is not None:
+                # Bulk UPDATEs bypass the mapper listeners that maintain the rollups
+                await db.run_sync(
+                    lambda session: apply_status_change(
+                        session.connection(),
+                        updated.investment_id,
+                        updated.amount,
+                        read_status,
+                        updated.status,
+                    )
+                )
+            await db.commit()
+        except IntegrityError:
+            # Another transaction claimed the same signature while we were verifying
+            await db.rollback()
+            db_transaction = await TransactionService.get_transaction(db, transaction_id)
+            if not db_transaction:
+                return None
+            return await TransactionService._fail_before_verification(
+                db, db_transaction, "Transaction signature already used"
+            )
+
+        if updated is None:
+            # Settled concurrently (another confirm or the reconciler): report that state
+            return await db.scalar(
+                select(Transaction)
+                .where(Transaction.id == transaction_id)
+                .execution_options(populate_existing=True)
+            )
+        get_transaction_events().publish(transaction_id)
+        return updated
+
+    @staticmethod
+    async def _fail_before_verification(
+        db: AsyncSession, db_transaction: Transaction, reason: str
+    ) -> Transaction:
+        """Mark a transaction failed for a reason found before contacting Solana."""
+        db_transaction.status = TransactionStatus.FAILED
+        db_transaction.solana_commitment = None
+        db_transaction.failure_reason = reason
+        await db.commit()
+        get_transaction_events().publish(db_transaction.id)
         return db_transaction
 
     @staticmethod
-    def mark_transaction_failed(
-        db: Session, transaction_id: UUID, reason: str
+    async def mark_transaction_failed(
+        db: AsyncSession, transaction_id: UUID, reason: str
     ) -> Transaction | None:
         """Mark a transaction as failed."""
-        db_transaction = TransactionService.get_transaction(db, transaction_id)
+        db_transaction = await TransactionService.get_transaction(db, transaction_id)
         if not db_transaction:
             return None
 
         db_transaction.status = TransactionStatus.FAILED
+        db_transaction.solana_commitment = None
         db_transaction.failure_reason = reason
-        db.commit()
-        db.refresh(db_transaction)
+        await db.commit()
+        get_transaction_events().publish(transaction_id)
         return db_transaction
@@ -0,0 +1,49 @@
+"""In-process notifications of transaction status changes, for status streams."""
+
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+from uuid import UUID
+
+
+class TransactionEvents:
+    """
+    Wakes status streams waiting on a transaction when this process changes it.
+
+    Only a hint: changes made by other processes are not seen, so listeners must still
+    re-read the database periodically. Use from the event loop thread only.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: defaultdict[UUID, set[asyncio.Event]] = defaultdict(set)
+
+    def publish(self, transaction_id: UUID) -> None:
+        """Signal every listener of `transaction_id` that its status may have changed."""
+        for event in self._listeners.get(transaction_id, ()):
+            event.set()
+
+    @contextmanager
+    def listen(self, transaction_id: UUID) -> Iterator[asyncio.Event]:
+        """Yield an event that publish() sets for `transaction_id`; callers clear it."""
+        event = asyncio.Event()
+        self._listeners[transaction_id].add(event)
+        try:
+            yield event
+        finally:
+            listeners = self._listeners.get(transaction_id)
+            if listeners is not None:
+                listeners.discard(event)
+                if not listeners:
+                    del self._listeners[transaction_id]
+
+    def listener_count(self) -> int:
+        """Return the number of open listeners across all transactions."""
+        return sum(len(listeners) for listeners in self._listeners.values())
+
+
+@lru_cache
+def get_transaction_events() -> TransactionEvents:
+    """Return the process-wide transaction event hub."""
+    return TransactionEvents()
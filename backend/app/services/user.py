@@ -1,33 +1,36 @@
 from typing import List
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
+from app.pagination import paginate, split_page
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.user_cache import get_identity_cache
 
 
 class UserService:
     """Service for user CRUD operations."""
 
     @staticmethod
-    def get_user(db: Session, user_id: int) -> User | None:
+    async def get_user(db: AsyncSession, user_id: int) -> User | None:
         """Get a user by ID."""
-        return db.query(User).filter(User.id == user_id).first()
+        return await db.get(User, user_id)
 
     @staticmethod
-    def get_user_by_email(db: Session, email: str) -> User | None:
+    async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
         """Get a user by email."""
-        return db.query(User).filter(User.email == email).first()
+        return await db.scalar(select(User).where(User.email == email).limit(1))
 
     @staticmethod
-    def get_user_by_privy_did(db: Session, privy_did: str) -> User | None:
+    async def get_user_by_privy_did(db: AsyncSession, privy_did: str) -> User | None:
         """Get a user by Privy DID."""
-        return db.query(User).filter(User.privy_did == privy_did).first()
+        return await db.scalar(select(User).where(User.privy_did == privy_did).limit(1))
 
     @staticmethod
-    def get_or_create_user_by_privy(db: Session, privy_did: str) -> User:
+    async def get_or_create_user_by_privy(db: AsyncSession, privy_did: str) -> User:
         """Get existing user by Privy DID or create one with a placeholder email."""
-        user = UserService.get_user_by_privy_did(db, privy_did)
+        user = await UserService.get_user_by_privy_did(db, privy_did)
         if user:
             return user
         # Local part of email cannot contain colons; use dots so it passes EmailStr validation
@@ -39,17 +42,20 @@ class UserService:
             privy_did=privy_did,
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
         return db_user
 
     @staticmethod
-    def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-        """Get a list of users with pagination."""
-        return db.query(User).offset(skip).limit(limit).all()
+    async def get_users(
+        db: AsyncSession, skip: int = 0, limit: int = 100, cursor: str | None = None
+    ) -> tuple[List[User], str | None]:
+        """Get a page of users ordered by id, and the cursor for the next page."""
+        keys = (User.id,)
+        result = await db.scalars(paginate(select(User).offset(skip), keys, cursor, limit))
+        return split_page(result.all(), keys, limit)
 
     @staticmethod
-    def create_user(db: Session, user_create: UserCreate) -> User:
+    async def create_user(db: AsyncSession, user_create: UserCreate) -> User:
         """Create a new user."""
         db_user = User(
             email=user_create.email,
@@ -57,18 +63,17 @@ class UserService:
             last_name=user_create.last_name,
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
         return db_user
 
     @staticmethod
-    def create_user_for_privy(
-        db: Session, user_create: UserCreate, privy_did: str
+    async def create_user_for_privy(
+        db: AsyncSession, user_create: UserCreate, privy_did: str
     ) -> User:
         """Create a user linked to a Privy DID (for POST /users with Privy auth)."""
-        if UserService.get_user_by_privy_did(db, privy_did):
+        if await UserService.get_user_by_privy_did(db, privy_did):
             return None  # caller should check and 400
-        if UserService.get_user_by_email(db, user_create.email):
+        if await UserService.get_user_by_email(db, user_create.email):
             return None  # email taken
         db_user = User(
             email=user_create.email,
@@ -77,33 +82,37 @@ class UserService:
             privy_did=privy_did,
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
         return db_user
 
     @staticmethod
-    def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User | None:
+    async def update_user(
+        db: AsyncSession, user_id: int, user_update: UserUpdate
+    ) -> User | None:
         """Update a user."""
-        db_user = UserService.get_user(db, user_id)
+        db_user = await UserService.get_user(db, user_id)
         if not db_user:
             return None
 
+        previous_privy_did = db_user.privy_did
         update_data = user_update.model_dump(exclude_unset=True)
 
         for field, value in update_data.items():
             setattr(db_user, field, value)
 
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        get_identity_cache().invalidate(previous_privy_did, db_user.privy_did)
         return db_user
 
     @staticmethod
-    def delete_user(db: Session, user_id: int) -> bool:
+    async def delete_user(db: AsyncSession, user_id: int) -> bool:
         """Delete a user."""
-        db_user = UserService.get_user(db, user_id)
+        db_user = await UserService.get_user(db, user_id)
         if not db_user:
             return False
 
-        db.delete(db_user)
-        db.commit()
+        privy_did = db_user.privy_did
+        await db.delete(db_user)
+        await db.commit()
+        get_identity_cache().invalidate(privy_did)
         return True
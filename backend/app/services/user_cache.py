@@ -0,0 +1,113 @@
+"""Process-local cache resolving Privy DIDs to user snapshots."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+from app.config import get_settings
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Detached, read-only copy of the user columns needed by authenticated requests."""
+
+    id: int
+    email: str
+    first_name: str | None
+    last_name: str | None
+    privy_did: str | None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_model(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            privy_did=user.privy_did,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+class IdentityCache:
+    """
+    Bounded LRU mapping Privy DID to UserSnapshot.
+
+    UserService invalidates entries when a user is updated or deleted; the TTL bounds
+    staleness for changes made by other worker processes.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, UserSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, privy_did: str) -> UserSnapshot | None:
+        """Return the cached snapshot for a DID, or None on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(privy_did)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[privy_did]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(privy_did)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, snapshot: UserSnapshot) -> None:
+        """Cache a snapshot under its Privy DID."""
+        if self.max_size <= 0 or not snapshot.privy_did:
+            return
+        with self._lock:
+            self._entries[snapshot.privy_did] = (
+                time.monotonic() + self.ttl_seconds,
+                snapshot,
+            )
+            self._entries.move_to_end(snapshot.privy_did)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *privy_dids: str | None) -> None:
+        """Drop cached snapshots for the given DIDs."""
+        with self._lock:
+            for privy_did in privy_dids:
+                if privy_did:
+                    self._entries.pop(privy_did, None)
+
+    def clear(self) -> None:
+        """Drop all cached snapshots."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters, hit ratio and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@lru_cache
+def get_identity_cache() -> IdentityCache:
+    """Return the process-wide identity cache."""
+    settings = get_settings()
+    return IdentityCache(
+        max_size=settings.identity_cache_size,
+        ttl_seconds=settings.identity_cache_ttl_seconds,
+    )
@@ -0,0 +1,303 @@
+"""
+Incremental indexing of inbound transfers to project PDA wallets.
+
+Each pass tails every project's solana_pda_wallet with getSignaturesForAddress, starting
+after the wallet's persisted cursor, fetches the new finalized transactions in JSON-RPC
+batches and records the SOL each one paid into the wallet as a SolanaDeposit. Deposits
+are matched to transactions by signature (a confirm already recorded it) or else by
+sender wallet and expected SOL amount against pending transactions into that wallet
+that have no signature yet, oldest first. A deposit is never credited on amount alone:
+transactions created without a wallet address only settle through a confirm. Matching
+pending transactions are settled on the spot; deposits nobody claims are kept
+unmatched and logged for manual settlement.
+
+A wallet with more new signatures than one pass indexes is caught up newest first, a
+capped batch per pass: the cursor keeps where the next batch resumes (`before`) and the
+newest signature of the backlog, which becomes the tail position once the gap is closed.
+Each batch is applied oldest first, but a backlog's batches run newest to oldest.
+
+RPC cost follows on-chain activity instead of API traffic, and deposits made without a
+confirm call still settle. Run it in a single process: set WALLET_INDEXER_ENABLED on one
+API instance, or run passes with `python -m app.maintenance index-wallets`.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Settings, get_settings
+from app.database import SessionLocal
+from app.models.deposit import SolanaDeposit
+from app.models.transaction import Transaction, TransactionStatus
+from app.models.wallet_cursor import SolanaWalletCursor
+from app.services.project import ProjectService
+from app.services.solana import (
+    MAX_SIGNATURES_PER_ADDRESS_REQUEST,
+    InboundTransfer,
+    SolanaService,
+)
+from app.services.solana_cache import FinalizedTransfer
+from app.services.transaction import TransactionService
+from app.services.transaction_events import get_transaction_events
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexStats:
+    """Outcome counts of one indexing pass."""
+
+    wallets: int = 0
+    signatures: int = 0
+    deposits: int = 0
+    matched: int = 0
+    unmatched: int = 0
+    confirmed: int = 0
+    failed: int = 0
+    errors: int = 0
+    behind: int = 0  # wallets with more new signatures than one pass indexes
+
+
+class WalletIndexer:
+    """Tails project PDA wallets and settles the transactions their deposits pay for."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        settings: Settings | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.settings = settings or get_settings()
+
+    async def _signature_batch(
+        self, wallet: str, until: str | None, before: str | None
+    ) -> tuple[list[dict], bool]:
+        """
+        Up to wallet_indexer_max_signatures finalized signatures of `wallet` after `until`
+        and before `before`, newest first, and whether they reach back to `until`.
+        """
+        limit = self.settings.wallet_indexer_max_signatures
+        signatures: list[dict] = []
+        while len(signatures) < limit:
+            page_limit = min(limit - len(signatures), MAX_SIGNATURES_PER_ADDRESS_REQUEST)
+            page = await SolanaService.get_signatures_for_address(
+                wallet, until=until, before=before, limit=page_limit
+            )
+            signatures.extend(page)
+            if len(page) < page_limit:
+                return signatures, True
+            before = page[-1]["signature"]
+        return signatures, False
+
+    @staticmethod
+    def _settle(transaction: Transaction, transfer: InboundTransfer, wallet: str) -> bool:
+        """
+        Settle a pending transaction from the deposit it was matched to. Deposits are
+        indexed at finalized commitment, so a provisional confirmation is finalized too.
+        """
+        if transaction.status == TransactionStatus.CONFIRMED:
+            if transaction.solana_commitment != "confirmed":
+                return False
+            transaction.solana_commitment = "finalized"
+            return True
+        if transaction.status != TransactionStatus.PENDING:
+            return False
+        result = SolanaService.check_transfer(
+            FinalizedTransfer(
+                amount_lamports=transfer.amount_lamports, recipient=wallet, error=None
+            ),
+            (
+                SolanaService.convert_sol_to_lamports(transaction.solana_amount)
+                if transaction.solana_amount
+                else None
+            ),
+            transaction.pda_address or wallet,
+        )
+        transaction.verification_attempts += 1
+        if result["verified"]:
+            transaction.status = TransactionStatus.CONFIRMED
+            transaction.solana_commitment = "finalized"
+            transaction.transaction_verified_at = datetime.utcnow()
+            transaction.failure_reason = None
+        else:
+            transaction.status = TransactionStatus.FAILED
+            transaction.solana_commitment = None
+            transaction.failure_reason = result.get("error", "Verification failed")[:500]
+        return True
+
+    @staticmethod
+    def _match_by_amount(
+        candidates: list[Transaction], transfer: InboundTransfer
+    ) -> Transaction | None:
+        """The oldest candidate expecting this amount from this transfer's sender."""
+        if transfer.sender is None:
+            return None
+        for transaction in candidates:
+            expected = SolanaService.convert_sol_to_lamports(transaction.solana_amount)
+            if expected == transfer.amount_lamports and transaction.user_wallet == transfer.sender:
+                return transaction
+        return None
+
+    async def _apply(
+        self,
+        wallet: str,
+        project_id: int,
+        transfers: list[InboundTransfer],
+        cursor: dict,
+        stats: IndexStats,
+    ) -> list[UUID]:
+        """
+        Record deposits, settle the transactions they match and set the `cursor` columns
+        of the wallet's SolanaWalletCursor.
+        """
+        settled: list[UUID] = []
+        async with self.session_factory() as db:
+            by_signature = (
+                await TransactionService.get_transactions_by_signatures(
+                    db, [transfer.signature for transfer in transfers]
+                )
+                if transfers
+                else {}
+            )
+            unsigned = (
+                await TransactionService.get_unsigned_pending_transactions(db, wallet)
+                if len(by_signature) < len(transfers)
+                else []
+            )
+
+            for transfer in transfers:
+                matched_by = None
+                transaction = by_signature.get(transfer.signature)
+                if transaction is not None:
+                    matched_by = "signature"
+                else:
+                    transaction = self._match_by_amount(unsigned, transfer)
+                    if transaction is not None:
+                        unsigned.remove(transaction)
+                        matched_by = "amount"
+                        transaction.solana_transaction_signature = transfer.signature
+                        transaction.pda_address = wallet
+
+                if transaction is None:
+                    stats.unmatched += 1
+                    logger.warning(
+                        f"Unmatched deposit {transfer.signature} to {wallet}: "
+                        f"{transfer.amount_lamports} lamports from {transfer.sender}; "
+                        "settle manually"
+                    )
+                else:
+                    stats.matched += 1
+                    if self._settle(transaction, transfer, wallet):
+                        settled.append(transaction.id)
+                        if transaction.status == TransactionStatus.CONFIRMED:
+                            stats.confirmed += 1
+                        else:
+                            stats.failed += 1
+
+                db.add(
+                    SolanaDeposit(
+                        signature=transfer.signature,
+                        wallet=wallet,
+                        project_id=project_id,
+                        sender=transfer.sender,
+                        amount_lamports=transfer.amount_lamports,
+                        slot=transfer.slot,
+                        block_time=transfer.block_time,
+                        transaction_id=transaction.id if transaction is not None else None,
+                        matched_by=matched_by,
+                    )
+                )
+                stats.deposits += 1
+
+            # Same database transaction as the deposits: a crash re-reads, never skips
+            wallet_cursor = await db.get(SolanaWalletCursor, wallet)
+            if wallet_cursor is None:
+                wallet_cursor = SolanaWalletCursor(wallet=wallet)
+                db.add(wallet_cursor)
+            for column, value in cursor.items():
+                setattr(wallet_cursor, column, value)
+            await db.commit()
+        return settled
+
+    async def index_wallet(self, wallet: str, project_id: int, stats: IndexStats) -> None:
+        """Index the next batch of `wallet` signatures after its cursor."""
+        async with self.session_factory() as db:
+            wallet_cursor = await db.get(SolanaWalletCursor, wallet)
+            until = before = head_signature = head_slot = None
+            if wallet_cursor is not None:
+                until = wallet_cursor.last_signature
+                before = wallet_cursor.before_signature
+                head_signature = wallet_cursor.head_signature
+                head_slot = wallet_cursor.head_slot
+
+        signatures, caught_up = await self._signature_batch(wallet, until, before)
+        if not signatures and head_signature is None:
+            return
+        if caught_up:
+            # Gap down to `until` closed: tail from the newest signature seen
+            if head_signature is None:
+                head_signature = signatures[0]["signature"]
+                head_slot = signatures[0].get("slot")
+            cursor = {
+                "last_signature": head_signature,
+                "last_slot": head_slot,
+                "before_signature": None,
+                "head_signature": None,
+                "head_slot": None,
+            }
+        else:
+            stats.behind += 1
+            cursor = {"before_signature": signatures[-1]["signature"]}
+            if head_signature is None:
+                cursor["head_signature"] = signatures[0]["signature"]
+                cursor["head_slot"] = signatures[0].get("slot")
+        signatures.reverse()
+        stats.signatures += len(signatures)
+
+        transfers = await SolanaService.get_inbound_transfers(
+            wallet, [entry["signature"] for entry in signatures if not entry.get("err")]
+        )
+        settled = await self._apply(wallet, project_id, transfers, cursor, stats)
+
+        events = get_transaction_events()
+        for transaction_id in settled:
+            events.publish(transaction_id)
+
+    async def run_once(self) -> IndexStats:
+        """Run one indexing pass over every project PDA wallet."""
+        async with self.session_factory() as db:
+            wallets = await ProjectService.get_pda_wallets(db)
+        stats = IndexStats(wallets=len(wallets))
+        limiter = asyncio.Semaphore(self.settings.wallet_indexer_concurrency)
+
+        async def index(wallet: str, project_id: int) -> None:
+            async with limiter:
+                try:
+                    await self.index_wallet(wallet, project_id, stats)
+                except Exception:
+                    stats.errors += 1
+                    logger.exception(f"Indexing wallet {wallet} failed")
+
+        await asyncio.gather(*(index(wallet, pid) for wallet, pid in wallets.items()))
+        return stats
+
+    async def run_forever(self) -> None:
+        """Run passes until cancelled; back-to-back while some wallet is behind."""
+        while True:
+            try:
+                stats = await self.run_once()
+            except Exception:
+                logger.exception("Wallet indexing pass failed")
+                stats = IndexStats()
+            if stats.deposits:
+                logger.info(
+                    f"Indexed {stats.deposits} deposits to {stats.wallets} wallets: "
+                    f"{stats.confirmed} confirmed, {stats.failed} failed, "
+                    f"{stats.unmatched} unmatched"
+                )
+            if not stats.behind:
+                await asyncio.sleep(self.settings.wallet_indexer_interval_seconds)
@@ -0,0 +1,76 @@
+"""
+Shared fixtures. Tests run against DATABASE_URL (any async SQLAlchemy URL) and default
+to a throwaway SQLite file; the schema is recreated for every test.
+"""
+
+import asyncio
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.gettempdir()}/agora-tests.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.auth.privy import PrivyClaims, get_privy_user  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Base  # noqa: E402
+from app.query_metrics import QueryStats, count_queries  # noqa: E402
+from app.services.user_cache import get_identity_cache  # noqa: E402
+
+TEST_PRIVY_DID = "did:privy:test-user"
+
+
+async def _reset_schema() -> None:
+    # Connections pooled by an earlier test belong to a closed event loop: drop them
+    await engine.dispose(close=False)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    await engine.dispose(close=False)
+
+
+@pytest.fixture(autouse=True)
+def database() -> Iterator[None]:
+    """Start every test with empty tables and an empty identity cache."""
+    asyncio.run(_reset_schema())
+    get_identity_cache().clear()
+    yield
+    get_identity_cache().clear()
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    """API client authenticated as TEST_PRIVY_DID (token verification bypassed)."""
+    app.dependency_overrides[get_privy_user] = lambda: PrivyClaims(
+        TEST_PRIVY_DID, "session", "test-app", None
+    )
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.pop(get_privy_user, None)
+
+
+@pytest.fixture
+def max_queries() -> Callable[[int], ContextManager[QueryStats]]:
+    """
+    Bound the SQL statements run inside a block, to catch N+1 regressions:
+
+        with max_queries(3):
+            client.get("/api/investments/")
+    """
+
+    @contextmanager
+    def check(limit: int) -> Iterator[QueryStats]:
+        with count_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"{stats.count} statements (max {limit}):\n" + "\n".join(
+            f"{n}x {sql}" for sql, n in stats.statements.most_common()
+        )
+
+    return check
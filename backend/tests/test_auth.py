@@ -0,0 +1,37 @@
+"""Privy token verification off the event loop."""
+
+import asyncio
+import time
+
+from app.auth import privy
+from app.auth.privy import PrivyClaims, verify_access_token
+from app.config import get_settings
+
+VERIFY_SECONDS = 0.1
+
+
+def _blocking_verify(access_token: str, settings) -> PrivyClaims:
+    time.sleep(VERIFY_SECONDS)  # signature check, key fetch or SDK round trip
+    return PrivyClaims(f"did:privy:{access_token}", "session", "app", time.time() + 3600)
+
+
+async def test_cache_miss_verifications_do_not_stall_other_requests(monkeypatch):
+    monkeypatch.setattr(privy, "_verify_uncached", _blocking_verify)
+    settings = get_settings()
+    lags: list[float] = []
+
+    async def unrelated_request() -> None:
+        # Stands in for an async route: how late does the loop resume it?
+        for _ in range(50):
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - started - 0.005)
+
+    unrelated = asyncio.create_task(unrelated_request())
+    await asyncio.sleep(0)  # it is waiting on the loop now
+    claims = await asyncio.gather(*(verify_access_token(f"miss-{i}", settings) for i in range(40)))
+    await unrelated
+
+    assert [c.user_id for c in claims] == [f"did:privy:miss-{i}" for i in range(40)]
+    # Inline, the loop would stall for whole verifications at a time (40 in a row here)
+    assert max(lags) < VERIFY_SECONDS / 2
@@ -0,0 +1,77 @@
+"""Investment updates keep the project funding rollups consistent."""
+
+import asyncio
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal, engine
+from app.models import Transaction, TransactionStatus
+from app.services.project import ProjectService
+
+
+def _create_project(client: TestClient, place_id: str) -> dict:
+    lot = client.post(
+        "/api/parking-lots/",
+        json={
+            "place_id": place_id,
+            "name": place_id,
+            "address": "1 Main St",
+            "latitude": 1.0,
+            "longitude": 2.0,
+        },
+    ).json()
+    return client.post("/api/projects/request", json={"parking_lot_id": lot["id"]}).json()
+
+
+def _add_transaction(client: TestClient, investment: dict, amount: str) -> UUID:
+    response = client.post(
+        f"/api/transactions/investments/{investment['id']}/transactions",
+        json={"investment_id": investment["id"].split("_")[-1], "amount": amount},
+    )
+    assert response.status_code == 201
+    return UUID(response.json()["id"].split("_")[-1])
+
+
+async def _confirm(transaction_id: UUID) -> None:
+    await engine.dispose(close=False)
+    async with SessionLocal() as db:
+        transaction = await db.get(Transaction, transaction_id)
+        transaction.status = TransactionStatus.CONFIRMED
+        await db.commit()
+    await engine.dispose(close=False)
+
+
+async def _funding_mismatches() -> list[dict]:
+    await engine.dispose(close=False)
+    async with SessionLocal() as db:
+        mismatches = await ProjectService.get_funding_mismatches(db)
+    await engine.dispose(close=False)
+    return mismatches
+
+
+def _funding(client: TestClient, project: dict) -> tuple[Decimal, Decimal, int]:
+    body = client.get(f"/api/projects/{project['id']}").json()
+    return Decimal(body["funded_total"]), Decimal(body["pending_total"]), body["investor_count"]
+
+
+def test_moving_an_investment_moves_its_funding(client):
+    old_project = _create_project(client, "old")
+    new_project = _create_project(client, "new")
+    investment = client.post(
+        "/api/investments/", json={"user_id": 0, "project_id": str(old_project["id"])}
+    ).json()
+    confirmed = _add_transaction(client, investment, "10.00")
+    _add_transaction(client, investment, "2.50")
+    asyncio.run(_confirm(confirmed))
+    assert _funding(client, old_project) == (Decimal("10.00"), Decimal("2.50"), 1)
+
+    response = client.put(
+        f"/api/investments/{investment['id']}", json={"project_id": str(new_project["id"])}
+    )
+
+    assert response.status_code == 200
+    assert _funding(client, old_project) == (Decimal(0), Decimal(0), 0)
+    assert _funding(client, new_project) == (Decimal("10.00"), Decimal("2.50"), 1)
+    assert asyncio.run(_funding_mismatches()) == []
@@ -0,0 +1,43 @@
+"""Query budgets for list endpoints: the statement count must not grow with the rows."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _create_investments(client: TestClient, count: int) -> None:
+    for i in range(count):
+        lot = client.post(
+            "/api/parking-lots/",
+            json={
+                "place_id": f"place-{i}",
+                "name": f"Lot {i}",
+                "address": "1 Main St",
+                "latitude": 1.0,
+                "longitude": 2.0,
+            },
+        ).json()
+        project = client.post("/api/projects/request", json={"parking_lot_id": lot["id"]}).json()
+        investment = client.post(
+            "/api/investments/", json={"user_id": 0, "project_id": str(project["id"])}
+        ).json()
+        for amount in ("1.5", "2.5"):
+            response = client.post(
+                f"/api/transactions/investments/{investment['id']}/transactions",
+                json={"investment_id": investment["id"].split("_")[-1], "amount": amount},
+            )
+            assert response.status_code == 201
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/api/investments/", "/api/investments/user/me", "/api/projects/", "/api/parking-lots/"],
+)
+def test_list_endpoints_have_a_fixed_query_budget(client, max_queries, path):
+    _create_investments(client, 5)
+    client.get(path)  # warm the identity cache
+
+    with max_queries(2):
+        response = client.get(path)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
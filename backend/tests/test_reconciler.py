@@ -0,0 +1,82 @@
+"""Reconciler batching and backoff."""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Investment, Project, Transaction, TransactionStatus, User
+from app.services.reconciler import TransactionReconciler
+from app.services.solana import SolanaService
+
+
+async def _add_pending(attempts_and_ages: list[tuple[int, int]]) -> None:
+    """Insert pending signed transactions with (verification_attempts, seconds since update)."""
+    now = datetime.now(timezone.utc)
+    async with SessionLocal() as db:
+        db.add(Project(name="p", investment_goal=1000.0, solana_pda_wallet="PDA"))
+        db.add(User(email="investor@example.com"))
+        await db.flush()
+        investment = Investment(user_id=1, project_id="1")
+        db.add(investment)
+        await db.flush()
+        for i, (attempts, age) in enumerate(attempts_and_ages):
+            db.add(
+                Transaction(
+                    investment_id=investment.id,
+                    amount=Decimal(1),
+                    status=TransactionStatus.PENDING,
+                    solana_transaction_signature=f"sig{i}",
+                    verification_attempts=attempts,
+                    updated_at=now - timedelta(seconds=age),
+                )
+            )
+        await db.commit()
+
+
+async def test_rows_in_backoff_do_not_starve_due_rows(monkeypatch):
+    checked: list[str] = []
+
+    async def no_statuses(signatures: list[str]) -> list[dict | None]:
+        checked.extend(signatures)
+        return [None] * len(signatures)
+
+    monkeypatch.setattr(SolanaService, "get_signature_statuses", no_statuses)
+    settings = get_settings().model_copy(
+        update={"reconciler_batch_size": 2, "reconciler_backoff_base_seconds": 10.0}
+    )
+    # Two rows checked 5 times (160s backoff) 100s ago fill the batch if not filtered
+    await _add_pending([(5, 100), (5, 100), (0, 10)])
+
+    stats = await TransactionReconciler(settings=settings).run_once()
+
+    assert checked == ["sig2"]
+    assert (stats.checked, stats.deferred) == (1, 1)
+
+
+async def test_provisional_rows_are_finalized_past_max_attempts(monkeypatch):
+    async def finalized(signatures: list[str]) -> list[dict | None]:
+        return [{"confirmationStatus": "finalized", "err": None} for _ in signatures]
+
+    async def verified(signature: str, **kwargs) -> dict:
+        return {"verified": True, "confirmed": True, "commitment": "finalized"}
+
+    monkeypatch.setattr(SolanaService, "get_signature_statuses", finalized)
+    monkeypatch.setattr(SolanaService, "verify_transaction", verified)
+    settings = get_settings().model_copy(update={"reconciler_max_attempts": 3})
+    await _add_pending([(3, 7200)])
+    async with SessionLocal() as db:
+        tx = await db.scalar(select(Transaction))
+        tx.status = TransactionStatus.CONFIRMED
+        tx.solana_commitment = "confirmed"
+        tx.transaction_verified_at = datetime.utcnow()
+        tx.updated_at = datetime.now(timezone.utc) - timedelta(seconds=7200)
+        await db.commit()
+
+    stats = await TransactionReconciler(settings=settings).run_once()
+
+    assert stats.promoted == 1
+    async with SessionLocal() as db:
+        assert (await db.scalar(select(Transaction))).solana_commitment == "finalized"
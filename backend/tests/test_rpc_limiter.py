@@ -0,0 +1,83 @@
+"""Adaptive (AIMD) concurrency limit and queueing of the RPC limiter."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.services.rpc_limiter import RpcLimiter, RpcQueueTimeout
+from app.services.rpc_pool import RpcPool
+
+
+def _deadline(seconds: float = 1.0) -> float:
+    return time.monotonic() + seconds
+
+
+async def test_a_burst_of_overloads_halves_the_limit_once():
+    limiter = RpcLimiter(initial_concurrency=8, min_concurrency=2)
+
+    async with limiter.slot(_deadline()) as a, limiter.slot(_deadline()) as b:
+        a.overloaded()
+        b.overloaded()  # sent before the cut: same burst
+    assert (limiter.limit, limiter.decreases) == (4, 1)
+
+    for _ in range(3):
+        async with limiter.slot(_deadline()) as permit:
+            permit.overloaded()
+    assert limiter.limit == 2  # floored at min_concurrency
+
+
+async def test_successes_grow_the_limit_by_about_one_per_window():
+    limiter = RpcLimiter(initial_concurrency=4, max_concurrency=5)
+
+    for _ in range(4):
+        async with limiter.slot(_deadline()) as permit:
+            permit.success()
+    assert 4.8 < limiter.limit < 5
+
+    for _ in range(10):
+        async with limiter.slot(_deadline()) as permit:
+            permit.success()
+    assert limiter.limit == 5
+
+
+async def test_a_timeout_halves_the_pool_concurrency():
+    async def timing_out(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("no answer", request=request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(timing_out))
+    pool = RpcPool(
+        ["http://node"],
+        get_settings().model_copy(
+            update={"solana_rpc_concurrency_initial": 4, "solana_rpc_hedge_enabled": False}
+        ),
+        client_factory=lambda: client,
+    )
+
+    with pytest.raises(httpx.ReadTimeout):
+        await pool.post({"jsonrpc": "2.0", "id": 1, "method": "getHealth"})
+
+    assert (pool.limiter.limit, pool.limiter.decreases) == (2, 1)
+
+
+async def test_requests_over_the_limit_queue_until_their_deadline():
+    limiter = RpcLimiter(initial_concurrency=1)
+    admitted = asyncio.Event()
+
+    async def queued_request() -> None:
+        async with limiter.slot(_deadline()):
+            admitted.set()
+
+    async with limiter.slot(_deadline()):
+        with pytest.raises(RpcQueueTimeout):
+            async with limiter.slot(_deadline(0.05)):
+                pass
+        queued = asyncio.create_task(queued_request())
+        await asyncio.sleep(0.05)
+        assert (limiter.waiting, admitted.is_set()) == (1, False)
+
+    await asyncio.wait_for(queued, timeout=1)
+    assert admitted.is_set()
+    assert (limiter.in_flight, limiter.timeouts) == (0, 1)
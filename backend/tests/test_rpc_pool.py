@@ -0,0 +1,132 @@
+"""RPC endpoint routing, failover, rate-limit rests and hedging."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.config import get_settings
+from app.services.rpc_pool import RpcPool
+
+CALL = {"jsonrpc": "2.0", "id": 1, "method": "getHealth"}
+
+Handler = Callable[[httpx.Request], Awaitable[httpx.Response]]
+
+
+def answer(delay: float = 0.0, status: int = 200, headers: dict | None = None) -> Handler:
+    """A node that answers after `delay` with `status`; the result names the node."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(
+            status, headers=headers, json={"jsonrpc": "2.0", "id": 1, "result": request.url.host}
+        )
+
+    return handler
+
+
+class FakeNodes:
+    """Local stand-ins for RPC endpoints behind one MockTransport, one handler per host."""
+
+    def __init__(self, **handlers: Handler) -> None:
+        self.handlers = handlers
+        self.calls: list[str] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.host)
+        return await self.handlers[request.url.host](request)
+
+    def pool(self, **settings) -> RpcPool:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self))
+        return RpcPool(
+            [f"http://{host}" for host in self.handlers],
+            get_settings().model_copy(update={"solana_rpc_hedge_enabled": False, **settings}),
+            client_factory=lambda: client,
+        )
+
+
+def served_by(response: httpx.Response) -> str:
+    return response.json()["result"]
+
+
+async def test_requests_go_to_the_lowest_latency_endpoint():
+    nodes = FakeNodes(slow=answer(delay=0.05), fast=answer())
+    pool = nodes.pool()
+
+    # Unmeasured endpoints are tried first so both get a latency estimate
+    served = [served_by(await pool.post(CALL)) for _ in range(4)]
+
+    assert served == ["slow", "fast", "fast", "fast"]
+    assert [endpoint.url for endpoint in pool.ranked()] == ["http://fast", "http://slow"]
+
+
+async def test_5xx_fails_over_and_a_failing_endpoint_sits_out():
+    nodes = FakeNodes(down=answer(status=503), up=answer())
+    pool = nodes.pool(solana_rpc_failure_threshold=3, solana_rpc_cooldown_seconds=60.0)
+
+    served = [served_by(await pool.post(CALL)) for _ in range(4)]
+
+    assert served == ["up"] * 4
+    # Three consecutive errors take "down" out of rotation for the cooldown
+    assert nodes.calls == ["down", "up"] * 3 + ["up"]
+
+
+async def test_429_fails_over_rests_the_endpoint_and_halves_concurrency():
+    nodes = FakeNodes(busy=answer(status=429, headers={"Retry-After": "30"}), idle=answer())
+    pool = nodes.pool(solana_rpc_concurrency_initial=4)
+
+    served = [served_by(await pool.post(CALL)) for _ in range(2)]
+
+    assert served == ["idle", "idle"]
+    assert nodes.calls == ["busy", "idle", "idle"]  # resting for its Retry-After
+    assert pool.endpoints[0].throttled_until > time.monotonic() + 25
+    # Halved on the 429, then about one more slot per round trip: 2 + 1/2 + 1/2.5
+    assert pool.limiter.decreases == 1
+    assert round(pool.limiter.limit, 2) == 2.9
+
+
+async def test_waits_out_retry_after_when_every_endpoint_is_rate_limited():
+    replies = iter([answer(status=429, headers={"Retry-After": "0.2"}), answer()])
+
+    async def throttled_once(request: httpx.Request) -> httpx.Response:
+        return await next(replies)(request)
+
+    nodes = FakeNodes(only=throttled_once)
+    pool = nodes.pool()
+
+    started = time.monotonic()
+    response = await pool.post(CALL)
+
+    assert served_by(response) == "only"
+    assert time.monotonic() - started >= 0.2
+    assert pool.throttle_waits == 1
+
+
+async def test_slow_reads_are_hedged_past_the_latency_percentile():
+    primary_delay = [0.0]
+
+    async def primary(request: httpx.Request) -> httpx.Response:
+        return await answer(delay=primary_delay[0])(request)
+
+    nodes = FakeNodes(primary=primary, backup=answer())
+    pool = nodes.pool(
+        solana_rpc_hedge_enabled=True,
+        solana_rpc_hedge_percentile=0.95,
+        solana_rpc_hedge_min_delay_ms=10.0,
+    )
+    for _ in range(20):
+        pool.endpoints[0].record_success(0.01)
+        pool.endpoints[1].record_success(0.02)
+
+    assert served_by(await pool.post(CALL)) == "primary"
+    assert pool.hedged == 0
+
+    primary_delay[0] = 2.0
+    started = time.monotonic()
+    response = await pool.post(CALL)
+
+    assert served_by(response) == "backup"
+    assert time.monotonic() - started < 1.0
+    assert (pool.hedged, pool.hedges_won) == (1, 1)
+    assert nodes.calls == ["primary", "primary", "backup"]
@@ -0,0 +1,59 @@
+"""Signature subscriber bookkeeping."""
+
+from decimal import Decimal
+from uuid import UUID
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Investment, Transaction, TransactionStatus, User
+from app.services.signature_subscriber import SignatureSubscriber
+
+
+async def _add_pending_signature(signature: str) -> UUID:
+    async with SessionLocal() as db:
+        db.add(User(email="investor@example.com"))
+        await db.flush()
+        investment = Investment(user_id=1, project_id="1")
+        db.add(investment)
+        await db.flush()
+        transaction = Transaction(
+            investment_id=investment.id,
+            amount=Decimal(1),
+            status=TransactionStatus.PENDING,
+            solana_transaction_signature=signature,
+        )
+        db.add(transaction)
+        await db.commit()
+        return transaction.id
+
+
+async def _noop() -> None:
+    pass
+
+
+async def test_notified_signature_is_not_resubscribed_while_still_pending():
+    transaction_id = await _add_pending_signature("sig")
+    landed: list[UUID] = []
+    subscriber = SignatureSubscriber(
+        settings=get_settings(), ws_url="ws://unused", on_landed=landed.append, fallback=_noop
+    )
+
+    await subscriber._refresh()
+    assert subscriber._watched == {"sig": transaction_id}
+    subscriber._requests[1] = "sig"
+    subscriber._handle({"jsonrpc": "2.0", "id": 1, "result": 7})
+    subscriber._handle(
+        {"method": "signatureNotification", "params": {"subscription": 7, "result": {}}}
+    )
+
+    # Still pending in the database until the confirmation queue commits it
+    await subscriber._refresh()
+    assert subscriber._watched == {}
+    assert landed == [transaction_id]
+
+    # Once the TTL passes it is picked up again (e.g. the queue dropped it)
+    subscriber.settings = get_settings().model_copy(
+        update={"signature_subscriber_notified_ttl_seconds": 0.0}
+    )
+    await subscriber._refresh()
+    assert subscriber._watched == {"sig": transaction_id}
@@ -0,0 +1,26 @@
+"""Solana transaction verification."""
+
+import asyncio
+import time
+
+from app.services import solana
+from app.services.solana import SolanaService
+
+
+async def test_verification_timeout_bounds_the_whole_verification(monkeypatch):
+    async def stuck(calls: list[dict]) -> list[dict]:
+        await asyncio.sleep(60)  # retries, hedges or limiter queueing that never end
+        return []
+
+    monkeypatch.setattr(SolanaService, "_post_calls", stuck)
+    monkeypatch.setattr(solana.settings, "transaction_verification_timeout", 0.2)
+
+    started = time.monotonic()
+    result = await SolanaService.verify_transaction("deadline-sig")
+
+    assert time.monotonic() - started < 5
+    assert result == {
+        "verified": False,
+        "confirmed": False,
+        "error": "Request timeout while verifying transaction",
+    }
@@ -0,0 +1,140 @@
+"""Transaction confirmation."""
+
+import asyncio
+from decimal import Decimal
+from typing import AsyncIterator
+from uuid import UUID
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.database import SessionLocal, engine
+from app.models import Investment, Project, Transaction, TransactionStatus, User
+from app.schemas.transaction import TransactionConfirm
+from app.services import solana
+from app.services.rpc_pool import RpcPool
+from app.services.solana import SolanaService
+from app.services.transaction import TransactionService
+
+
+async def _add_pending_transaction() -> UUID:
+    async with SessionLocal() as db:
+        db.add(Project(name="p", investment_goal=1000.0, solana_pda_wallet="PDA"))
+        db.add(User(email="investor@example.com"))
+        await db.flush()
+        investment = Investment(user_id=1, project_id="1")
+        db.add(investment)
+        await db.flush()
+        transaction = Transaction(
+            investment_id=investment.id, amount=Decimal(1), status=TransactionStatus.PENDING
+        )
+        db.add(transaction)
+        await db.commit()
+        return transaction.id
+
+
+async def test_confirm_holds_no_connection_while_waiting_on_rpc(monkeypatch):
+    verifying = asyncio.Event()
+    answer = asyncio.Event()
+
+    async def slow_verify(signature: str, **kwargs) -> dict:
+        verifying.set()
+        await answer.wait()
+        return {"verified": True, "confirmed": True, "commitment": "finalized"}
+
+    monkeypatch.setattr(SolanaService, "verify_transaction", slow_verify)
+    transaction_id = await _add_pending_transaction()
+
+    async with SessionLocal() as db:
+        context = await TransactionService.get_transaction_context(
+            db, transaction_id, for_update=True
+        )
+        assert engine.pool.checkedout() == 1
+        confirm = asyncio.create_task(
+            TransactionService.confirm_transaction(
+                db, context, TransactionConfirm(transaction_signature="sig", wallet_address="w")
+            )
+        )
+        await asyncio.wait_for(verifying.wait(), timeout=5)
+
+        # The RPC call is in flight: the read phase must have returned its connection
+        assert engine.pool.checkedout() == 0
+
+        answer.set()
+        confirmed = await confirm
+
+    assert confirmed.status == TransactionStatus.CONFIRMED
+    assert confirmed.solana_transaction_signature == "sig"
+    assert engine.pool.checkedout() == 0
+
+
+@pytest.fixture
+async def saturated_rpc(monkeypatch) -> AsyncIterator[RpcPool]:
+    """An RPC pool whose only concurrency slot is taken by a request that never answers."""
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": "ok"})
+
+    settings = get_settings().model_copy(
+        update={
+            "solana_rpc_concurrency_initial": 1,
+            "solana_rpc_concurrency_max": 1,
+            "solana_rpc_queue_timeout_seconds": 0.1,
+            "solana_rpc_hedge_enabled": False,
+        }
+    )
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    pool = RpcPool(["http://rpc.test"], settings, client_factory=lambda: client)
+    monkeypatch.setattr(solana, "get_rpc_pool", lambda: pool)
+    busy = asyncio.create_task(pool.post({"jsonrpc": "2.0", "id": 1, "method": "getHealth"}))
+    while pool.limiter.in_flight < 1:
+        await asyncio.sleep(0.01)
+    yield pool
+    release.set()
+    await busy
+    await client.aclose()
+
+
+async def _assert_deferred(transaction_id: UUID, signature: str) -> None:
+    async with SessionLocal() as db:
+        transaction = await db.get(Transaction, transaction_id)
+    assert transaction.status == TransactionStatus.PENDING
+    assert transaction.solana_transaction_signature == signature
+    assert transaction.failure_reason is None
+
+
+async def test_confirm_stays_pending_when_the_rpc_limiter_is_saturated(saturated_rpc):
+    transaction_id = await _add_pending_transaction()
+
+    async with SessionLocal() as db:
+        context = await TransactionService.get_transaction_context(
+            db, transaction_id, for_update=True
+        )
+        await TransactionService.confirm_transaction(
+            db, context, TransactionConfirm(transaction_signature="busy-sig", wallet_address="w")
+        )
+
+    assert saturated_rpc.limiter.timeouts == 1
+    await _assert_deferred(transaction_id, "busy-sig")
+
+
+async def test_batch_confirm_stays_pending_when_the_rpc_limiter_is_saturated(saturated_rpc):
+    transaction_id = await _add_pending_transaction()
+
+    async with SessionLocal() as db:
+        contexts = await TransactionService.get_confirm_contexts(db, [transaction_id])
+        await TransactionService.confirm_transactions(
+            db,
+            list(contexts.values()),
+            {
+                transaction_id: TransactionConfirm(
+                    transaction_signature="busy-batch-sig", wallet_address="w"
+                )
+            },
+        )
+
+    assert saturated_rpc.limiter.timeouts == 1
+    await _assert_deferred(transaction_id, "busy-batch-sig")
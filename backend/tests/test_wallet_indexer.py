@@ -0,0 +1,132 @@
+"""Wallet indexer paging and deposit matching."""
+
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import (
+    Investment,
+    Project,
+    SolanaDeposit,
+    SolanaWalletCursor,
+    Transaction,
+    TransactionStatus,
+    User,
+)
+from app.services.solana import InboundTransfer, SolanaService
+from app.services.wallet_indexer import WalletIndexer
+
+
+class FakeWallet:
+    """A PDA wallet's signature history, oldest first, with one inbound transfer each."""
+
+    def __init__(self, transfers: list[tuple[str, str, int]]) -> None:
+        self.transfers = list(transfers)  # (signature, sender, lamports)
+        self.requested_limits: list[int] = []
+
+    async def get_signatures_for_address(
+        self, address: str, until=None, before=None, limit=1000
+    ) -> list[dict]:
+        self.requested_limits.append(limit)
+        newest_first = [signature for signature, _, _ in reversed(self.transfers)]
+        if before is not None:
+            newest_first = newest_first[newest_first.index(before) + 1 :]
+        if until is not None and until in newest_first:
+            newest_first = newest_first[: newest_first.index(until)]
+        return [
+            {"signature": signature, "slot": self._slot(signature), "err": None}
+            for signature in newest_first[:limit]
+        ]
+
+    async def get_inbound_transfers(
+        self, wallet: str, signatures: list[str]
+    ) -> list[InboundTransfer]:
+        senders = {signature: (sender, lamports) for signature, sender, lamports in self.transfers}
+        return [
+            InboundTransfer(
+                signature=signature,
+                slot=self._slot(signature),
+                block_time=None,
+                sender=senders[signature][0],
+                amount_lamports=Decimal(senders[signature][1]),
+            )
+            for signature in signatures
+        ]
+
+    def _slot(self, signature: str) -> int:
+        return [entry[0] for entry in self.transfers].index(signature)
+
+
+def _install(monkeypatch, fake: FakeWallet) -> None:
+    monkeypatch.setattr(
+        SolanaService, "get_signatures_for_address", fake.get_signatures_for_address
+    )
+    monkeypatch.setattr(SolanaService, "get_inbound_transfers", fake.get_inbound_transfers)
+
+
+async def _add_project() -> Investment:
+    async with SessionLocal() as db:
+        db.add(Project(name="p", investment_goal=1000.0, solana_pda_wallet="PDA"))
+        db.add(User(email="investor@example.com"))
+        await db.flush()
+        investment = Investment(user_id=1, project_id="1")
+        db.add(investment)
+        await db.commit()
+        return investment
+
+
+async def test_backlog_is_indexed_in_capped_batches(monkeypatch):
+    fake = FakeWallet([(f"s{i}", "Bob", 1) for i in range(10)])
+    _install(monkeypatch, fake)
+    await _add_project()
+    indexer = WalletIndexer(
+        settings=get_settings().model_copy(update={"wallet_indexer_max_signatures": 4})
+    )
+
+    behind = [(await indexer.run_once()).behind for _ in range(3)]
+
+    assert behind == [1, 1, 0]
+    assert max(fake.requested_limits) <= 4
+    async with SessionLocal() as db:
+        deposits = (await db.scalars(select(SolanaDeposit.signature))).all()
+        cursor = await db.get(SolanaWalletCursor, "PDA")
+    assert sorted(deposits) == sorted(f"s{i}" for i in range(10))
+    assert (cursor.last_signature, cursor.last_slot) == ("s9", 9)
+    assert cursor.before_signature is None and cursor.head_signature is None
+
+    fake.transfers.append(("s10", "Bob", 1))
+    stats = await indexer.run_once()
+
+    assert (stats.signatures, stats.deposits, stats.behind) == (1, 1, 0)
+
+
+async def test_amount_match_requires_the_recorded_sender(monkeypatch):
+    _install(
+        monkeypatch, FakeWallet([("x1", "Mallory", 500_000_000), ("x2", "Alice", 500_000_000)])
+    )
+    investment = await _add_project()
+    async with SessionLocal() as db:
+        anonymous = Transaction(
+            investment_id=investment.id, amount=Decimal(1), solana_amount=Decimal("0.5")
+        )
+        alice = Transaction(
+            investment_id=investment.id,
+            amount=Decimal(1),
+            solana_amount=Decimal("0.5"),
+            user_wallet="Alice",
+        )
+        db.add_all([anonymous, alice])
+        await db.commit()
+
+    stats = await WalletIndexer().run_once()
+
+    assert (stats.matched, stats.unmatched) == (1, 1)
+    async with SessionLocal() as db:
+        assert (await db.get(Transaction, anonymous.id)).status == TransactionStatus.PENDING
+        settled = await db.get(Transaction, alice.id)
+    assert (settled.status, settled.solana_transaction_signature) == (
+        TransactionStatus.CONFIRMED,
+        "x2",
+    )